@@ -0,0 +1,53 @@
+"""
+Compare the torch and onnx inference backends of AspectSentimentAnalyzer.
+
+Scores the same contexts with both backends and reports per-context latency,
+the speedup of onnx over eager PyTorch, label agreement and the largest
+probability difference.
+
+Usage (from the repository root):
+    python benchmarks/bench_backends.py --repeat 20 --batch-size 32
+"""
+import argparse
+import time
+from marsa.sentiment import AspectSentimentAnalyzer
+from corpus import CONTEXTS
+
+def time_backend(analyzer: AspectSentimentAnalyzer, contexts: list[str]) -> tuple[float, list[list[float]]]:
+    """
+    Score contexts with an analyzer's BERT model and return the elapsed time and probabilities.
+    """
+    analyzer._bert_probabilities(contexts[:analyzer.batch_size])  # warm-up
+    start = time.perf_counter()
+    probs = analyzer._bert_probabilities(contexts)
+    return time.perf_counter() - start, probs
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Times the sample contexts are repeated (default: 20)')
+    parser.add_argument('--batch-size', type=int, default=32, help='Contexts per forward pass (default: 32)')
+    args = parser.parse_args()
+
+    contexts = CONTEXTS * args.repeat
+    results = {}
+    for backend in ("torch", "onnx"):
+        analyzer = AspectSentimentAnalyzer(batch_size=args.batch_size, cache_size=0, backend=backend)
+        results[backend] = time_backend(analyzer, contexts)
+
+    torch_time, torch_probs = results["torch"]
+    onnx_time, onnx_probs = results["onnx"]
+    agreement = sum(
+        max(range(3), key=t.__getitem__) == max(range(3), key=o.__getitem__)
+        for t, o in zip(torch_probs, onnx_probs)
+    ) / len(contexts)
+    max_diff = max(abs(t - o) for tp, op in zip(torch_probs, onnx_probs) for t, o in zip(tp, op))
+
+    print(f"Contexts scored: {len(contexts)} (batch size {args.batch_size})")
+    print(f"torch: {1000 * torch_time / len(contexts):.2f} ms/context")
+    print(f"onnx:  {1000 * onnx_time / len(contexts):.2f} ms/context")
+    print(f"Speedup: {torch_time / onnx_time:.2f}x")
+    print(f"Label agreement: {agreement:.2%}")
+    print(f"Max probability difference: {max_diff:.2e}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare the fp32 and dynamic INT8 quantized roberta model.
+
+Each variant is loaded in its own process so memory measurements do not
+overlap. Reports per-context latency, resident memory added by loading the
+pipeline, serialized model size, and agreement of the aspect sentiment labels
+produced on the test fixture comments.
+
+Usage (from the repository root, with marsa installed):
+    python benchmarks/bench_quantization.py --repeat 20
+"""
+import argparse
+import io
+import multiprocessing
+import time
+import torch
+from corpus import COMMENTS, CONFIG_FILE, CONTEXTS
+
+def rss_mb() -> float:
+    """
+    Resident set size of the current process in megabytes (Linux only).
+    """
+    with open("/proc/self/status") as fp:
+        for line in fp:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def measure(quantize: bool, repeat: int, batch_size: int) -> dict:
+    """
+    Load a pipeline with or without quantization and measure it.
+    """
+    from marsa.pipeline import AspectSentimentPipeline
+
+    baseline = rss_mb()
+    pipeline = AspectSentimentPipeline(CONFIG_FILE, cache_size=0, sentiment_batch_size=batch_size, quantize=quantize)
+    loaded = rss_mb()
+
+    buffer = io.BytesIO()
+    torch.save(pipeline.sentiment_analyzer.bert_model.model.state_dict(), buffer)
+
+    analyzer = pipeline.sentiment_analyzer
+    contexts = CONTEXTS * repeat
+    analyzer._bert_probabilities(contexts[:batch_size])  # warm-up
+    start = time.perf_counter()
+    analyzer._bert_probabilities(contexts)
+    elapsed = time.perf_counter() - start
+
+    labels = [
+        aspect.sentiment
+        for result in pipeline.process_corpus(COMMENTS)
+        for aspect in result.aspects
+    ]
+    return {
+        'ms_per_context': 1000 * elapsed / len(contexts),
+        'rss_mb': loaded - baseline,
+        'model_mb': buffer.getbuffer().nbytes / 2**20,
+        'labels': labels
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Times the sample contexts are repeated (default: 20)')
+    parser.add_argument('--batch-size', type=int, default=32, help='Contexts per forward pass (default: 32)')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        fp32 = pool.apply(measure, (False, args.repeat, args.batch_size))
+    with context.Pool(1) as pool:
+        int8 = pool.apply(measure, (True, args.repeat, args.batch_size))
+
+    agreement = sum(a == b for a, b in zip(fp32['labels'], int8['labels'])) / max(len(fp32['labels']), 1)
+
+    print(f"{'':8}{'ms/context':>12}{'RSS MB':>10}{'model MB':>10}")
+    for name, result in (("fp32", fp32), ("int8", int8)):
+        print(f"{name:8}{result['ms_per_context']:>12.2f}{result['rss_mb']:>10.1f}{result['model_mb']:>10.1f}")
+    print(f"Speedup: {fp32['ms_per_context'] / int8['ms_per_context']:.2f}x")
+    print(f"Label agreement on {len(fp32['labels'])} fixture aspects: {agreement:.2%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure the start-up time of `import marsa` and `marsa --help`.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+The script exits with status 1 if the median time of either command exceeds
+the budget, so it can guard against heavy imports creeping back into the
+package's import path.
+
+Usage (from the repository root, with marsa installed):
+    python benchmarks/bench_startup.py --runs 10 --budget 0.5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    'import marsa': [sys.executable, "-c", "import marsa"],
+    'marsa --help': [sys.executable, "-m", "marsa", "--help"],
+}
+BASELINE = [sys.executable, "-c", "pass"]
+
+def time_command(command: list[str], runs: int) -> list[float]:
+    """
+    Run a command several times and return the wall-clock time of each run.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters started per command (default: 10)')
+    parser.add_argument('--budget', type=float, default=0.5, help='Maximum median seconds for each marsa command (default: 0.5)')
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_command(BASELINE, args.runs))
+    print(f"Interpreter start-up: {baseline:.3f}s")
+
+    over_budget = False
+    print(f"{'command':20}{'median s':>10}{'max s':>10}")
+    for name, command in COMMANDS.items():
+        timings = time_command(command, args.runs)
+        median = statistics.median(timings)
+        print(f"{name:20}{median:>10.3f}{max(timings):>10.3f}")
+        over_budget |= median > args.budget
+
+    if over_budget:
+        print(f"Start-up exceeded the {args.budget:.2f}s budget")
+        return 1
+    print(f"Start-up within the {args.budget:.2f}s budget")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Sweep torch thread counts and worker process counts for BERT throughput.
+
+For each (workers, threads) combination, that many processes each load the
+sentiment analyzer with num_threads set (and, where possible, pinned to their
+own block of cores), wait at a barrier, then score an equal share of the
+sample contexts. Aggregate contexts per second is reported for every
+combination along with the best setting for this machine.
+
+Usage (from the repository root, with marsa installed):
+    python benchmarks/bench_threads.py --workers 1,2,4 --threads 1,2,4 --repeat 20
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from corpus import CONTEXTS
+
+def parse_counts(value: str) -> list[int]:
+    """
+    Parse a comma-separated list of counts such as "1,2,4".
+    """
+    return [int(part) for part in value.split(',')]
+
+def worker(rank: int, threads: int, contexts: list[str], args, barrier, results) -> None:
+    """
+    Load an analyzer with the given thread count, then time scoring its share of contexts.
+    """
+    from marsa.sentiment import AspectSentimentAnalyzer
+
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    affinity = cores[rank * threads:(rank + 1) * threads] if args.pin else None
+    analyzer = AspectSentimentAnalyzer(
+        cache_size=0, batch_size=args.batch_size, backend=args.backend,
+        num_threads=threads, num_interop_threads=1, cpu_affinity=affinity or None
+    )
+    analyzer._bert_probabilities(contexts[:args.batch_size])  # warm-up
+
+    barrier.wait()
+    start = time.perf_counter()
+    analyzer._bert_probabilities(contexts)
+    results.put(time.perf_counter() - start)
+
+def run(workers: int, threads: int, args) -> float:
+    """
+    Score the corpus across worker processes and return aggregate contexts per second.
+    """
+    context = multiprocessing.get_context("spawn")
+    contexts = CONTEXTS * args.repeat
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(rank, threads, contexts[rank::workers], args, barrier, results))
+        for rank in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    elapsed = max(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return len(contexts) / elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=parse_counts, default=[1, 2, 4], help='Worker counts to try (default: 1,2,4)')
+    parser.add_argument('--threads', type=parse_counts, default=[1, 2, 4], help='Threads per worker to try (default: 1,2,4)')
+    parser.add_argument('--repeat', type=int, default=20, help='Times the sample contexts are repeated (default: 20)')
+    parser.add_argument('--batch-size', type=int, default=32, help='Contexts per forward pass (default: 32)')
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch', help='Inference backend (default: torch)')
+    parser.add_argument('--pin', action='store_true', help='Pin each worker to its own block of cores')
+    parser.add_argument('--max-cores', type=int, default=os.cpu_count(), help='Skip combinations using more cores than this (default: all)')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'workers':>8}{'threads':>9}{'contexts/s':>12}")
+    for workers in args.workers:
+        for threads in args.threads:
+            if workers * threads > args.max_cores:
+                continue
+            results[(workers, threads)] = run(workers, threads, args)
+            print(f"{workers:>8}{threads:>9}{results[(workers, threads)]:>12.1f}")
+
+    if results:
+        (workers, threads), throughput = max(results.items(), key=lambda item: item[1])
+        print(f"Best: {workers} workers x {threads} threads ({throughput:.1f} contexts/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare per-worker memory of the spawn and fork worker start methods.
+
+For each start method, a pipeline with the given number of workers processes
+the sample comments, then the unique set size (USS: memory private to a
+process) and proportional set size (PSS: private memory plus an equal share of
+pages shared with other processes) of every worker are read from
+/proc/<pid>/smaps_rollup. Spawned workers each hold their own copy of the
+models; forked workers share the parent's copy-on-write, so their USS is what
+each additional worker really costs. Linux only.
+
+Usage (from the repository root, with marsa installed):
+    python benchmarks/bench_worker_memory.py --workers 4
+"""
+import argparse
+from corpus import COMMENTS, CONFIG_FILE
+
+def memory_mb(pid: int) -> dict[str, float]:
+    """
+    USS, PSS and RSS of a process in megabytes, from /proc/<pid>/smaps_rollup.
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as fp:
+        for line in fp:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'uss': fields['Private_Clean'] + fields['Private_Dirty'],
+        'pss': fields['Pss'],
+        'rss': fields['Rss']
+    }
+
+def measure(worker_start: str, args) -> list[dict[str, float]]:
+    """
+    Run a pipeline with the given start method and return the memory of each worker.
+    """
+    from marsa.pipeline import AspectSentimentPipeline
+
+    pipeline = AspectSentimentPipeline(
+        CONFIG_FILE, batch_size=args.batch_size, sentiment_mode=args.sentiment_mode,
+        workers=args.workers, worker_start=worker_start
+    )
+    pipeline.process_corpus_flat(COMMENTS * args.repeat)
+    usage = [memory_mb(pid) for pid in pipeline._executor._processes]
+    pipeline.close()
+    return usage
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes (default: 4)')
+    parser.add_argument('--repeat', type=int, default=20, help='Times the sample comments are repeated (default: 20)')
+    parser.add_argument('--batch-size', type=int, default=20, help='Comments per shard (default: 20)')
+    parser.add_argument('--sentiment-mode', choices=['ensemble', 'cascade', 'vader'], default='ensemble',
+                        help='Scoring mode (default: ensemble)')
+    args = parser.parse_args()
+
+    print(f"{'start':>6}{'USS MB':>10}{'PSS MB':>10}{'RSS MB':>10}   (mean per worker)")
+    for worker_start in ("spawn", "fork"):
+        usage = measure(worker_start, args)
+        mean = {key: sum(worker[key] for worker in usage) / len(usage) for key in ('uss', 'pss', 'rss')}
+        print(f"{worker_start:>6}{mean['uss']:>10.1f}{mean['pss']:>10.1f}{mean['rss']:>10.1f}")
+
+if __name__ == '__main__':
+    main()
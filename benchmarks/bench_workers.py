@@ -0,0 +1,61 @@
+"""
+Measure end-to-end pipeline throughput as the number of worker processes grows.
+
+For each worker count, a pipeline with that many workers is built and warmed
+up (so every worker has loaded its models), then the sample comments are
+processed with process_corpus_flat. Comments per second and the speedup over
+a single process are reported, which shows how close scaling is to linear on
+this machine.
+
+Usage (from the repository root, with marsa installed):
+    python benchmarks/bench_workers.py --workers 1,2,4,8 --repeat 200
+"""
+import argparse
+import time
+from corpus import COMMENTS, CONFIG_FILE
+
+def parse_counts(value: str) -> list[int]:
+    """
+    Parse a comma-separated list of counts such as "1,2,4".
+    """
+    return [int(part) for part in value.split(',')]
+
+def measure(workers: int, args) -> float:
+    """
+    Process the corpus with the given number of workers and return comments per second.
+    """
+    from marsa.pipeline import AspectSentimentPipeline
+
+    pipeline = AspectSentimentPipeline(
+        CONFIG_FILE, batch_size=args.batch_size, cache_size=0, sentiment_mode=args.sentiment_mode,
+        backend=args.backend, num_threads=args.threads, workers=workers
+    )
+    comments = COMMENTS * args.repeat
+    pipeline.process_corpus_flat(comments[:args.batch_size * workers])  # warm-up: start workers, load models
+
+    start = time.perf_counter()
+    pipeline.process_corpus_flat(comments)
+    elapsed = time.perf_counter() - start
+    pipeline.close()
+    return len(comments) / elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=parse_counts, default=[1, 2, 4], help='Worker counts to try (default: 1,2,4)')
+    parser.add_argument('--repeat', type=int, default=200, help='Times the sample comments are repeated (default: 200)')
+    parser.add_argument('--batch-size', type=int, default=100, help='Comments per shard (default: 100)')
+    parser.add_argument('--threads', type=int, default=1, help='Torch threads per worker (default: 1)')
+    parser.add_argument('--sentiment-mode', choices=['ensemble', 'cascade', 'vader'], default='ensemble',
+                        help='Scoring mode (default: ensemble)')
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch', help='Inference backend (default: torch)')
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>8}{'comments/s':>12}{'speedup':>9}")
+    for workers in args.workers:
+        throughput = measure(workers, args)
+        baseline = baseline or throughput
+        print(f"{workers:>8}{throughput:>12.1f}{throughput / baseline:>8.2f}x")
+
+if __name__ == '__main__':
+    main()
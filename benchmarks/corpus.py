@@ -0,0 +1,36 @@
+"""
+Sample comments and contexts shared by the benchmark scripts.
+"""
+import sys
+from pathlib import Path
+
+# Run from anywhere: make the repository root importable for the test fixtures
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tests.fixtures.constants import EXAMPLE_CORPUS, SAMPLE_RESULTS
+
+CONFIG_FILE = str(Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "config.yaml")
+
+COMMENTS = EXAMPLE_CORPUS + [result['cleaned_text'] for result in SAMPLE_RESULTS] + [
+    "I love the camera quality but hate the battery life",
+    "The screen is beautiful and the performance is amazing",
+    "Poor build quality and terrible customer service",
+    "This smartphone has an excellent camera that takes crystal clear photos, but the battery drains way too quickly during heavy usage.",
+    "The build quality is outstanding and feels premium in hand, though I wish the screen was a bit brighter outdoors.",
+    "For the price point, this device offers great value. The performance is smooth and the design is sleek.",
+    "I'm disappointed with the audio quality - it sounds tinny and lacks bass. The camera is decent though.",
+    "The user interface is intuitive and easy to navigate. Battery life easily lasts a full day of moderate use.",
+]
+
+CONTEXTS = [
+    "i love the camera but",
+    "but hate the battery life",
+    "the screen is beautiful and the performance is amazing",
+    "poor build quality and terrible customer service",
+    "great value for money, highly recommend",
+    "the phone feels cheap but works fine",
+    "this smartphone has an excellent camera that takes crystal clear photos",
+    "the battery drains way too quickly during heavy usage",
+    "i wish the screen was a bit brighter outdoors",
+    "the audio quality sounds tinny and lacks bass",
+]
@@ -1,9 +1,38 @@
-from .pipeline import AspectSentimentPipeline
-from .config import create_aspect_config, AspectConfig, AspectData
-from .sentiment import AspectSentiment, AspectSentimentResult, AspectSentimentAnalyzer
-from .matching import AspectMatch
-from .export import export_for_review
-from .utils import clean_input
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .pipeline import AspectSentimentPipeline
+    from .config import create_aspect_config, AspectConfig, AspectData
+    from .sentiment import AspectSentiment, AspectSentimentResult, AspectSentimentAnalyzer
+    from .matching import AspectMatch, AspectMatcher
+    from .export import export_for_review
+    from .utils import clean_input
+    from .registry import ModelRegistry, MODEL_REGISTRY
+    from .scheduler import MicroBatchScheduler
+    from .server import InferenceServer
+    from .daemon import AnalysisDaemon
+
+# Public names are imported on first access, so `import marsa` does not load
+# torch, transformers, spaCy or pandas until a class that needs them is used
+_LAZY_ATTRIBUTES = {
+    'AspectSentimentPipeline': '.pipeline',
+    'create_aspect_config': '.config',
+    'AspectConfig': '.config',
+    'AspectData': '.config',
+    'AspectSentiment': '.sentiment',
+    'AspectSentimentResult': '.sentiment',
+    'AspectSentimentAnalyzer': '.sentiment',
+    'AspectMatch': '.matching',
+    'AspectMatcher': '.matching',
+    'export_for_review': '.export',
+    'clean_input': '.utils',
+    'ModelRegistry': '.registry',
+    'MODEL_REGISTRY': '.registry',
+    'MicroBatchScheduler': '.scheduler',
+    'InferenceServer': '.server',
+    'AnalysisDaemon': '.daemon',
+}
 
 __all__ = [
     'AspectSentimentPipeline',
@@ -16,4 +45,21 @@ __all__ = [
     'AspectSentimentResult',
     'AspectSentimentAnalyzer',
     'AspectMatch',
-]
\ No newline at end of file
+    'AspectMatcher',
+    'ModelRegistry',
+    'MODEL_REGISTRY',
+    'MicroBatchScheduler',
+    'InferenceServer',
+    'AnalysisDaemon',
+]
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,8 +1,8 @@
 import argparse
+import itertools
+import os
 import sys
 from pathlib import Path
-from marsa.pipeline import AspectSentimentPipeline
-from marsa.export import export_for_review
 
 def analyze_text(args) -> int:
     """
@@ -13,7 +13,20 @@ def analyze_text(args) -> int:
             - text (str): The text to analyze
             - config (str): Path to aspect configuration file
             - context_window (int): Number of tokens before/after aspects for context
+            - context_mode (str): "window", "sentence" or "merged" context extraction
+            - max_length (int): Maximum subword length of a scored context, 0 for no bound
             - output (str, optional): Output file path for results
+            - cache_file (str, optional): SQLite file that persists context scores across runs
+            - sentiment_mode (str): Scoring mode, one of "ensemble", "cascade" or "vader"
+            - uncertainty_band (float): VADER uncertainty band used in cascade mode
+            - backend (str): Inference backend of the BERT model, "torch" or "onnx"
+            - quantize (bool): Whether to apply dynamic INT8 quantization to the BERT model
+            - model_dir (str, optional): Provisioned model directory to load models from offline
+            - num_threads (int, optional): Intra-op threads used by the BERT model
+            - num_interop_threads (int, optional): Inter-op threads used by the BERT model
+            - cpu_affinity (list[int], optional): CPU cores the process is pinned to
+            - inference_mode (bool): Whether the torch model runs under torch.inference_mode
+            - daemon (bool): Whether to forward the text to a running `marsa daemon`
     
     Returns:
         int: Exit code (0 for success, 1 for error)
@@ -26,11 +39,42 @@ def analyze_text(args) -> int:
         print(f"Error: Config file '{config}' does not exist")
         return 1
     
+    options = {
+        'context_window': args.context_window,
+        'context_mode': args.context_mode,
+        'max_length': args.max_length or None,
+        'cache_path': str(Path(args.cache_file).resolve()) if args.cache_file else None,
+        'sentiment_mode': args.sentiment_mode,
+        'uncertainty_band': args.uncertainty_band,
+        'backend': args.backend,
+        'quantize': args.quantize,
+        'model_dir': str(Path(args.model_dir).resolve()) if args.model_dir else None,
+        'inference_mode': args.inference_mode
+    }
+    # Thread counts and core pinning apply to a whole process, so they rule out the daemon
+    process_options = (args.num_threads, args.num_interop_threads, args.cpu_affinity)
+    
     try:
-        pipeline = AspectSentimentPipeline(config_file=config, context_window=args.context_window)
-        results = pipeline.process_corpus_flat([args.text])
+        results = None
+        if args.daemon and all(option is None for option in process_options):
+            results = analyze_with_daemon(args.text, config, options)
+        
+        if results is None:
+            # Deferred so `marsa --help` does not pay for loading torch and spaCy
+            from marsa.pipeline import AspectSentimentPipeline
+            
+            pipeline = AspectSentimentPipeline(
+                config_file=config, 
+                num_threads=args.num_threads,
+                num_interop_threads=args.num_interop_threads,
+                cpu_affinity=args.cpu_affinity,
+                **options
+            )
+            results = pipeline.process_corpus_flat([args.text])
         
         if args.output:
+            from marsa.export import export_for_review
+            
             export_for_review(results, args.output)
             print(f"Results saved to {args.output}")
         else:
@@ -54,19 +98,70 @@ def analyze_text(args) -> int:
         print(f"Error during analysis: {e}")
         return 1
 
+def analyze_with_daemon(text: str, config: str, options: dict) -> list[dict] | None:
+    """
+    Analyze a text with a running `marsa daemon`, which keeps its models loaded.
+    
+    Args:
+        text (str): The text to analyze
+        config (str): Path to aspect configuration file
+        options (dict): Keyword arguments for AspectSentimentPipeline
+    
+    Returns:
+        list[dict] | None: Flat result of the text, or None if no daemon is running
+    
+    Raises:
+        RuntimeError: If the daemon failed to analyze the text
+    """
+    from marsa.daemon import request
+    
+    try:
+        reply = request({
+            'command': "analyze",
+            'text': text,
+            'config': str(Path(config).resolve()),
+            'options': options
+        })
+    except (OSError, ValueError):
+        return None  # daemon died mid-request; fall back to loading the models here
+    if reply is None:
+        return None
+    if 'error' in reply:
+        raise RuntimeError(reply['error'])
+    return [reply['result']]
+
 def analyze_file(args) -> int:
     """
     Analyze multiple text comments from a file for aspects and sentiment.
     
     Processes a file containing one comment per line and performs aspect-based
-    sentiment analysis on each comment using the specified configuration.
+    sentiment analysis on each comment using the specified configuration. The
+    file is read and the results are written one batch at a time.
     
     Args:
         args: Parsed command line arguments containing:
             - input_file (str): Path to input file (one comment per line)
             - config (str): Path to aspect configuration file
             - context_window (int): Number of tokens before/after aspects for context
+            - context_mode (str): "window", "sentence" or "merged" context extraction
+            - max_length (int): Maximum subword length of a scored context, 0 for no bound
             - output (str): Output file path for results
+            - batch_size (int): Number of comments tokenized per spaCy batch
+            - n_process (int): Number of processes used for spaCy tokenization
+            - sentiment_batch_size (int): Number of aspect contexts scored per BERT forward pass
+            - cache_size (int): Maximum number of context scores kept in the LRU cache
+            - cache_file (str, optional): SQLite file that persists context scores across runs
+            - sentiment_mode (str): Scoring mode, one of "ensemble", "cascade" or "vader"
+            - uncertainty_band (float): VADER uncertainty band used in cascade mode
+            - backend (str): Inference backend of the BERT model, "torch" or "onnx"
+            - quantize (bool): Whether to apply dynamic INT8 quantization to the BERT model
+            - model_dir (str, optional): Provisioned model directory to load models from offline
+            - num_threads (int, optional): Intra-op threads used by the BERT model
+            - num_interop_threads (int, optional): Inter-op threads used by the BERT model
+            - cpu_affinity (list[int], optional): CPU cores the process is pinned to
+            - inference_mode (bool): Whether the torch model runs under torch.inference_mode
+            - workers (int): Number of worker processes the comments are sharded across
+            - worker_start (str): "spawn" or "fork" start method of the worker processes
     
     Returns:
         int: Exit code (0 for success, 1 for error)
@@ -91,45 +186,316 @@ def analyze_file(args) -> int:
     print(f"Using context window: {args.context_window} tokens")
     
     try:
-        pipeline = AspectSentimentPipeline(config_file=config, context_window=args.context_window)
+        # Deferred so `marsa --help` does not pay for loading torch and spaCy
+        from marsa.export import export_for_review
+        from marsa.pipeline import AspectSentimentPipeline
+
+        pipeline = AspectSentimentPipeline(
+            config_file=config, 
+            context_window=args.context_window,
+            context_mode=args.context_mode,
+            max_length=args.max_length or None,
+            batch_size=args.batch_size,
+            n_process=args.n_process,
+            sentiment_batch_size=args.sentiment_batch_size,
+            cache_size=args.cache_size,
+            cache_path=args.cache_file,
+            sentiment_mode=args.sentiment_mode,
+            uncertainty_band=args.uncertainty_band,
+            backend=args.backend,
+            quantize=args.quantize,
+            model_dir=args.model_dir,
+            num_threads=args.num_threads,
+            num_interop_threads=args.num_interop_threads,
+            cpu_affinity=args.cpu_affinity,
+            inference_mode=args.inference_mode,
+            workers=args.workers,
+            worker_start=args.worker_start
+        )
         
         with open(input_path, 'r', encoding='utf-8') as fp:
-            comments = [line.strip() for line in fp if line.strip()]
-        
-        if not comments:
-            print("Warning: No comments found in input file")
-            return 1
+            # Comments are streamed from the file and results streamed to the output,
+            # so memory stays flat however large the input is
+            comments = (line.strip() for line in fp if line.strip())
+            first_comment = next(comments, None)
+            if first_comment is None:
+                print("Warning: No comments found in input file")
+                return 1
             
-        print(f"Processing {len(comments)} comments...")
-        
-        if len(comments) > 10:
-            print("Processing", end="", flush=True)
-        
-        results = pipeline.process_corpus_flat(comments)
-        
-        if len(comments) > 10:
-            print(" ✓")
-        
-        export_for_review(results, output)
+            print(f"Processing comments with {args.workers} worker processes..." if args.workers > 1 else "Processing comments...")
+            totals = {'comments': 0, 'aspects': 0}
+            
+            def counted(results):
+                for result in results:
+                    totals['comments'] += 1
+                    totals['aspects'] += result['aspects_found']
+                    yield result
+            
+            results = pipeline.process_corpus_flat_iter(itertools.chain([first_comment], comments))
+            export_for_review(counted(results), output)
         
-        total_aspects = sum(r['aspects_found'] for r in results)
+        total_aspects = totals['aspects']
+        score_cache = pipeline.sentiment_analyzer.score_cache
+        stats = pipeline.sentiment_analyzer.stats
         print(f"Analysis complete!")
-        print(f"  - Processed: {len(comments)} comments")
+        print(f"  - Processed: {totals['comments']} comments")
         print(f"  - Found: {total_aspects} aspects total")
         print(f"  - Context window: {args.context_window} tokens")
+        print(f"  - BERT path: {stats.bert_contexts} of {stats.contexts} contexts ({stats.bert_inferences} inferences)")
+        if args.context_mode == "merged":
+            print(f"  - Merged windows: {stats.merged_windows} scorings saved")
+        if score_cache is not None and args.workers == 1:
+            cache_info = score_cache.info()
+            print(f"  - Score cache: {cache_info['hits']} hits, {cache_info['misses']} misses")
+        disk_cache = pipeline.sentiment_analyzer.disk_cache
+        if disk_cache is not None:
+            disk_info = disk_cache.info()
+            print(f"  - Cache file: {disk_info['hits']} hits, {disk_info['misses']} misses ({disk_cache.path})")
         print(f"  - Results saved to: {output}")
         
+        pipeline.close()
         return 0
     
     except Exception as e:
         print(f"Error during analysis: {e}")
         return 1
 
+def serve(args) -> int:
+    """
+    Serve aspect sentiment analysis over HTTP with the models loaded once.
+    
+    Args:
+        args: Parsed command line arguments containing:
+            - config (str): Path to aspect configuration file
+            - host (str): Address to listen on
+            - port (int): Port to listen on
+            - max_batch_size (int): Maximum number of requests scored together
+            - max_wait_ms (float): Milliseconds a request waits for others to join its batch
+            - max_queue_size (int): Requests that may wait for a batch before 503 is returned
+            - context_window (int): Number of tokens before/after aspects for context
+            - context_mode (str): "window", "sentence" or "merged" context extraction
+            - max_length (int): Maximum subword length of a scored context, 0 for no bound
+            - cache_size (int): Maximum number of context scores kept in the LRU cache
+            - cache_file (str, optional): SQLite file that persists context scores across runs
+            - sentiment_mode (str): Scoring mode, one of "ensemble", "cascade" or "vader"
+            - uncertainty_band (float): VADER uncertainty band used in cascade mode
+            - backend (str): Inference backend of the BERT model, "torch" or "onnx"
+            - quantize (bool): Whether to apply dynamic INT8 quantization to the BERT model
+            - model_dir (str, optional): Provisioned model directory to load models from offline
+            - num_threads (int, optional): Intra-op threads used by the BERT model
+    
+    Returns:
+        int: Exit code (0 after a clean shutdown, 1 for error)
+    """
+    config = args.config
+    if not Path(config).resolve().exists():
+        print(f"Error: Config file '{config}' does not exist")
+        return 1
+    
+    from marsa.server import InferenceServer
+    
+    try:
+        server = InferenceServer(
+            config, 
+            host=args.host, 
+            port=args.port,
+            context_window=args.context_window,
+            context_mode=args.context_mode,
+            max_length=args.max_length or None,
+            cache_size=args.cache_size,
+            cache_path=args.cache_file,
+            sentiment_mode=args.sentiment_mode,
+            uncertainty_band=args.uncertainty_band,
+            backend=args.backend,
+            quantize=args.quantize,
+            model_dir=args.model_dir,
+            num_threads=args.num_threads,
+            async_batch_size=args.max_batch_size,
+            async_max_wait=args.max_wait_ms / 1000,
+            async_queue_size=args.max_queue_size
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error starting server: {e}")
+        return 1
+    
+    host, port = server.address
+    print(f"Serving on http://{host}:{port} (loading models; /readyz reports when ready)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.close()
+    return 0
+
+def daemon_start(args) -> int:
+    """
+    Start the background daemon that keeps models loaded for analyze-text.
+    
+    Args:
+        args: Parsed command line arguments containing:
+            - socket (str, optional): Unix socket path of the daemon
+            - idle_timeout (float): Seconds without requests after which the daemon exits
+            - foreground (bool): Whether to run in this process instead of detaching
+    
+    Returns:
+        int: Exit code (0 for success, 1 for error)
+    """
+    from marsa.daemon import SUPPORTED, AnalysisDaemon, default_socket_path, is_running, start_daemon
+    
+    if not SUPPORTED:
+        print("Error: the daemon needs Unix domain sockets, which this platform does not support")
+        return 1
+    path = args.socket or default_socket_path()
+    try:
+        if args.foreground:
+            AnalysisDaemon(args.socket, idle_timeout=args.idle_timeout).serve_forever()
+            return 0
+        if is_running(path):
+            print(f"Daemon already running on {path}")
+            return 0
+        start_daemon(args.socket, idle_timeout=args.idle_timeout)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Error starting daemon: {e}")
+        return 1
+    print(f"Daemon listening on {path} (exits after {args.idle_timeout:g}s idle)")
+    return 0
+
+def daemon_stop(args) -> int:
+    """
+    Stop a running daemon.
+    
+    Args:
+        args: Parsed command line arguments containing:
+            - socket (str, optional): Unix socket path of the daemon
+    
+    Returns:
+        int: Exit code (0 if the daemon was stopped or not running, 1 if it could not be contacted)
+    """
+    from marsa.daemon import request
+    
+    try:
+        reply = request({'command': "stop"}, args.socket, timeout=5.0)
+    except OSError as e:
+        print(f"Error contacting daemon: {e}")
+        return 1
+    if reply is None:
+        print("Daemon is not running")
+    else:
+        print("Daemon stopped")
+    return 0
+
+def daemon_status(args) -> int:
+    """
+    Report whether a daemon is running.
+    
+    Args:
+        args: Parsed command line arguments containing:
+            - socket (str, optional): Unix socket path of the daemon
+    
+    Returns:
+        int: Exit code (0 if the daemon is running, 1 otherwise)
+    """
+    from marsa.daemon import request
+    
+    try:
+        status = request({'command': "status"}, args.socket, timeout=5.0)
+    except OSError as e:
+        print(f"Error contacting daemon: {e}")
+        return 1
+    if status is None:
+        print("Daemon is not running")
+        return 1
+    print(f"Daemon running (pid {status['pid']}, {status['pipelines']} pipeline(s) loaded, "
+          f"exits after {status['idle_timeout']:g}s idle)")
+    return 0
+
+def cpu_list(value: str) -> list[int]:
+    """
+    Parse a CPU core list such as "0,1,4-7" for --cpu-affinity.
+    
+    Args:
+        value (str): Comma-separated core numbers and inclusive ranges
+        
+    Returns:
+        list[int]: Core numbers in the order given
+        
+    Raises:
+        argparse.ArgumentTypeError: If the list is empty or malformed
+    """
+    cores = []
+    try:
+        for part in value.split(','):
+            if '-' in part:
+                first, last = part.split('-')
+                cores.extend(range(int(first), int(last) + 1))
+            else:
+                cores.append(int(part))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid CPU list: {value!r}")
+    if not cores:
+        raise argparse.ArgumentTypeError(f"invalid CPU list: {value!r}")
+    return cores
+
+def models_fetch(args) -> int:
+    """
+    Download the spaCy and BERT models into a local model directory.
+    
+    Args:
+        args: Parsed command line arguments containing:
+            - dir (str): Model directory to populate
+            - spacy_model (str): Name of the spaCy model to fetch
+            - onnx (bool): Whether to also export the BERT model for the onnx backend
+    
+    Returns:
+        int: Exit code (0 for success, 1 for error)
+    """
+    if not args.dir:
+        print("Error: no model directory given; pass --dir or set MARSA_MODEL_DIR")
+        return 1
+    
+    try:
+        from marsa.provision import fetch_models
+        
+        manifest = fetch_models(args.dir, spacy_model=args.spacy_model, onnx=args.onnx)
+        print(f"Models saved to {manifest.parent}")
+        return 0
+    
+    except Exception as e:
+        print(f"Error fetching models: {e}")
+        return 1
+
+def models_verify(args) -> int:
+    """
+    Check that a local model directory is complete and unmodified.
+    
+    Args:
+        args: Parsed command line arguments containing:
+            - dir (str): Model directory to check
+    
+    Returns:
+        int: Exit code (0 if the directory is valid, 1 otherwise)
+    """
+    if not args.dir:
+        print("Error: no model directory given; pass --dir or set MARSA_MODEL_DIR")
+        return 1
+    
+    from marsa.provision import verify_models
+    
+    problems = verify_models(args.dir)
+    for problem in problems:
+        print(f"  - {problem}")
+    if problems:
+        print(f"Model directory {args.dir} is not valid")
+        return 1
+    print(f"Model directory {args.dir} is valid")
+    return 0
+
 def main():
     """
     Main entry point for the MARSA command-line interface.
     
-    Sets up argument parsing for analyze-text and analyze-file commands,
+    Sets up argument parsing for the analyze-text, analyze-file, serve, daemon and models commands,
     configures help text and examples, and executes the appropriate
     analysis function based on user input.
     """
@@ -141,6 +507,9 @@ Examples:
   marsa analyze-text "Great camera but poor battery" -c config.yaml -w 2
   marsa analyze-file reviews.txt -c config.yaml -o results.json
   marsa analyze-text "Love this phone!" -c config.yaml --output analysis.json --context_window 3
+  marsa models fetch --dir /opt/marsa-models && marsa analyze-file reviews.txt -c config.yaml --model-dir /opt/marsa-models
+  marsa serve -c config.yaml --port 8000
+  marsa daemon start && marsa analyze-text "Great camera" -c config.yaml
   
 Context Window:
   The context window determines how many tokens before and after each detected aspect
@@ -166,6 +535,32 @@ Context Window:
                            help='Output file (if not provided, prints to console)')
     text_parser.add_argument('-w', '--context-window', type=int, default=3, metavar='N',
                        help='Number of tokens before and after each aspect to include for sentiment analysis (default: 3)')
+    text_parser.add_argument('--context-mode', choices=['window', 'sentence', 'merged'], default='window',
+                           help='window scores tokens around each aspect, sentence scores each sentence once for all its aspects, merged scores overlapping windows once (default: window)')
+    text_parser.add_argument('--max-length', type=int, default=256, metavar='N',
+                           help='Truncate contexts longer than N subwords around the aspect, 0 disables (default: 256)')
+    text_parser.add_argument('--cache-file', metavar='PATH',
+                           help='SQLite file used to persist context scores across runs')
+    text_parser.add_argument('--sentiment-mode', choices=['ensemble', 'cascade', 'vader'], default='ensemble',
+                           help='ensemble scores every aspect with VADER and BERT, cascade only runs BERT when VADER is uncertain, vader never loads BERT (default: ensemble)')
+    text_parser.add_argument('--uncertainty-band', type=float, default=0.5, metavar='X',
+                           help='In cascade mode, run BERT when the absolute VADER score is below X (default: 0.5)')
+    text_parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch',
+                           help='Inference backend for the BERT model; onnx exports the model once and runs it with onnxruntime (default: torch)')
+    text_parser.add_argument('--quantize', action='store_true',
+                           help='Apply dynamic INT8 quantization to the BERT model for faster, smaller CPU inference (torch backend only)')
+    text_parser.add_argument('--num-threads', type=int, metavar='N',
+                           help='Intra-op threads used by the BERT model (default: all cores)')
+    text_parser.add_argument('--num-interop-threads', type=int, metavar='N',
+                           help='Inter-op threads used by the BERT model (default: library default)')
+    text_parser.add_argument('--cpu-affinity', type=cpu_list, metavar='CPUS',
+                           help='Pin the process to these CPU cores, e.g. 0-3 or 0,2,4')
+    text_parser.add_argument('--no-inference-mode', dest='inference_mode', action='store_false',
+                           help='Run the torch model without torch.inference_mode')
+    text_parser.add_argument('--model-dir', metavar='DIR', default=os.environ.get('MARSA_MODEL_DIR'),
+                           help='Load models only from a directory populated by `marsa models fetch`, never downloading (default: $MARSA_MODEL_DIR)')
+    text_parser.add_argument('--no-daemon', dest='daemon', action='store_false',
+                           help='Load the models in this process even when `marsa daemon` is running')
     text_parser.set_defaults(func=analyze_text)
     
     # Analyze file command  
@@ -181,8 +576,123 @@ Context Window:
                            help='Output file (default: results.json)')
     file_parser.add_argument('-w', '--context-window', type=int, default=3, metavar='N',
                            help='Number of tokens before and after each aspect to include for sentiment analysis (default: 3)')
+    file_parser.add_argument('--batch-size', type=int, default=1000, metavar='N',
+                           help='Number of comments tokenized per spaCy batch (default: 1000)')
+    file_parser.add_argument('--n-process', type=int, default=1, metavar='N',
+                           help='Number of processes used for spaCy tokenization (default: 1)')
+    file_parser.add_argument('--sentiment-batch-size', type=int, default=32, metavar='N',
+                           help='Number of aspect contexts scored per BERT forward pass (default: 32)')
+    file_parser.add_argument('--cache-size', type=int, default=10000, metavar='N',
+                           help='Maximum number of context scores kept in memory, 0 disables caching (default: 10000)')
+    file_parser.add_argument('--context-mode', choices=['window', 'sentence', 'merged'], default='window',
+                           help='window scores tokens around each aspect, sentence scores each sentence once for all its aspects, merged scores overlapping windows once (default: window)')
+    file_parser.add_argument('--max-length', type=int, default=256, metavar='N',
+                           help='Truncate contexts longer than N subwords around the aspect, 0 disables (default: 256)')
+    file_parser.add_argument('--cache-file', metavar='PATH',
+                           help='SQLite file used to persist context scores across runs')
+    file_parser.add_argument('--sentiment-mode', choices=['ensemble', 'cascade', 'vader'], default='ensemble',
+                           help='ensemble scores every aspect with VADER and BERT, cascade only runs BERT when VADER is uncertain, vader never loads BERT (default: ensemble)')
+    file_parser.add_argument('--uncertainty-band', type=float, default=0.5, metavar='X',
+                           help='In cascade mode, run BERT when the absolute VADER score is below X (default: 0.5)')
+    file_parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch',
+                           help='Inference backend for the BERT model; onnx exports the model once and runs it with onnxruntime (default: torch)')
+    file_parser.add_argument('--quantize', action='store_true',
+                           help='Apply dynamic INT8 quantization to the BERT model for faster, smaller CPU inference (torch backend only)')
+    file_parser.add_argument('--num-threads', type=int, metavar='N',
+                           help='Intra-op threads used by the BERT model (default: all cores)')
+    file_parser.add_argument('--num-interop-threads', type=int, metavar='N',
+                           help='Inter-op threads used by the BERT model (default: library default)')
+    file_parser.add_argument('--cpu-affinity', type=cpu_list, metavar='CPUS',
+                           help='Pin the process to these CPU cores, e.g. 0-3 or 0,2,4')
+    file_parser.add_argument('--no-inference-mode', dest='inference_mode', action='store_false',
+                           help='Run the torch model without torch.inference_mode')
+    file_parser.add_argument('--model-dir', metavar='DIR', default=os.environ.get('MARSA_MODEL_DIR'),
+                           help='Load models only from a directory populated by `marsa models fetch`, never downloading (default: $MARSA_MODEL_DIR)')
+    file_parser.add_argument('--workers', type=int, default=1, metavar='N',
+                           help='Shard comments across N worker processes that each load the models once (default: 1)')
+    file_parser.add_argument('--worker-start', choices=['spawn', 'fork'], default='spawn',
+                           help='spawn workers that load their own models, or fork them after loading so they share the weights copy-on-write (default: spawn)')
     file_parser.set_defaults(func=analyze_file)
     
+    # HTTP inference server command
+    serve_parser = subparsers.add_parser(
+        'serve',
+        help='Serve analysis over HTTP with the models loaded once'
+    )
+    serve_parser.add_argument('-c', '--config', required=True, 
+                            help='Aspect config file (.yaml/.yml or .json)')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8000, help='Port to listen on (default: 8000)')
+    serve_parser.add_argument('--max-batch-size', type=int, default=32, metavar='N',
+                            help='Maximum number of comments scored together (default: 32)')
+    serve_parser.add_argument('--max-wait-ms', type=float, default=5.0, metavar='MS',
+                            help='Milliseconds a request waits for others to join its batch (default: 5)')
+    serve_parser.add_argument('--max-queue-size', type=int, default=256, metavar='N',
+                            help='Comments that may wait for a batch before requests get 503 (default: 256)')
+    serve_parser.add_argument('-w', '--context-window', type=int, default=3, metavar='N',
+                            help='Number of tokens before and after each aspect to include for sentiment analysis (default: 3)')
+    serve_parser.add_argument('--context-mode', choices=['window', 'sentence', 'merged'], default='window',
+                            help='window scores tokens around each aspect, sentence scores each sentence once for all its aspects, merged scores overlapping windows once (default: window)')
+    serve_parser.add_argument('--max-length', type=int, default=256, metavar='N',
+                            help='Truncate contexts longer than N subwords around the aspect, 0 disables (default: 256)')
+    serve_parser.add_argument('--cache-size', type=int, default=10000, metavar='N',
+                            help='Maximum number of context scores kept in memory, 0 disables caching (default: 10000)')
+    serve_parser.add_argument('--cache-file', metavar='PATH',
+                            help='SQLite file used to persist context scores across runs')
+    serve_parser.add_argument('--sentiment-mode', choices=['ensemble', 'cascade', 'vader'], default='ensemble',
+                            help='ensemble scores every aspect with VADER and BERT, cascade only runs BERT when VADER is uncertain, vader never loads BERT (default: ensemble)')
+    serve_parser.add_argument('--uncertainty-band', type=float, default=0.5, metavar='X',
+                            help='In cascade mode, run BERT when the absolute VADER score is below X (default: 0.5)')
+    serve_parser.add_argument('--backend', choices=['torch', 'onnx'], default='torch',
+                            help='Inference backend for the BERT model; onnx exports the model once and runs it with onnxruntime (default: torch)')
+    serve_parser.add_argument('--quantize', action='store_true',
+                            help='Apply dynamic INT8 quantization to the BERT model for faster, smaller CPU inference (torch backend only)')
+    serve_parser.add_argument('--num-threads', type=int, metavar='N',
+                            help='Intra-op threads used by the BERT model (default: all cores)')
+    serve_parser.add_argument('--model-dir', metavar='DIR', default=os.environ.get('MARSA_MODEL_DIR'),
+                            help='Load models only from a directory populated by `marsa models fetch`, never downloading (default: $MARSA_MODEL_DIR)')
+    serve_parser.set_defaults(func=serve)
+    
+    # Background daemon commands
+    daemon_parser = subparsers.add_parser(
+        'daemon',
+        help='Keep models loaded in a background process for analyze-text'
+    )
+    daemon_subparsers = daemon_parser.add_subparsers(dest='daemon_command', required=True)
+    daemon_start_parser = daemon_subparsers.add_parser('start', help='Start the daemon in the background')
+    daemon_start_parser.add_argument('--idle-timeout', type=float, default=900.0, metavar='SECONDS',
+                                   help='Exit after this many seconds without requests (default: 900)')
+    daemon_start_parser.add_argument('--foreground', action='store_true',
+                                   help='Run the daemon in this process instead of detaching')
+    daemon_start_parser.set_defaults(func=daemon_start)
+    daemon_stop_parser = daemon_subparsers.add_parser('stop', help='Stop the running daemon')
+    daemon_stop_parser.set_defaults(func=daemon_stop)
+    daemon_status_parser = daemon_subparsers.add_parser('status', help='Report whether the daemon is running')
+    daemon_status_parser.set_defaults(func=daemon_status)
+    for command_parser in (daemon_start_parser, daemon_stop_parser, daemon_status_parser):
+        command_parser.add_argument('--socket', metavar='PATH',
+                                  help='Unix socket of the daemon (default: $MARSA_DAEMON_SOCKET or a per-user path)')
+    
+    # Model provisioning commands
+    models_parser = subparsers.add_parser(
+        'models',
+        help='Fetch or verify a local model directory for offline use'
+    )
+    models_parser.set_defaults(func=lambda args: models_parser.print_help() or 1)
+    models_subparsers = models_parser.add_subparsers(dest='models_command', help='Model commands')
+    fetch_parser = models_subparsers.add_parser('fetch', help='Download all models into a local directory')
+    fetch_parser.add_argument('--dir', default=os.environ.get('MARSA_MODEL_DIR'), metavar='DIR',
+                            help='Model directory to populate (default: $MARSA_MODEL_DIR)')
+    fetch_parser.add_argument('--spacy-model', default='en_core_web_sm', metavar='NAME',
+                            help='spaCy model to fetch (default: en_core_web_sm)')
+    fetch_parser.add_argument('--onnx', action='store_true',
+                            help='Also export the BERT model for the onnx backend')
+    fetch_parser.set_defaults(func=models_fetch)
+    verify_parser = models_subparsers.add_parser('verify', help='Check a local model directory against its manifest')
+    verify_parser.add_argument('--dir', default=os.environ.get('MARSA_MODEL_DIR'), metavar='DIR',
+                             help='Model directory to check (default: $MARSA_MODEL_DIR)')
+    verify_parser.set_defaults(func=models_verify)
+    
     args = parser.parse_args()
     
     if hasattr(args, 'func'):
@@ -0,0 +1,343 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# Rows inserted by one process between exact row counts of the SQLite cache
+RECOUNT_INTERVAL = 10000
+
+class ScoreCache:
+    """
+    Bounded in-process LRU cache for per-context sentiment scores.
+
+    Review corpora repeat the same context windows many times, so the analyzer
+    stores the VADER compound score and BERT probabilities of each scored context
+    and reuses them instead of running the models again. Entries are keyed by the
+    model identity and the exact context string; the least recently used entry is
+    evicted once the cache is full.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept in the cache
+        hits (int): Number of lookups that found a cached score
+        misses (int): Number of lookups that found no cached score
+    """
+    def __init__(self, maxsize: int = 10000) -> None:
+        """
+        Initialize an empty score cache.
+
+        Args:
+            maxsize (int, optional): Maximum number of entries kept in the cache.
+                                  Defaults to 10000.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> tuple[float, list[float]] | None:
+        """
+        Look up the cached scores for a context.
+
+        Args:
+            key (tuple[str, str]): Model identity and exact context string
+
+        Returns:
+            tuple[float, list[float]] | None: VADER compound score and BERT probabilities,
+                                            or None if the context is not cached
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple[str, str], value: tuple[float, list[float]]) -> None:
+        """
+        Store the scores for a context, evicting the least recently used entry if full.
+
+        Args:
+            key (tuple[str, str]): Model identity and exact context string
+            value (tuple[float, list[float]]): VADER compound score and BERT probabilities
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the hit/miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """
+        Report cache usage statistics.
+
+        Returns:
+            dict: Hits, misses, current size and maximum size of the cache
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteScoreCache:
+    """
+    Persistent on-disk cache for per-context sentiment scores backed by SQLite.
+
+    Scores computed in an earlier run, or by another worker process, are read
+    back instead of recomputed. Entries are keyed by a SHA-256 hash of the model
+    identity (model name and scoring parameters) and the exact context string.
+    The database runs in WAL mode so concurrent readers do not block a writer,
+    and the least recently used entries are evicted once max_entries is exceeded.
+    Lookups never write: access times of hits are kept in memory and stored
+    with the next put_many (or close), and the table is only counted when the
+    inserts since the last count could have filled it, or every
+    RECOUNT_INTERVAL inserts to account for other processes' writes.
+
+    Attributes:
+        path (Path): Location of the SQLite database file
+        max_entries (int): Maximum number of entries kept in the database
+        hits (int): Number of lookups that found a stored score
+        misses (int): Number of lookups that found no stored score
+    """
+    def __init__(self, path: str, max_entries: int = 1000000) -> None:
+        """
+        Open (or create) the score database.
+
+        Args:
+            path (str): Path to the SQLite database file
+            max_entries (int, optional): Maximum number of entries kept in the database.
+                                      Defaults to 1000000.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or initialized
+        """
+        self.path = Path(path).resolve()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._size = 0
+        self._inserted = 0
+        self._accessed = {}
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Return the connection for the current process, opening it if needed.
+
+        SQLite connections must not be shared across a fork, so a worker process
+        that inherited this cache opens its own connection on first use.
+
+        Returns:
+            sqlite3.Connection: Open connection to the score database
+        """
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS scores ("
+                    "key TEXT PRIMARY KEY, vader REAL NOT NULL, bert TEXT NOT NULL, accessed REAL NOT NULL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS scores_accessed ON scores (accessed)")
+            self._connection = connection
+            self._pid = os.getpid()
+            self._size = connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            self._inserted = 0
+            self._accessed = {}
+        return self._connection
+
+    @staticmethod
+    def _hash_key(key: tuple[str, str]) -> str:
+        """
+        Hash a (model identity, context) key into a fixed-size database key.
+
+        Args:
+            key (tuple[str, str]): Model identity and exact context string
+
+        Returns:
+            str: Hex-encoded SHA-256 digest of the key
+        """
+        model_identity, context = key
+        return hashlib.sha256(f"{model_identity}\x00{context}".encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], tuple[float, list[float]]]:
+        """
+        Look up the stored scores for several contexts at once.
+
+        Args:
+            keys (list[tuple[str, str]]): Model identity and exact context string for each lookup
+
+        Returns:
+            dict[tuple[str, str], tuple[float, list[float]]]: Stored scores for the keys that were found
+        """
+        if not keys:
+            return {}
+
+        hashed = {self._hash_key(key): key for key in keys}
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            hashes = list(hashed)
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT key, vader, bert FROM scores WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for hash_key, vader, bert in rows:
+                    found[hashed[hash_key]] = (vader, json.loads(bert))
+
+            # Stored with the next write instead of taking the write lock on every hit
+            now = time.time()
+            for key in found:
+                self._accessed[self._hash_key(key)] = now
+            self.hits += len(found)
+            self.misses += len(hashed) - len(found)
+        return found
+
+    def put_many(self, items: dict[tuple[str, str], tuple[float, list[float]]]) -> None:
+        """
+        Store the scores for several contexts, evicting least recently used entries if full.
+
+        Args:
+            items (dict[tuple[str, str], tuple[float, list[float]]]): Scores keyed by model 
+                                                                    identity and context string
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (self._hash_key(key), vader, json.dumps(bert), now)
+            for key, (vader, bert) in items.items()
+        ]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                self._flush_accessed(connection)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO scores (key, vader, bert, accessed) VALUES (?, ?, ?, ?)", rows
+                )
+                # Replaced rows make this an upper bound, so the table is only counted when it may be full
+                self._size += len(rows)
+                self._inserted += len(rows)
+                if self._size > self.max_entries or self._inserted >= RECOUNT_INTERVAL:
+                    (self._size,) = connection.execute("SELECT COUNT(*) FROM scores").fetchone()
+                    self._inserted = 0
+                if self._size > self.max_entries:
+                    # Evict a little below the limit so the next inserts do not evict again
+                    target = self.max_entries - self.max_entries // 100
+                    connection.execute(
+                        "DELETE FROM scores WHERE key IN "
+                        "(SELECT key FROM scores ORDER BY accessed ASC LIMIT ?)",
+                        (self._size - target,)
+                    )
+                    self._size = target
+
+    def _flush_accessed(self, connection: sqlite3.Connection) -> None:
+        """
+        Store the access times of hits since the last write; called inside a transaction.
+
+        Args:
+            connection (sqlite3.Connection): Open connection to the score database
+        """
+        if self._accessed:
+            connection.executemany(
+                "UPDATE scores SET accessed = ? WHERE key = ?",
+                [(accessed, hash_key) for hash_key, accessed in self._accessed.items()]
+            )
+            self._accessed = {}
+
+    def get(self, key: tuple[str, str]) -> tuple[float, list[float]] | None:
+        """
+        Look up the stored scores for a single context.
+
+        Args:
+            key (tuple[str, str]): Model identity and exact context string
+
+        Returns:
+            tuple[float, list[float]] | None: VADER compound score and BERT probabilities,
+                                            or None if the context is not stored
+        """
+        return self.get_many([key]).get(key)
+
+    def put(self, key: tuple[str, str], value: tuple[float, list[float]]) -> None:
+        """
+        Store the scores for a single context.
+
+        Args:
+            key (tuple[str, str]): Model identity and exact context string
+            value (tuple[float, list[float]]): VADER compound score and BERT probabilities
+        """
+        self.put_many({key: value})
+
+    def clear(self) -> None:
+        """
+        Remove all stored entries and reset the hit/miss counters.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM scores")
+            self._size = 0
+            self._inserted = 0
+            self._accessed = {}
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """
+        Store the access times of pending hits and close the connection held by this process.
+        """
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                with self._connection:
+                    self._flush_accessed(self._connection)
+                self._connection.close()
+            self._connection = None
+            self._pid = None
+
+    def info(self) -> dict:
+        """
+        Report cache usage statistics.
+
+        Returns:
+            dict: Hits, misses, current size and maximum size of the cache
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self),
+            'maxsize': self.max_entries
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            (size,) = self._connect().execute("SELECT COUNT(*) FROM scores").fetchone()
+        return size
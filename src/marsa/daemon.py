@@ -0,0 +1,370 @@
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_IDLE_TIMEOUT = 900.0
+MAX_PIPELINES = 4
+CONNECT_TIMEOUT = 0.5
+# Unix sockets and user ids are POSIX only; elsewhere analyze-text never uses a daemon
+SUPPORTED = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+def default_socket_path() -> str:
+    """
+    Socket path of the current user's daemon.
+
+    $MARSA_DAEMON_SOCKET takes precedence. Otherwise the socket lives in a
+    marsa-<uid> directory, private to the user, under $XDG_RUNTIME_DIR or the
+    temporary directory, so users on one host never share a daemon.
+
+    Returns:
+        str: Path of the Unix socket
+    """
+    if os.environ.get('MARSA_DAEMON_SOCKET'):
+        return os.environ['MARSA_DAEMON_SOCKET']
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f"marsa-{os.getuid()}", "daemon.sock")
+
+def _check_owner(path: str) -> None:
+    """
+    Make sure a socket or directory belongs to the current user.
+
+    Args:
+        path (str): Path to check
+
+    Raises:
+        PermissionError: If another user owns the path
+    """
+    if os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")
+
+def request(payload: dict, path: str | None = None, timeout: float | None = None) -> dict | None:
+    """
+    Send one request to a running daemon and return its reply.
+
+    Args:
+        payload (dict): JSON-serializable request, with a 'command' key
+        path (str | None, optional): Socket path. Defaults to default_socket_path().
+        timeout (float | None, optional): Seconds to wait for the reply, None to wait
+                                         as long as the analysis takes. Defaults to None.
+
+    Returns:
+        dict | None: Reply of the daemon, or None if no daemon is listening on the socket
+                     or daemons are not supported on this platform
+
+    Raises:
+        PermissionError: If the socket is owned by another user; no text is sent to it
+    """
+    if not SUPPORTED:
+        return None
+    path = path or default_socket_path()
+    try:
+        _check_owner(path)
+    except FileNotFoundError:
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(CONNECT_TIMEOUT)
+        try:
+            client.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout):
+            return None
+        client.settimeout(timeout)
+        client.sendall(json.dumps(payload).encode('utf-8') + b"\n")
+        with client.makefile('rb') as reader:
+            line = reader.readline()
+    finally:
+        client.close()
+    if not line:
+        raise ConnectionError("The daemon closed the connection without replying")
+    return json.loads(line)
+
+def is_running(path: str | None = None) -> bool:
+    """
+    Check whether a daemon answers on the socket.
+
+    Args:
+        path (str | None, optional): Socket path. Defaults to default_socket_path().
+
+    Returns:
+        bool: True if a daemon replied to a status request
+    """
+    try:
+        return request({'command': "status"}, path, timeout=CONNECT_TIMEOUT * 4) is not None
+    except (OSError, ValueError):
+        return False
+
+def start_daemon(path: str | None = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, wait: float = 10.0) -> None:
+    """
+    Start a daemon in a detached background process and wait until it listens.
+
+    Args:
+        path (str | None, optional): Socket path. Defaults to default_socket_path().
+        idle_timeout (float, optional): Seconds without requests after which the daemon
+                                     exits. Defaults to DEFAULT_IDLE_TIMEOUT.
+        wait (float, optional): Seconds to wait for the socket. Defaults to 10.0.
+
+    Raises:
+        RuntimeError: If the daemon does not listen within wait seconds
+    """
+    command = [sys.executable, "-m", "marsa", "daemon", "start", "--foreground", "--idle-timeout", str(idle_timeout)]
+    if path is not None:
+        command += ["--socket", path]
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if is_running(path):
+            return
+        if process.poll() is not None:
+            raise RuntimeError(f"The daemon exited with code {process.returncode}")
+        time.sleep(0.05)
+    raise RuntimeError(f"The daemon did not start listening on {path or default_socket_path()} within {wait} seconds")
+
+@dataclass
+class _PipelineEntry:
+    """
+    Loaded pipeline of the daemon with the lock serializing its use.
+
+    An evicted entry stays usable by the requests that already hold it and
+    its pipeline is closed once the last of them is done.
+    """
+    pipeline: "AspectSentimentPipeline"
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    users: int = 0
+    evicted: bool = False
+
+class AnalysisDaemon:
+    """
+    Background process that keeps pipelines loaded and analyzes texts sent over a Unix socket.
+
+    Each request is one line of JSON and gets one line of JSON back. A pipeline
+    is built the first time a config file and option set is requested and then
+    reused, so only the first call pays for loading spaCy and roberta; editing
+    the config file builds a fresh pipeline. Pipelines share their models
+    through the model registry and at most MAX_PIPELINES are kept, least
+    recently used first out; an evicted pipeline is closed once the requests
+    using it are done. The daemon exits by itself once no request has
+    arrived for idle_timeout seconds. The socket (and, by default, its
+    directory) is only accessible to the user who started the daemon, and
+    clients refuse to send text to a socket another user owns.
+
+    Requests:
+        {"command": "analyze", "text": "...", "config": "...", "options": {...}}
+            -> {"result": flat result of the text} or {"error": "..."}
+        {"command": "status"} -> {"pid": ..., "pipelines": ..., "idle_timeout": ...}
+        {"command": "stop"} -> {"stopping": true}
+
+    Attributes:
+        socket_path (str): Path of the Unix socket
+        idle_timeout (float): Seconds without requests after which the daemon exits
+        server (socketserver.ThreadingUnixStreamServer): Underlying socket server
+    """
+    def __init__(self, socket_path: str | None = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+        """
+        Bind the socket; pipelines are built on demand.
+
+        Args:
+            socket_path (str | None, optional): Path of the Unix socket. Defaults to
+                                               default_socket_path().
+            idle_timeout (float, optional): Seconds without requests after which the
+                                         daemon exits. Defaults to DEFAULT_IDLE_TIMEOUT.
+
+        Raises:
+            ValueError: If idle_timeout is not positive
+            OSError: If Unix sockets are not supported on this platform
+            PermissionError: If the default socket directory belongs to another user
+            RuntimeError: If another daemon is already listening on the socket
+        """
+        if not SUPPORTED:
+            raise OSError("The daemon needs Unix domain sockets, which this platform does not support")
+        if idle_timeout <= 0:
+            raise ValueError(f"idle_timeout must be positive, got {idle_timeout}")
+        if socket_path is None:
+            socket_path = default_socket_path()
+            if not os.environ.get('MARSA_DAEMON_SOCKET'):
+                directory = os.path.dirname(socket_path)
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+                _check_owner(directory)
+                os.chmod(directory, 0o700)
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        if os.path.exists(self.socket_path):
+            if is_running(self.socket_path):
+                raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+            os.unlink(self.socket_path)  # left behind by a daemon that was killed
+
+        umask = os.umask(0o077)
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+        self.server.daemon_threads = True
+        self.server.app = self
+        self._pipelines = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._last_request = time.monotonic()
+        self._stopping = threading.Event()
+
+    def serve_forever(self) -> None:
+        """
+        Answer requests until stopped or idle for idle_timeout seconds, then clean up.
+        """
+        self.server.timeout = min(self.idle_timeout, 1.0)
+        try:
+            while not self._stopping.is_set():
+                self.server.handle_request()
+                with self._lock:
+                    idle = self._active == 0 and time.monotonic() - self._last_request >= self.idle_timeout
+                if idle:
+                    break
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        """
+        Ask serve_forever() to return after the request being accepted.
+        """
+        self._stopping.set()
+
+    def close(self) -> None:
+        """
+        Close the socket, remove its file and release every pipeline.
+        """
+        self.server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            idle = [entry for entry in self._pipelines.values() if entry.users == 0]
+            for entry in self._pipelines.values():
+                entry.evicted = True  # pipelines still in use are closed by their last request
+            self._pipelines.clear()
+        for entry in idle:
+            entry.pipeline.close()
+
+    def handle(self, payload: dict) -> dict:
+        """
+        Answer one decoded request.
+
+        Args:
+            payload (dict): Request sent by a client
+
+        Returns:
+            dict: Reply for the client
+        """
+        command = payload.get('command')
+        if command == "status":
+            return {'pid': os.getpid(), 'pipelines': len(self._pipelines), 'idle_timeout': self.idle_timeout}
+        if command == "stop":
+            self.stop()
+            return {'stopping': True}
+        if command != "analyze":
+            return {'error': f"Unknown command: {command!r}"}
+
+        text = payload.get('text')
+        if not isinstance(text, str):
+            return {'error': "Expected a text string"}
+        try:
+            entry = self._pipeline(payload['config'], payload.get('options', {}))
+            try:
+                with entry.lock:
+                    result = entry.pipeline.process_corpus_flat([text])[0]
+            finally:
+                self._release(entry)
+        except Exception as e:
+            return {'error': str(e)}
+        return {'result': result}
+
+    def _pipeline(self, config_file: str, options: dict) -> _PipelineEntry:
+        """
+        Return the loaded pipeline for a config file and options, building it if needed.
+        
+        The entry is held until it is passed to _release(), so evicting it meanwhile
+        does not close the pipeline under the request using it.
+        
+        Args:
+            config_file (str): Path to aspect configuration file
+            options (dict): Keyword arguments for AspectSentimentPipeline
+            
+        Returns:
+            _PipelineEntry: The pipeline and the lock serializing its use
+        """
+        from marsa.pipeline import AspectSentimentPipeline
+
+        config_path = Path(config_file).resolve()
+        key = (str(config_path), config_path.stat().st_mtime_ns, json.dumps(options, sort_keys=True))
+        with self._lock:
+            if key in self._pipelines:
+                self._pipelines.move_to_end(key)
+                entry = self._pipelines[key]
+                entry.users += 1
+                return entry
+
+            # Built under the lock so concurrent first requests load the models once
+            entry = _PipelineEntry(AspectSentimentPipeline(str(config_path), share_models=True, **options), users=1)
+            self._pipelines[key] = entry
+            idle = []
+            while len(self._pipelines) > MAX_PIPELINES:
+                evicted = self._pipelines.popitem(last=False)[1]
+                evicted.evicted = True
+                if evicted.users == 0:
+                    idle.append(evicted)
+        for evicted in idle:
+            evicted.pipeline.close()
+        return entry
+    
+    def _release(self, entry: _PipelineEntry) -> None:
+        """
+        Give back an entry taken with _pipeline(), closing it if it was evicted meanwhile.
+        
+        Args:
+            entry (_PipelineEntry): Entry returned by _pipeline()
+        """
+        with self._lock:
+            entry.users -= 1
+            close = entry.evicted and entry.users == 0
+        if close:
+            entry.pipeline.close()
+    
+    def _begin_request(self) -> None:
+        with self._lock:
+            self._active += 1
+            self._last_request = time.monotonic()
+
+    def _end_request(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._last_request = time.monotonic()
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Reads one JSON request line and writes one JSON reply line.
+    """
+    def handle(self) -> None:
+        app = self.server.app
+        app._begin_request()
+        try:
+            line = self.rfile.readline()
+            try:
+                payload = json.loads(line)
+            except ValueError:
+                reply = {'error': "Request is not valid JSON"}
+            else:
+                reply = app.handle(payload) if isinstance(payload, dict) else {'error': "Expected a JSON object"}
+            self.wfile.write(json.dumps(reply).encode('utf-8') + b"\n")
+        finally:
+            app._end_request()
@@ -1,35 +1,71 @@
 import json
-import pandas as pd
+from collections.abc import Iterable
+from itertools import islice
 from pathlib import Path
 
-from pathlib import Path
-import json
-import pandas as pd
+CSV_COLUMNS = ['text', 'aspect', 'category', 'prelabeled_sentiment', 'confidence']
+CSV_CHUNK_SIZE = 1000
 
-def export_for_review(results: list[dict], out_file: str) -> None:
+def export_for_review(results: Iterable[dict], out_file: str) -> None:
     """
     Export sentiment analysis results to JSON or CSV format.
-    
+
     Exports the analysis results to either JSON format (preserving full structure)
-    or CSV format (flattened with one row per aspect-sentiment pair).
-    
+    or CSV format (flattened with one row per aspect-sentiment pair). Results are
+    written as they are read, so a generator such as process_corpus_flat_iter is
+    exported without holding the whole corpus in memory.
+
     Args:
-        results (list[dict]): List of analysis results containing aspects and sentiments
+        results (Iterable[dict]): Analysis results containing aspects and sentiments
         out_file (str): Output file path with .json or .csv extension
-        
+
     Raises:
         ValueError: If file extension isn't .json or .csv
         OSError: If file cannot be written to the specified path
     """
-    path = Path(out_file).resolve() 
+    path = Path(out_file).resolve()
+    suffix = path.suffix.lower()
+    if suffix not in ('.json', '.csv'):
+        raise ValueError(f'Unsupported file extension: {path.suffix}; expected .json or .csv')
     path.parent.mkdir(parents=True, exist_ok=True)
-    
-    if path.suffix.lower() == '.json':
-        with open(path, 'w') as f:
-            json.dump(results, f, indent=2)
-    elif path.suffix.lower() == '.csv':
-        flattened = []
+
+    if suffix == '.json':
+        _write_json(results, path)
+    else:
+        _write_csv(results, path)
+
+def _write_json(results: Iterable[dict], path: Path) -> None:
+    """
+    Stream results into a JSON array, formatted as json.dump with indent=2 would.
+
+    Args:
+        results (Iterable[dict]): Analysis results to write
+        path (Path): Output file path
+    """
+    with open(path, 'w') as f:
+        first = True
         for result in results:
+            f.write("[\n  " if first else ",\n  ")
+            f.write(json.dumps(result, indent=2).replace("\n", "\n  "))
+            first = False
+        f.write("[]" if first else "\n]")
+
+def _write_csv(results: Iterable[dict], path: Path) -> None:
+    """
+    Write one CSV row per aspect-sentiment pair, appending in chunks of results.
+
+    Args:
+        results (Iterable[dict]): Analysis results to flatten and write
+        path (Path): Output file path
+    """
+    import pandas as pd
+
+    results = iter(results)
+    mode = 'w'
+    while True:
+        chunk = list(islice(results, CSV_CHUNK_SIZE))
+        flattened = []
+        for result in chunk:
             for aspect_sent in result['aspect_sentiments']:
                 flattened.append({
                     'text': result['cleaned_text'],
@@ -38,6 +74,7 @@ def export_for_review(results: list[dict], out_file: str) -> None:
                     'prelabeled_sentiment': aspect_sent['sentiment'],
                     'confidence': aspect_sent['confidence']
                 })
-        pd.DataFrame(flattened, columns=['text', 'aspect', 'category', 'prelabeled_sentiment', 'confidence']).to_csv(path, index=False)
-    else:
-        raise ValueError(f'Unsupported file extension: {path.suffix}; expected .json or .csv')
\ No newline at end of file
+        pd.DataFrame(flattened, columns=CSV_COLUMNS).to_csv(path, mode=mode, header=mode == 'w', index=False)
+        if len(chunk) < CSV_CHUNK_SIZE:
+            break
+        mode = 'a'
@@ -1,8 +1,12 @@
-from spacy.matcher import PhraseMatcher
-from spacy.tokens import Doc
+from collections.abc import Iterable, Iterator
 from marsa.config import AspectConfig
 from dataclasses import dataclass
-from marsa.utils import require_spacy_model
+from marsa.registry import MODEL_REGISTRY
+from marsa.utils import load_spacy_pipeline
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from spacy.tokens import Doc
 
 @dataclass
 class AspectMatch:
@@ -29,7 +33,151 @@ class AspectMatch:
     token_end: int    
     category: str | None = None 
 
-def match_aspect_phrases(text: str, config: AspectConfig) -> tuple[list[AspectMatch], Doc]:
+class AspectMatcher:
+    """
+    Reusable aspect matcher built once from an aspect configuration.
+    
+    Loads the spaCy language model and compiles the PhraseMatcher a single time,
+    so matching a comment only costs tokenization plus one matcher pass.
+    
+    Attributes:
+        config (AspectConfig): Configuration containing aspects and their phrases
+        nlp (Language): Loaded spaCy language processing pipeline
+        matcher (PhraseMatcher): Compiled matcher for all aspect phrases
+        phrase_to_aspect (dict[str, str]): Mapping of lowercased phrases to aspect names
+        share_models (bool): Whether the spaCy pipeline is shared through the model registry
+    """
+    def __init__(
+        self, 
+        config: AspectConfig, 
+        model: str = "en_core_web_sm", 
+        mode: str = "tokenizer", 
+        share_models: bool = False,
+        model_dir: str | None = None
+    ) -> None:
+        """
+        Load the spaCy model and compile the phrase patterns for every aspect.
+        
+        If no phrases are defined for an aspect, uses the aspect name itself
+        as the matching phrase. Matching only relies on token text, so by default
+        the model is loaded without its tagger, parser or NER components.
+        
+        Args:
+            config (AspectConfig): Configuration containing aspects and their phrases
+            model (str, optional): Name of the spaCy model to load. 
+                                Defaults to "en_core_web_sm".
+            mode (str, optional): spaCy processing mode, one of "full", "tokenizer" 
+                                or "blank". Defaults to "tokenizer".
+            share_models (bool, optional): Take the spaCy pipeline from the process-wide 
+                                        model registry, so matchers using the same model 
+                                        and mode load it once. Defaults to False.
+            model_dir (str | None, optional): Provisioned model directory the spaCy model is 
+                                           loaded from, with no download attempt. 
+                                           Defaults to None.
+            
+        Raises:
+            ValueError: If mode is not a supported processing mode
+            FileNotFoundError: If model_dir does not contain the spaCy model
+            OSError: If required spaCy model cannot be loaded
+        """
+        from spacy.matcher import PhraseMatcher
+
+        self.config = config
+        self.share_models = share_models
+        self._model_key = ("spacy", model, mode, model_dir) if share_models else None
+        if self._model_key is not None:
+            self.nlp = MODEL_REGISTRY.acquire(self._model_key, lambda: load_spacy_pipeline(model, mode, model_dir))
+        else:
+            self.nlp = load_spacy_pipeline(model, mode, model_dir)
+        self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        self.phrase_to_aspect = {}
+        
+        patterns = []
+        for aspect_name, aspect_data in config.aspects.items():
+            if aspect_data.phrases:
+                for phrase in aspect_data.phrases:
+                    patterns.append(self.nlp.make_doc(phrase))
+                    self.phrase_to_aspect[phrase.lower()] = aspect_name
+            else:
+                # If no phrases defined, use aspect name itself as the phrase
+                patterns.append(self.nlp.make_doc(aspect_name))
+                self.phrase_to_aspect[aspect_name.lower()] = aspect_name
+        
+        if patterns:
+            self.matcher.add('AspectTermsList', patterns)
+            
+    def match(self, text: str) -> tuple[list[AspectMatch], "Doc"]:
+        """
+        Match aspect phrases in a single text.
+        
+        Args:
+            text (str): Input text to search for aspect matches
+            
+        Returns:
+            tuple[list[AspectMatch], Doc]: List of matched aspects with positions and 
+                                         the spaCy Doc object for context extraction
+        """
+        doc = self.nlp(text)
+        return self._collect_matches(doc), doc
+    
+    def pipe(self, texts: Iterable[str], batch_size: int = 1000, n_process: int = 1) -> Iterator[tuple[list[AspectMatch], "Doc"]]:
+        """
+        Match aspect phrases in a stream of texts using spaCy's batched nlp.pipe.
+        
+        Texts are tokenized in batches (optionally across several processes) and
+        the compiled matcher runs over each resulting document in input order.
+        
+        Args:
+            texts (Iterable[str]): Input texts to search for aspect matches
+            batch_size (int, optional): Number of texts tokenized per batch. Defaults to 1000.
+            n_process (int, optional): Number of processes used for tokenization. 
+                                    Defaults to 1.
+            
+        Yields:
+            tuple[list[AspectMatch], Doc]: Matched aspects and the spaCy Doc for each text
+        """
+        for doc in self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield self._collect_matches(doc), doc
+    
+    def close(self) -> None:
+        """
+        Release the shared spaCy pipeline back to the model registry.
+        
+        Has no effect when the matcher loaded its own pipeline or was already closed.
+        """
+        if self._model_key is not None:
+            MODEL_REGISTRY.release(self._model_key)
+            self._model_key = None
+    
+    def _collect_matches(self, doc: "Doc") -> list[AspectMatch]:
+        """
+        Run the compiled matcher over a processed document.
+        
+        Args:
+            doc (Doc): spaCy Doc object to search for aspect matches
+            
+        Returns:
+            list[AspectMatch]: List of matched aspects with character and token positions
+        """
+        aspects = []
+        for _, start, end in self.matcher(doc):
+            span = doc[start:end]
+            aspect_name = self.phrase_to_aspect[span.text.lower()]
+            aspect_data = self.config.aspects[aspect_name]
+
+            aspects.append(AspectMatch(
+                text=span.text, 
+                aspect=aspect_name,
+                start=span.start_char, 
+                end=span.end_char,     
+                token_start=start,      
+                token_end=end,       
+                category=aspect_data.category
+            ))
+        
+        return aspects
+
+def match_aspect_phrases(text: str, config: AspectConfig, mode: str = "full") -> tuple[list[AspectMatch], "Doc"]:
     """
     Match aspect phrases in text using spaCy's PhraseMatcher.
     
@@ -37,53 +185,22 @@ def match_aspect_phrases(text: str, config: AspectConfig) -> tuple[list[AspectMa
     the provided configuration. If no phrases are defined for an aspect, uses the
     aspect name itself as the matching phrase.
     
+    This builds a new AspectMatcher on every call; when matching many texts
+    against the same configuration, create an AspectMatcher once and reuse it.
+    
     Args:
         text (str): Input text to search for aspect matches
         config (AspectConfig): Configuration containing aspects and their phrases
+        mode (str, optional): spaCy processing mode, one of "full", "tokenizer" or "blank"; 
+                            "full" keeps the sentence boundaries, POS tags and entities 
+                            of the returned Doc. Defaults to "full".
         
     Returns:
         tuple[list[AspectMatch], Doc]]: List of matched aspects with positions and 
                                      the spaCy Doc object for context extraction
         
     Raises:
+        ValueError: If mode is not a supported processing mode
         OSError: If required spaCy model cannot be loaded
     """
-    nlp = require_spacy_model("en_core_web_sm")
-    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-    
-    phrase_to_aspect = {}
-    patterns = [] 
-    
-    for aspect_name, aspect_data in config.aspects.items():
-        if aspect_data.phrases:
-            for phrase in aspect_data.phrases:
-                patterns.append(nlp.make_doc(phrase))
-                phrase_to_aspect[phrase.lower()] = aspect_name
-        else:
-            # If no phrases defined, use aspect name itself as the phrase
-            patterns.append(nlp.make_doc(aspect_name))
-            phrase_to_aspect[aspect_name.lower()] = aspect_name
-    
-    if patterns:
-        matcher.add('AspectTermsList', patterns)
-            
-    doc = nlp(text)
-    matches = matcher(doc)
-    
-    aspects = []
-    for _, start, end in matches:
-        span = doc[start:end]
-        aspect_name = phrase_to_aspect[span.text.lower()]
-        aspect_data = config.aspects[aspect_name]
-
-        aspects.append(AspectMatch(
-            text=span.text, 
-            aspect=aspect_name,
-            start=span.start_char, 
-            end=span.end_char,     
-            token_start=start,      
-            token_end=end,       
-            category=aspect_data.category
-        ))
-    
-    return aspects, doc
\ No newline at end of file
+    return AspectMatcher(config, mode=mode).match(text)
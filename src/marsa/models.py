@@ -0,0 +1,282 @@
+import os
+import numpy as np
+import torch
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from marsa.provision import model_slug
+
+ONNX_CACHE_DIR = Path.home() / ".cache" / "marsa" / "onnx"
+
+class _LogitsOnly(torch.nn.Module):
+    """
+    Wrap a sequence classification model so its forward pass returns only the logits tensor.
+    """
+    def __init__(self, model: torch.nn.Module) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+def export_onnx_model(model_name: str, export_dir: str | Path) -> Path:
+    """
+    Export a Hugging Face sequence classification model to ONNX.
+
+    Writes the ONNX graph alongside the tokenizer and model config, so the
+    export directory is self-contained and later loads need no PyTorch weights.
+    The graph is written to a temporary file and moved into place once complete,
+    so concurrent processes never read a partial export.
+
+    Args:
+        model_name (str): Hub name or local path of the model to export
+        export_dir (str | Path): Directory that receives model.onnx, tokenizer and config
+
+    Returns:
+        Path: Path to the exported model.onnx file
+
+    Raises:
+        OSError: If the model cannot be loaded or the export cannot be written
+    """
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, attn_implementation="eager").eval()
+    # Trace with a padded batch so the attention mask path is part of the graph
+    sample = tokenizer(["a sample", "a longer sample review"], padding=True, return_tensors="pt")
+
+    model_path = export_dir / "model.onnx"
+    tmp_path = export_dir / f"model.onnx.{os.getpid()}.tmp"
+    with torch.inference_mode():
+        torch.onnx.export(
+            _LogitsOnly(model),
+            (sample["input_ids"], sample["attention_mask"]),
+            str(tmp_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"}
+            },
+            opset_version=17,
+            dynamo=False
+        )
+    tokenizer.save_pretrained(export_dir)
+    model.config.save_pretrained(export_dir)
+    os.replace(tmp_path, model_path)
+    return model_path
+
+def quantize_dynamic_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Apply PyTorch dynamic INT8 quantization to the Linear layers of a model.
+
+    Weights are stored as int8 and activations are quantized on the fly, which
+    roughly halves the memory of a transformer and speeds up CPU matmuls. The
+    quantized model only runs on the CPU.
+
+    Args:
+        model (torch.nn.Module): Floating point model to quantize
+
+    Returns:
+        torch.nn.Module: Model with its Linear layers replaced by dynamic quantized versions
+    """
+    from torch.ao.quantization import quantize_dynamic
+
+    return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def configure_cpu(
+    num_threads: int | None = None, 
+    num_interop_threads: int | None = None, 
+    cpu_affinity: list[int] | None = None
+) -> None:
+    """
+    Apply process-wide CPU settings for model inference.
+
+    PyTorch sizes its thread pools to every core by default, so several worker
+    processes on one host oversubscribe the CPU. These settings affect the whole
+    process, not a single model. The inter-op pool can only be sized before
+    PyTorch first uses it; a later request is ignored with a warning.
+
+    Args:
+        num_threads (int | None, optional): Threads used within an op (intra-op), None 
+                                         to keep the current setting. Defaults to None.
+        num_interop_threads (int | None, optional): Threads used to run independent ops 
+                                                 in parallel, None to keep the current 
+                                                 setting. Defaults to None.
+        cpu_affinity (list[int] | None, optional): CPU cores the process is pinned to, 
+                                                None to keep the current affinity. 
+                                                Defaults to None.
+
+    Raises:
+        ValueError: If a thread count is below 1 or cpu_affinity is empty
+        OSError: If the affinity cannot be applied on this platform
+    """
+    if num_threads is not None:
+        if num_threads < 1:
+            raise ValueError(f"num_threads must be at least 1, got {num_threads}")
+        torch.set_num_threads(num_threads)
+
+    if num_interop_threads is not None:
+        if num_interop_threads < 1:
+            raise ValueError(f"num_interop_threads must be at least 1, got {num_interop_threads}")
+        if torch.get_num_interop_threads() != num_interop_threads:
+            try:
+                torch.set_num_interop_threads(num_interop_threads)
+            except RuntimeError:
+                warnings.warn(
+                    f"Inter-op threads are already initialized to {torch.get_num_interop_threads()}; "
+                    f"set num_interop_threads before any model runs in this process"
+                )
+
+    if cpu_affinity is not None:
+        if not cpu_affinity:
+            raise ValueError("cpu_affinity must list at least one core")
+        if not hasattr(os, "sched_setaffinity"):
+            raise OSError("CPU affinity is not supported on this platform")
+        os.sched_setaffinity(0, cpu_affinity)
+
+@contextmanager
+def single_threaded():
+    """
+    Run torch ops on one intra-op thread, restoring the previous thread count afterwards.
+
+    GNU OpenMP is not fork-safe: once a parallel region has started its thread
+    team, a forked child that runs a parallel region of its own hangs. Work done
+    in a process that is about to fork runs in this context so that no team
+    exists yet when the children start.
+    """
+    num_threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(num_threads)
+
+class OnnxSentimentPipeline:
+    """
+    Text classification runner backed by ONNX Runtime on the CPU.
+
+    Drop-in replacement for the transformers sentiment-analysis pipeline used by
+    AspectSentimentAnalyzer: it accepts a string or a list of strings and returns
+    label/score dictionaries in the same shape and order, so the results map
+    through _extract_bert_probabilities unchanged. The model is exported to ONNX
+    on first use and the export is cached on disk for later runs.
+
+    Attributes:
+        model_name (str): Hub name or local path of the exported model
+        export_dir (Path): Directory holding the cached ONNX export
+        tokenizer: Tokenizer loaded from the export directory
+        config: Model config loaded from the export directory, used for id2label
+        session: ONNX Runtime inference session
+        top_k (int | None): Number of highest scoring labels returned per input, None for all
+    """
+    def __init__(
+        self, 
+        model_name: str, 
+        cache_dir: str | Path | None = None, 
+        top_k: int | None = 1, 
+        export: bool = True,
+        num_threads: int | None = None,
+        num_interop_threads: int | None = None
+    ) -> None:
+        """
+        Load the cached ONNX export of a model, exporting it first if needed.
+
+        Args:
+            model_name (str): Hub name or local path of the model
+            cache_dir (str | Path | None, optional): Directory for cached exports.
+                                                  Defaults to ~/.cache/marsa/onnx.
+            top_k (int | None, optional): Number of highest scoring labels returned per input,
+                                       None for all labels. Defaults to 1.
+            export (bool, optional): Export the model when no cached export exists; when
+                                  False a missing export is an error. Defaults to True.
+            num_threads (int | None, optional): Intra-op threads of the inference session, 
+                                             None for onnxruntime's default. Defaults to None.
+            num_interop_threads (int | None, optional): Inter-op threads of the inference 
+                                                     session, None for onnxruntime's default. 
+                                                     Defaults to None.
+
+        Raises:
+            ImportError: If onnxruntime is not installed
+            FileNotFoundError: If export is False and no cached export exists
+            OSError: If the model cannot be loaded or exported
+        """
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError(
+                "The onnx backend requires onnxruntime; install it with `pip install marsapy[onnx]`"
+            ) from e
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.model_name = model_name
+        self.export_dir = Path(cache_dir or ONNX_CACHE_DIR) / model_slug(model_name)
+        model_path = self.export_dir / "model.onnx"
+        if not model_path.exists():
+            if not export:
+                raise FileNotFoundError(f"No ONNX export of {model_name} found in {self.export_dir}")
+            export_onnx_model(model_name, self.export_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.export_dir)
+        self.config = AutoConfig.from_pretrained(self.export_dir)
+        session_options = onnxruntime.SessionOptions()
+        if num_threads is not None:
+            session_options.intra_op_num_threads = num_threads
+        if num_interop_threads is not None:
+            session_options.inter_op_num_threads = num_interop_threads
+        self.session = onnxruntime.InferenceSession(
+            str(model_path), sess_options=session_options, providers=["CPUExecutionProvider"]
+        )
+        self.top_k = top_k
+
+    def __call__(self, inputs: str | list[str], batch_size: int = 1, **kwargs) -> list:
+        """
+        Classify one text or a list of texts.
+
+        Args:
+            inputs (str | list[str]): Text or texts to classify
+            batch_size (int, optional): Number of texts per forward pass. Defaults to 1.
+
+        Returns:
+            list: For a single string, a one-element list holding its label/score dictionaries;
+                  for a list, one list of label/score dictionaries per text
+        """
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        results = []
+        for start in range(0, len(texts), batch_size):
+            results.extend(self._classify(texts[start:start + batch_size]))
+        return results
+
+    def _classify(self, texts: list[str]) -> list[list[dict]]:
+        """
+        Run one padded batch through the ONNX session and rank the labels.
+
+        Args:
+            texts (list[str]): Texts forming a single batch
+
+        Returns:
+            list[list[dict]]: Label/score dictionaries for each text, highest score first
+        """
+        encoded = self.tokenizer(texts, padding=True, truncation=True, return_tensors="np")
+        feed = {
+            model_input.name: encoded[model_input.name].astype(np.int64)
+            for model_input in self.session.get_inputs()
+        }
+        logits = self.session.run(["logits"], feed)[0]
+
+        # Same softmax as the transformers text classification pipeline
+        shifted_exp = np.exp(logits - np.max(logits, axis=-1, keepdims=True))
+        probabilities = shifted_exp / shifted_exp.sum(axis=-1, keepdims=True)
+
+        results = []
+        for scores in probabilities:
+            dict_scores = [
+                {"label": self.config.id2label[i], "score": score.item()} for i, score in enumerate(scores)
+            ]
+            dict_scores.sort(key=lambda x: x["score"], reverse=True)
+            results.append(dict_scores[:self.top_k] if self.top_k is not None else dict_scores)
+        return results
@@ -1,7 +1,146 @@
+import gc
+import multiprocessing
+import os
+import warnings
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, replace
+from itertools import islice
 from marsa.config import create_aspect_config
-from marsa.matching import match_aspect_phrases
+from marsa.matching import AspectMatcher
+from marsa.models import configure_cpu, single_threaded
+from marsa.scheduler import MicroBatchScheduler
 from marsa.sentiment import AspectSentimentAnalyzer, AspectSentimentResult
-from marsa.utils import clean_input
+from marsa.utils import SPACY_MODES, clean_input
+
+WORKER_START_METHODS = ("spawn", "fork")
+
+_worker_pipeline = None  # pipeline loaded (or inherited) once by each worker process
+
+def _worker_cpu_settings(options: dict, workers: int, worker_index) -> tuple[int, list[int] | None]:
+    """
+    Claim the next worker index and return that worker's thread count and cores.
+    
+    The parent's cpu_affinity is split into one contiguous slice per worker, so
+    workers do not compete for cores, and each worker runs as many threads as it
+    has cores unless num_threads was set.
+    
+    Args:
+        options (dict): Keyword arguments of the parent pipeline, with workers set to 1
+        workers (int): Number of worker processes
+        worker_index (multiprocessing.Value): Counter shared by the workers of the pool
+        
+    Returns:
+        tuple[int, list[int] | None]: Intra-op threads and CPU cores of this worker
+    """
+    with worker_index.get_lock():
+        index = worker_index.value % workers
+        worker_index.value += 1
+    
+    cores = options['cpu_affinity']
+    if cores:
+        if len(cores) >= workers:
+            cores = cores[index * len(cores) // workers:(index + 1) * len(cores) // workers]
+        else:
+            cores = [cores[index % len(cores)]]
+        return options['num_threads'] or len(cores), cores
+    return options['num_threads'] or max(1, (os.cpu_count() or 1) // workers), None
+
+def _init_worker(config_file: str, options: dict, workers: int, worker_index) -> None:
+    """
+    Load the worker process's pipeline; runs once when the worker starts.
+    
+    Args:
+        config_file (str): Path to aspect configuration file
+        options (dict): Keyword arguments of the parent pipeline, with workers set to 1
+        workers (int): Number of worker processes
+        worker_index (multiprocessing.Value): Counter shared by the workers of the pool
+    """
+    global _worker_pipeline
+    num_threads, cpu_affinity = _worker_cpu_settings(options, workers, worker_index)
+    _worker_pipeline = AspectSentimentPipeline(
+        config_file, **{**options, 'num_threads': num_threads, 'cpu_affinity': cpu_affinity}
+    )
+
+def _adopt_worker(pipeline: "AspectSentimentPipeline", worker_index) -> None:
+    """
+    Use the pipeline inherited from the parent as the forked worker's pipeline.
+    
+    Args:
+        pipeline (AspectSentimentPipeline): Parent pipeline, already loaded and warmed up
+        worker_index (multiprocessing.Value): Counter shared by the workers of the pool
+    """
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+    _worker_pipeline.n_process = 1
+    # torch rebuilds its thread pool in the child; size it to the worker's share of the cores
+    num_threads, cpu_affinity = _worker_cpu_settings(pipeline._worker_options, pipeline.workers, worker_index)
+    configure_cpu(num_threads, cpu_affinity=cpu_affinity)
+
+def _process_chunk(start: int, comments: list[str]) -> tuple[list[AspectSentimentResult], dict]:
+    """
+    Analyze one shard of comments in a worker process.
+    
+    If the shard fails, its comments are retried one at a time so the error
+    names the comment that caused it.
+    
+    Args:
+        start (int): Position of the shard's first comment in the corpus
+        comments (list[str]): Comments of the shard
+        
+    Returns:
+        tuple[list[AspectSentimentResult], dict]: Result for each comment and the 
+                                                 ScoringStats counters the shard added
+        
+    Raises:
+        RuntimeError: If a comment cannot be processed, naming its position and text
+    """
+    stats = _worker_pipeline.sentiment_analyzer.stats
+    before = asdict(stats)
+    try:
+        results = [result for _, result in _worker_pipeline._process_local(comments)]
+    except Exception:
+        for offset, comment in enumerate(comments):
+            try:
+                list(_worker_pipeline._process_local([comment]))
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to process comment {start + offset + 1} ({str(comment)[:80]!r}): "
+                    f"{type(e).__name__}: {e}"
+                ) from None
+        raise
+    return results, {name: value - before[name] for name, value in asdict(stats).items()}
+
+def flatten_result(comment: str, sentiment_result: AspectSentimentResult) -> dict:
+    """
+    Convert a structured result into the flat dictionary used for JSON/CSV export.
+    
+    Args:
+        comment (str): Original comment the result was computed for
+        sentiment_result (AspectSentimentResult): Structured result of the comment
+        
+    Returns:
+        dict: Original and cleaned text, number of aspects and per-aspect sentiment data
+    """
+    return {
+        'original_text': comment,
+        'cleaned_text': sentiment_result.text,
+        'aspects_found': len(sentiment_result.aspects),
+        'aspect_sentiments': [
+            {
+                'aspect': aspect.aspect_match.text,
+                'category': aspect.aspect_match.category,
+                'sentiment': aspect.sentiment,
+                'confidence': aspect.confidence,
+                'start': aspect.aspect_match.start,
+                'end': aspect.aspect_match.end
+            }
+            for aspect in sentiment_result.aspects
+        ]
+    }
 
 class AspectSentimentPipeline:
     """
@@ -17,10 +156,47 @@ class AspectSentimentPipeline:
     
     Attributes:
         config (AspectConfig): Loaded aspect configuration with phrases and categories
-        sentiment_analyzer (AspectSentimentAnalyzer): Configured sentiment analysis engine
+        matcher (AspectMatcher | None): Compiled aspect matcher reused for every comment, 
+                                        None when spawned workers do all the matching
+        sentiment_analyzer (AspectSentimentAnalyzer): Configured sentiment analysis engine; 
+                                                      holds no models when spawned workers 
+                                                      do all the scoring
+        batch_size (int): Number of comments tokenized per spaCy batch
+        n_process (int): Number of processes used for spaCy tokenization
+        workers (int): Number of worker processes the corpus is sharded across
+        worker_start (str): "spawn" workers load their own models, "fork" workers share 
+                            the parent's models copy-on-write
+        scheduler (MicroBatchScheduler): Batches concurrent analyze_async requests
     """
     
-    def __init__(self, config_file: str, context_window: int = 3):
+    def __init__(
+        self, 
+        config_file: str, 
+        context_window: int = 3, 
+        context_mode: str = "window",
+        max_length: int | None = 256,
+        batch_size: int = 1000, 
+        n_process: int = 1,
+        matcher_mode: str = "tokenizer",
+        sentiment_batch_size: int = 32,
+        cache_size: int = 10000,
+        cache_path: str | None = None,
+        sentiment_mode: str = "ensemble",
+        uncertainty_band: float = 0.5,
+        backend: str = "torch",
+        quantize: bool = False,
+        share_models: bool = False,
+        model_dir: str | None = None,
+        num_threads: int | None = None,
+        num_interop_threads: int | None = None,
+        cpu_affinity: list[int] | None = None,
+        inference_mode: bool = True,
+        workers: int = 1,
+        worker_start: str = "spawn",
+        async_batch_size: int = 32,
+        async_max_wait: float = 0.005,
+        async_queue_size: int = 0
+    ):
         """
         Initialize the aspect sentiment analysis pipeline.
         
@@ -28,19 +204,163 @@ class AspectSentimentPipeline:
             config_file (str): Path to aspect configuration file
             context_window (int, optional): Number of tokens before/after aspects 
                                         for sentiment context. Defaults to 3.
+            context_mode (str, optional): "window" scores a token window per aspect, "sentence" 
+                                        scores each sentence once for all of its aspects, 
+                                        "merged" scores overlapping windows once. 
+                                        Defaults to "window".
+            max_length (int | None, optional): Maximum subword length of a scored context; longer 
+                                            contexts are truncated around the aspect. None 
+                                            disables the bound. Defaults to 256.
+            batch_size (int, optional): Number of comments tokenized per spaCy batch. 
+                                    Defaults to 1000.
+            n_process (int, optional): Number of processes used for spaCy tokenization. 
+                                    Defaults to 1.
+            matcher_mode (str, optional): spaCy processing mode used for matching, one of
+                                        "full", "tokenizer" or "blank". Defaults to "tokenizer".
+            sentiment_batch_size (int, optional): Number of aspect contexts scored per BERT 
+                                                forward pass. Defaults to 32.
+            cache_size (int, optional): Maximum number of context scores kept in the 
+                                    analyzer's LRU cache, 0 disables caching. Defaults to 10000.
+            cache_path (str | None, optional): Path to a SQLite file that persists context 
+                                            scores across runs. Defaults to None.
+            sentiment_mode (str, optional): Scoring mode of the analyzer, one of "ensemble", 
+                                        "cascade" or "vader". Defaults to "ensemble".
+            uncertainty_band (float, optional): In cascade mode, BERT runs for contexts whose 
+                                            absolute VADER compound score is below this value. 
+                                            Defaults to 0.5.
+            backend (str, optional): Inference backend of the BERT model, "torch" or "onnx". 
+                                  Defaults to "torch".
+            quantize (bool, optional): Apply dynamic INT8 quantization to the BERT model's 
+                                    Linear layers (torch backend only). Defaults to False.
+            share_models (bool, optional): Load the spaCy, BERT and VADER models once per 
+                                        process through the model registry and share them 
+                                        with other pipelines using the same models. 
+                                        Defaults to False.
+            model_dir (str | None, optional): Directory populated by `marsa models fetch`; 
+                                           the spaCy and BERT models are loaded from it 
+                                           with no download attempt. Defaults to None.
+            num_threads (int | None, optional): Intra-op threads used by the BERT model, None 
+                                             for the library default (with workers, each 
+                                             worker's share of the cores). Defaults to None.
+            num_interop_threads (int | None, optional): Inter-op threads used by the BERT model, 
+                                                     None for the library default. 
+                                                     Defaults to None.
+            cpu_affinity (list[int] | None, optional): CPU cores the process is pinned to; with 
+                                                    workers, each worker is pinned to its 
+                                                    own slice of them. Defaults to None.
+            inference_mode (bool, optional): Run the torch model under torch.inference_mode. 
+                                          Defaults to True.
+            workers (int, optional): Number of worker processes; above 1, the corpus is 
+                                  sharded into batch_size comments per task across a 
+                                  process pool whose workers each load the models once; 
+                                  with "spawn", this process loads no models itself. 
+                                  Defaults to 1.
+            worker_start (str, optional): "spawn" starts workers from a clean interpreter that 
+                                       loads its own models; "fork" warms the models up in 
+                                       this process and forks the workers from it, so they 
+                                       share the weights copy-on-write. Defaults to "spawn".
+            async_batch_size (int, optional): Maximum number of analyze_async requests 
+                                           processed together. Defaults to 32.
+            async_max_wait (float, optional): Seconds an analyze_async request waits for 
+                                           others to join its batch. Defaults to 0.005.
+            async_queue_size (int, optional): Maximum number of analyze_async requests 
+                                           waiting for a batch, 0 for unbounded. Defaults to 0.
             
         Raises:
             FileNotFoundError: If configuration file doesn't exist
             NameError: If configuration file has invalid extension
+            ValueError: If matcher_mode, context_mode, sentiment_mode or backend is not supported, 
+                        quantize is combined with the onnx backend, or max_length, a thread 
+                        count, cpu_affinity, workers, worker_start or an async_* setting 
+                        is invalid
+            FileNotFoundError: If model_dir does not contain the required models
         """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if worker_start not in WORKER_START_METHODS:
+            raise ValueError(f"Unsupported worker start method: {worker_start}; expected 'spawn' or 'fork'")
+        self.scheduler = MicroBatchScheduler(
+            self.process_corpus, max_batch_size=async_batch_size, 
+            max_wait=async_max_wait, max_queue_size=async_queue_size
+        )
+        
+        # Spawned workers load their own models, so this process only needs the configuration
+        spawn_workers = workers > 1 and worker_start == "spawn"
         self.config = create_aspect_config(config_file)
-        self.sentiment_analyzer = AspectSentimentAnalyzer(context_window=context_window)
+        if spawn_workers:
+            if matcher_mode not in SPACY_MODES:
+                raise ValueError(f"Unsupported spaCy mode: {matcher_mode}; expected 'full', 'tokenizer' or 'blank'")
+            self.matcher = None
+        else:
+            self.matcher = AspectMatcher(
+                self.config, mode=matcher_mode, share_models=share_models, model_dir=model_dir
+            )
+        self.batch_size = batch_size
+        self.n_process = n_process
+        # A fork parent loads its models on one thread; each worker applies num_threads itself
+        fork_workers = workers > 1 and worker_start == "fork" and backend == "torch"
+        try:
+            with single_threaded() if fork_workers else nullcontext():
+                self.sentiment_analyzer = AspectSentimentAnalyzer(
+                    context_window=context_window, 
+                    context_mode=context_mode,
+                    max_length=max_length,
+                    batch_size=sentiment_batch_size,
+                    cache_size=cache_size,
+                    cache_path=cache_path,
+                    mode=sentiment_mode,
+                    uncertainty_band=uncertainty_band,
+                    backend=backend,
+                    quantize=quantize,
+                    share_models=share_models,
+                    model_dir=model_dir,
+                    num_threads=None if fork_workers else num_threads,
+                    num_interop_threads=num_interop_threads,
+                    cpu_affinity=cpu_affinity,
+                    inference_mode=inference_mode,
+                    load_models=not spawn_workers
+                )
+        except Exception:
+            # Give back the spaCy model the matcher took from the registry
+            if self.matcher is not None:
+                self.matcher.close()
+            raise
+        self.workers = workers
+        self.worker_start = worker_start
+        self._config_file = config_file
+        # Workers tokenize in-process; each takes its share of the cores when it starts
+        self._worker_options = dict(
+            context_window=context_window, context_mode=context_mode, max_length=max_length,
+            batch_size=batch_size, n_process=1, matcher_mode=matcher_mode,
+            sentiment_batch_size=sentiment_batch_size, cache_size=cache_size, cache_path=cache_path,
+            sentiment_mode=sentiment_mode, uncertainty_band=uncertainty_band, backend=backend,
+            quantize=quantize, share_models=share_models, model_dir=model_dir,
+            num_threads=num_threads,
+            num_interop_threads=num_interop_threads, cpu_affinity=cpu_affinity,
+            inference_mode=inference_mode
+        )
+        self._executor = None
+    
+    def close(self) -> None:
+        """
+        Release the models held by the pipeline and stop its worker processes.
+        
+        Shared models are unloaded once the last pipeline using them is closed.
+        The pipeline cannot process comments after it has been closed.
+        """
+        self.scheduler.close()
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self.matcher is not None:
+            self.matcher.close()
+        self.sentiment_analyzer.close()
     
     def process_corpus_flat(self, comments: list[str]) -> list[dict]:
         """
         Process a list of comments and return flattened results suitable for export.
         
-        Performs aspect matching and sentiment analysis on each comment, returning
+        Performs aspect matching and sentiment analysis via process_corpus, returning
         results in a dictionary format optimized for JSON/CSV export.
         
         Args:
@@ -49,35 +369,15 @@ class AspectSentimentPipeline:
         Returns:
             list[dict]: List of analysis results with flattened aspect-sentiment data
         """
-        results = []
-        for comment in comments:
-            cleaned = clean_input(comment)
-            aspects, doc = match_aspect_phrases(cleaned, self.config)
-            sentiment_result = self.sentiment_analyzer.analyze_text(cleaned, aspects, doc)
-            results.append({
-                'original_text': comment,
-                'cleaned_text': cleaned,
-                'aspects_found': len(aspects),
-                'aspect_sentiments': [
-                    {
-                        'aspect': aspect.aspect_match.text,
-                        'category': aspect.aspect_match.category,
-                        'sentiment': aspect.sentiment,
-                        'confidence': aspect.confidence,
-                        'start': aspect.aspect_match.start,
-                        'end': aspect.aspect_match.end
-                    }
-                    for aspect in sentiment_result.aspects
-                ]
-            })
-        return results
+        return list(self.process_corpus_flat_iter(comments))
     
     def process_corpus(self, comments: list[str]) -> list[AspectSentimentResult]:
         """
         Process a list of comments and return structured AspectSentimentResult objects.
         
-        Performs aspect matching and sentiment analysis on each comment, returning
-        results as structured dataclass objects for programmatic use.
+        Comments are tokenized and matched in batches via spaCy's nlp.pipe, and the
+        aspects of each batch are scored together by the sentiment analyzer,
+        returning results as structured dataclass objects for programmatic use.
         
         Args:
             comments (list[str]): List of text comments to analyze
@@ -85,10 +385,228 @@ class AspectSentimentPipeline:
         Returns:
             list[AspectSentimentResult]: List of structured sentiment analysis results
         """
-        results = []
-        for comment in comments:
-            cleaned = clean_input(comment)
-            aspects, doc = match_aspect_phrases(cleaned, self.config)
-            sentiment_result = self.sentiment_analyzer.analyze_text(cleaned, aspects, doc)
-            results.append(sentiment_result)
-        return results
\ No newline at end of file
+        return list(self.process_corpus_iter(comments))
+    
+    async def analyze_async(self, text: str) -> AspectSentimentResult:
+        """
+        Analyze one comment from asyncio code, batched with concurrent requests.
+        
+        Requests made within async_max_wait of each other (up to async_batch_size)
+        are matched and scored together in a background thread, so many concurrent
+        single-comment calls share batched BERT forward passes and the event loop
+        is never blocked.
+        
+        Args:
+            text (str): Comment to analyze
+            
+        Returns:
+            AspectSentimentResult: Structured sentiment analysis result for the comment
+            
+        Raises:
+            asyncio.QueueFull: If async_queue_size requests are already waiting
+        """
+        return await self.scheduler.submit(text)
+    
+    def process_corpus_flat_iter(self, comments: Iterable[str], batch_size: int | None = None) -> Iterator[dict]:
+        """
+        Lazily process a stream of comments, yielding flattened results for export.
+        
+        Args:
+            comments (Iterable[str]): Text comments to analyze, e.g. lines of an open file
+            batch_size (int | None, optional): Number of comments tokenized and scored 
+                                            together. Defaults to the pipeline's batch_size.
+            
+        Yields:
+            dict: Analysis result with flattened aspect-sentiment data, in input order
+        """
+        for comment, sentiment_result in self._process_stream(comments, batch_size):
+            yield flatten_result(comment, sentiment_result)
+    
+    def process_corpus_iter(
+        self, comments: Iterable[str], batch_size: int | None = None
+    ) -> Iterator[AspectSentimentResult]:
+        """
+        Lazily process a stream of comments, yielding results as each batch completes.
+        
+        The iterable is consumed one batch at a time, so memory use depends on the
+        batch size rather than the size of the corpus, and the first results are
+        available before the input has been read to the end.
+        
+        Args:
+            comments (Iterable[str]): Text comments to analyze, e.g. lines of an open file
+            batch_size (int | None, optional): Number of comments tokenized and scored 
+                                            together. Defaults to the pipeline's batch_size.
+            
+        Yields:
+            AspectSentimentResult: Structured sentiment analysis result, in input order
+        """
+        for _, sentiment_result in self._process_stream(comments, batch_size):
+            yield sentiment_result
+    
+    def _process_stream(
+        self, comments: Iterable[str], batch_size: int | None = None
+    ) -> Iterator[tuple[str, AspectSentimentResult]]:
+        """
+        Match and score a stream of comments batch by batch, in this process or the worker pool.
+        
+        Comments are cleaned as spaCy's nlp.pipe pulls them, and the aspects of each
+        batch are scored together by the sentiment analyzer. Only the comments that
+        nlp.pipe has read ahead but not yet returned are held in memory.
+        
+        Args:
+            comments (Iterable[str]): Text comments to analyze
+            batch_size (int | None, optional): Number of comments tokenized and scored 
+                                            together. Defaults to the pipeline's batch_size.
+            
+        Yields:
+            tuple[str, AspectSentimentResult]: Original comment and its result, in input order
+        """
+        batch_size = batch_size or self.batch_size
+        if self.workers > 1:
+            yield from self._process_parallel(comments, batch_size)
+        else:
+            yield from self._process_local(comments, batch_size)
+    
+    def _process_local(
+        self, comments: Iterable[str], batch_size: int | None = None
+    ) -> Iterator[tuple[str, AspectSentimentResult]]:
+        """
+        Match and score a stream of comments in this process.
+        
+        Args:
+            comments (Iterable[str]): Text comments to analyze
+            batch_size (int | None, optional): Number of comments tokenized and scored 
+                                            together. Defaults to the pipeline's batch_size.
+            
+        Yields:
+            tuple[str, AspectSentimentResult]: Original comment and its result, in input order
+        """
+        batch_size = batch_size or self.batch_size
+        pending = deque()  # (original, cleaned) of comments read but not yet yielded
+        
+        def cleaned_comments():
+            for comment in comments:
+                cleaned = clean_input(comment)
+                pending.append((comment, cleaned))
+                yield cleaned
+        
+        matches = self.matcher.pipe(cleaned_comments(), batch_size=batch_size, n_process=self.n_process)
+        batch = []
+        for aspects, doc in matches:
+            batch.append((pending[len(batch)][1], aspects, doc))
+            if len(batch) == batch_size:
+                for sentiment_result in self.sentiment_analyzer.analyze_batch(batch):
+                    yield pending.popleft()[0], sentiment_result
+                batch = []
+        
+        if batch:
+            for sentiment_result in self.sentiment_analyzer.analyze_batch(batch):
+                yield pending.popleft()[0], sentiment_result
+    
+    def _start_workers(self) -> ProcessPoolExecutor:
+        """
+        Start the worker pool using the configured start method.
+        
+        "spawn" workers start from a clean interpreter and load their own models.
+        "fork" workers are forked from this process after its models have been
+        warmed up on a sample comment, so they share the model weights with the
+        parent copy-on-write. The heap is frozen while forking (gc.freeze) so
+        garbage collection in the workers does not write to, and thereby copy,
+        the pages holding the inherited objects.
+        
+        Returns:
+            ProcessPoolExecutor: Pool of worker processes
+        """
+        context = multiprocessing.get_context(self.worker_start)
+        worker_index = context.Value('i', 0)
+        if self.worker_start == "spawn":
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._config_file, self._worker_options, self.workers, worker_index)
+            )
+        
+        # Warm up and fork on one thread so the workers inherit no OpenMP thread team
+        with single_threaded():
+            stats = replace(self.sentiment_analyzer.stats)
+            if self.config.aspects:
+                aspect, data = next(iter(self.config.aspects.items()))
+                sample = f"the {(data.phrases or [aspect])[0]} is good"
+            else:
+                sample = "this is good"
+            list(self._process_local([sample]))
+            self.sentiment_analyzer.stats = stats
+            
+            gc.collect()
+            gc.freeze()
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_adopt_worker,
+                initargs=(self, worker_index)
+            )
+            # Fork every worker now, while the parent is idle and holds no locks. Python warns
+            # about forking with threads running; the parent has started no OpenMP threads
+            # and torch rebuilds its other pools in the child, so the warning is silenced here
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message=".*use of fork\\(\\) may lead to deadlocks", category=DeprecationWarning)
+                for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+                    future.result()
+        # The workers keep their frozen copy; the parent must be able to collect garbage again
+        gc.unfreeze()
+        return executor
+    
+    def _process_parallel(
+        self, comments: Iterable[str], batch_size: int
+    ) -> Iterator[tuple[str, AspectSentimentResult]]:
+        """
+        Shard a stream of comments across the worker pool and yield results in input order.
+        
+        At most two shards per worker are in flight, so the input is still read
+        lazily. The workers' ScoringStats counters are added to this pipeline's
+        analyzer as their shards complete.
+        
+        Args:
+            comments (Iterable[str]): Text comments to analyze
+            batch_size (int): Number of comments per shard
+            
+        Yields:
+            tuple[str, AspectSentimentResult]: Original comment and its result, in input order
+            
+        Raises:
+            RuntimeError: If a comment fails in a worker or a worker process dies
+        """
+        if self._executor is None:
+            self._executor = self._start_workers()
+        
+        comments = iter(comments)
+        in_flight = deque()
+        submitted = 0
+        try:
+            while True:
+                while len(in_flight) < 2 * self.workers:
+                    shard = list(islice(comments, batch_size))
+                    if not shard:
+                        break
+                    in_flight.append((submitted, shard, self._executor.submit(_process_chunk, submitted, shard)))
+                    submitted += len(shard)
+                if not in_flight:
+                    return
+                
+                start, shard, future = in_flight.popleft()
+                try:
+                    results, stats = future.result()
+                except BrokenProcessPool as e:
+                    self._executor = None
+                    raise RuntimeError(
+                        f"A worker process died while comments {start + 1}-{submitted} were being processed"
+                    ) from e
+                
+                analyzer_stats = self.sentiment_analyzer.stats
+                for name, value in stats.items():
+                    setattr(analyzer_stats, name, getattr(analyzer_stats, name) + value)
+                yield from zip(shard, results)
+        finally:
+            for _, _, future in in_flight:
+                future.cancel()
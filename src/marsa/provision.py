@@ -0,0 +1,165 @@
+import hashlib
+import json
+from pathlib import Path
+
+SPACY_MODEL = "en_core_web_sm"
+MANIFEST_FILE = "manifest.json"
+
+def model_slug(model_name: str) -> str:
+    """
+    Turn a Hugging Face hub name into a single directory name.
+
+    Args:
+        model_name (str): Hub name or local path of a model
+
+    Returns:
+        str: Directory-safe name, e.g. "cardiffnlp--twitter-roberta-base-sentiment-latest"
+    """
+    return model_name.strip("/").replace("/", "--")
+
+def spacy_model_path(model_dir: str | Path, name: str = SPACY_MODEL) -> Path:
+    """
+    Location of a provisioned spaCy model inside a model directory.
+
+    Args:
+        model_dir (str | Path): Root of the provisioned model directory
+        name (str, optional): Name of the spaCy model. Defaults to "en_core_web_sm".
+
+    Returns:
+        Path: Directory holding the serialized spaCy pipeline
+    """
+    return Path(model_dir) / "spacy" / name
+
+def sentiment_model_path(model_dir: str | Path, model_name: str) -> Path:
+    """
+    Location of a provisioned Hugging Face sentiment model inside a model directory.
+
+    Args:
+        model_dir (str | Path): Root of the provisioned model directory
+        model_name (str): Hub name of the sentiment model
+
+    Returns:
+        Path: Directory holding the model weights, config and tokenizer
+    """
+    return Path(model_dir) / "sentiment" / model_slug(model_name)
+
+def onnx_cache_dir(model_dir: str | Path) -> Path:
+    """
+    Location of the provisioned ONNX exports inside a model directory.
+
+    Args:
+        model_dir (str | Path): Root of the provisioned model directory
+
+    Returns:
+        Path: Directory passed as cache_dir to OnnxSentimentPipeline
+    """
+    return Path(model_dir) / "onnx"
+
+def _file_hashes(model_dir: Path) -> dict[str, str]:
+    """
+    SHA-256 digest of every model file below a model directory.
+
+    Args:
+        model_dir (Path): Root of the provisioned model directory
+
+    Returns:
+        dict[str, str]: Hex digest keyed by the file's path relative to model_dir
+    """
+    hashes = {}
+    for path in sorted(model_dir.rglob("*")):
+        if path.is_file() and path.name != MANIFEST_FILE:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as fp:
+                for block in iter(lambda: fp.read(1 << 20), b""):
+                    digest.update(block)
+            hashes[path.relative_to(model_dir).as_posix()] = digest.hexdigest()
+    return hashes
+
+def fetch_models(
+    model_dir: str | Path,
+    spacy_model: str = SPACY_MODEL,
+    sentiment_model: str | None = None,
+    onnx: bool = False
+) -> Path:
+    """
+    Download every model the pipeline needs into a local model directory.
+
+    Run this once on a host with network access; pipelines created with the same
+    model_dir then load strictly from disk. A manifest of file hashes is written
+    last so verify_models can detect incomplete or modified directories.
+
+    Args:
+        model_dir (str | Path): Root of the model directory to populate
+        spacy_model (str, optional): Name of the spaCy model. Defaults to "en_core_web_sm".
+        sentiment_model (str | None, optional): Hub name of the sentiment model.
+                                             Defaults to the analyzer's SENTIMENT_MODEL.
+        onnx (bool, optional): Also export the sentiment model for the onnx backend.
+                            Defaults to False.
+
+    Returns:
+        Path: Path to the written manifest file
+
+    Raises:
+        OSError: If a model cannot be downloaded or written
+        subprocess.CalledProcessError: If the spaCy model download fails
+    """
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from marsa.sentiment import SENTIMENT_MODEL
+    from marsa.utils import require_spacy_model
+
+    model_dir = Path(model_dir).resolve()
+    sentiment_model = sentiment_model or SENTIMENT_MODEL
+
+    spacy_path = spacy_model_path(model_dir, spacy_model)
+    spacy_path.mkdir(parents=True, exist_ok=True)
+    require_spacy_model(spacy_model).to_disk(spacy_path)
+
+    sentiment_path = sentiment_model_path(model_dir, sentiment_model)
+    AutoTokenizer.from_pretrained(sentiment_model).save_pretrained(sentiment_path)
+    AutoModelForSequenceClassification.from_pretrained(sentiment_model).save_pretrained(sentiment_path)
+
+    models = {
+        'spacy': {'name': spacy_model, 'path': f"spacy/{spacy_model}"},
+        'sentiment': {'name': sentiment_model, 'path': f"sentiment/{model_slug(sentiment_model)}"}
+    }
+    if onnx:
+        from marsa.models import export_onnx_model
+
+        export_onnx_model(str(sentiment_path), onnx_cache_dir(model_dir) / model_slug(sentiment_model))
+        models['onnx'] = {'name': sentiment_model, 'path': f"onnx/{model_slug(sentiment_model)}"}
+
+    manifest_path = model_dir / MANIFEST_FILE
+    with open(manifest_path, 'w') as f:
+        json.dump({'models': models, 'files': _file_hashes(model_dir)}, f, indent=2)
+    return manifest_path
+
+def verify_models(model_dir: str | Path) -> list[str]:
+    """
+    Check that a model directory is complete and unmodified since it was fetched.
+
+    Args:
+        model_dir (str | Path): Root of the provisioned model directory
+
+    Returns:
+        list[str]: Description of each problem found, empty if the directory is valid
+    """
+    model_dir = Path(model_dir).resolve()
+    manifest_path = model_dir / MANIFEST_FILE
+    if not manifest_path.exists():
+        return [f"Missing {MANIFEST_FILE} in {model_dir}; run `marsa models fetch --dir {model_dir}`"]
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    problems = []
+    for kind, model in manifest['models'].items():
+        if not (model_dir / model['path']).is_dir():
+            problems.append(f"Missing {kind} model {model['name']} at {model['path']}")
+
+    actual = _file_hashes(model_dir)
+    for relative_path, expected in manifest['files'].items():
+        if relative_path not in actual:
+            problems.append(f"Missing file {relative_path}")
+        elif actual[relative_path] != expected:
+            problems.append(f"Checksum mismatch for {relative_path}")
+    return problems
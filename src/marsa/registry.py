@@ -0,0 +1,172 @@
+import os
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+def _rss_bytes() -> int | None:
+    """
+    Resident set size of the current process, or None where /proc is unavailable.
+
+    Returns:
+        int | None: Resident memory of the process in bytes
+    """
+    try:
+        with open("/proc/self/statm") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _tensor_bytes(value) -> int:
+    """
+    Size of the tensors held in a state dict value, recursing into tuples.
+
+    Dynamic quantized Linear layers store their int8 weights as packed tuples,
+    so they are walked rather than skipped.
+
+    Args:
+        value: Tensor, tuple of tensors or other state dict entry
+
+    Returns:
+        int: Total size of the tensors in bytes
+    """
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(item) for item in value)
+    if hasattr(value, "numel") and hasattr(value, "element_size"):
+        return value.numel() * value.element_size()
+    return 0
+
+def _weights_bytes(model) -> int | None:
+    """
+    Size of a transformers pipeline's weights, or None for other model types.
+
+    Args:
+        model: Loaded model object
+
+    Returns:
+        int | None: Total size of the model's parameters and buffers in bytes
+    """
+    module = getattr(model, "model", None)
+    try:
+        return sum(_tensor_bytes(value) for value in module.state_dict().values())
+    except (AttributeError, TypeError):
+        return None
+
+class ModelRegistry:
+    """
+    Process-wide store of loaded models shared between pipelines.
+
+    Loading the spaCy pipeline, the BERT sentiment model and the VADER lexicon
+    dominates start-up time and memory, yet every pipeline in a process can use
+    the same instances. The registry loads each model once per key (model name
+    plus the options that change the loaded object) and counts references, so a
+    model stays loaded while any pipeline holds it and is dropped on its last
+    release. Each entry carries a lock that callers hold while running a model
+    that is not safe to call from several threads at once.
+
+    Attributes:
+        loads (int): Number of times a loader actually ran
+    """
+    def __init__(self) -> None:
+        """
+        Initialize an empty registry.
+        """
+        self.loads = 0
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    def acquire(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the model registered under key, loading it on first use.
+
+        Every call takes a reference that must be returned with release().
+
+        Args:
+            key (Hashable): Model name and load options identifying the model
+            loader (Callable[[], Any]): Zero-argument function that loads the model
+
+        Returns:
+            Any: Shared model instance
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                rss_before = _rss_bytes()
+                model = loader()
+                rss_after = _rss_bytes()
+                size = _weights_bytes(model)
+                if size is None and rss_before is not None and rss_after is not None:
+                    size = max(rss_after - rss_before, 0)
+                entry = {'model': model, 'refs': 0, 'bytes': size, 'lock': threading.Lock()}
+                self._entries[key] = entry
+                self.loads += 1
+            entry['refs'] += 1
+            return entry['model']
+
+    def lock(self, key: Hashable) -> threading.Lock:
+        """
+        Return the lock that serializes calls into the model registered under key.
+
+        Every holder of a shared model uses the same lock, so a model that keeps
+        per-call state (such as a fast tokenizer) is never entered concurrently.
+
+        Args:
+            key (Hashable): Key the model was acquired under
+
+        Returns:
+            threading.Lock: Lock shared by all users of the model
+
+        Raises:
+            KeyError: If no model is registered under key
+        """
+        with self._lock:
+            return self._entries[key]['lock']
+
+    def release(self, key: Hashable) -> None:
+        """
+        Return a reference taken by acquire(), unloading the model on the last release.
+
+        Args:
+            key (Hashable): Key the model was acquired under
+
+        Raises:
+            KeyError: If no model is registered under key
+        """
+        with self._lock:
+            entry = self._entries[key]
+            entry['refs'] -= 1
+            if entry['refs'] <= 0:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """
+        Drop every registered model regardless of outstanding references.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def memory_report(self) -> dict[Hashable, dict]:
+        """
+        Report the loaded models, their reference counts and approximate memory.
+
+        Memory is the size of the weights for transformers models and the growth
+        of the process's resident memory while loading for everything else; it is
+        None where neither can be measured.
+
+        Returns:
+            dict[Hashable, dict]: Reference count and size in bytes for each key
+        """
+        with self._lock:
+            return {
+                key: {'refs': entry['refs'], 'bytes': entry['bytes']}
+                for key, entry in self._entries.items()
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+MODEL_REGISTRY = ModelRegistry()
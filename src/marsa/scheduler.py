@@ -0,0 +1,198 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+class MicroBatchScheduler:
+    """
+    Collects concurrent asyncio requests into batches for a blocking batch function.
+
+    An online service receives many requests of a single comment each, but the
+    sentiment model is far more efficient on batches. The scheduler queues each
+    request, waits up to max_wait after the first one for others to arrive (or
+    until max_batch_size are queued), then runs the batch function once for all
+    of them in an executor thread and resolves every request's future with its
+    own result. While a batch runs, new requests queue up and form the next
+    batch, so batches grow with load while a lone request waits at most max_wait.
+
+    Attributes:
+        process_batch (Callable[[list], list]): Blocking function returning one result per input
+        max_batch_size (int): Maximum number of requests processed together
+        max_wait (float): Seconds to wait for more requests after the first of a batch
+        max_queue_size (int): Maximum number of queued requests, 0 for unbounded
+        batches (int): Number of batches processed
+        requests (int): Number of requests processed
+    """
+    def __init__(
+        self,
+        process_batch: Callable[[list], list],
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        max_queue_size: int = 0
+    ) -> None:
+        """
+        Initialize the scheduler; its worker task starts with the first request.
+
+        Args:
+            process_batch (Callable[[list], list]): Blocking function returning one result
+                                                    per input, in order
+            max_batch_size (int, optional): Maximum number of requests processed together.
+                                         Defaults to 32.
+            max_wait (float, optional): Seconds to wait for more requests after the first
+                                     of a batch. Defaults to 0.005.
+            max_queue_size (int, optional): Maximum number of queued requests before new
+                                         ones are rejected, 0 for unbounded. Defaults to 0.
+
+        Raises:
+            ValueError: If max_batch_size is below 1 or max_wait or max_queue_size is negative
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        if max_wait < 0:
+            raise ValueError(f"max_wait must not be negative, got {max_wait}")
+        if max_queue_size < 0:
+            raise ValueError(f"max_queue_size must not be negative, got {max_queue_size}")
+
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue_size = max_queue_size
+        self.batches = 0
+        self.requests = 0
+        # One batch runs at a time; the model serializes inference anyway
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="marsa-batch")
+        self._loop = None
+        self._queue = None
+        self._task = None
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue one input and wait for its result.
+
+        Args:
+            item (Any): Input passed to process_batch as part of a batch
+
+        Returns:
+            Any: Result of process_batch for this input
+
+        Raises:
+            asyncio.QueueFull: If max_queue_size requests are already waiting
+            RuntimeError: If the scheduler has been closed
+            Exception: Whatever process_batch raised for the batch holding this input
+        """
+        if self._executor is None:
+            raise RuntimeError("The scheduler has been closed")
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task.done():
+            # Queues and tasks belong to one event loop; start afresh on a new loop
+            self._loop = loop
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._task = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    def qsize(self) -> int:
+        """
+        Number of requests waiting to be batched.
+
+        Returns:
+            int: Queued requests not yet taken into a batch
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _run(self) -> None:
+        """
+        Form batches from the queue and process them until cancelled.
+
+        On cancellation, the requests of the current batch and those still
+        queued are cancelled so no caller waits forever.
+        """
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        batch = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    if not queue.empty():
+                        # Requests that queued up while the last batch ran join without waiting
+                        batch.append(queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                batch = [(item, future) for item, future in batch if not future.cancelled()]
+                if batch:
+                    await self._process(loop, batch)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            while not queue.empty():
+                queue.get_nowait()[1].cancel()
+            raise
+
+    async def _process(self, loop: asyncio.AbstractEventLoop, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        """
+        Run process_batch in the executor and resolve each request with its result.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Event loop the requests' futures belong to
+            batch (list[tuple[Any, asyncio.Future]]): Input and future of each request
+        """
+        try:
+            results = await loop.run_in_executor(self._executor, self.process_batch, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.requests += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def close(self) -> None:
+        """
+        Stop the worker task and the executor thread.
+
+        Requests that are queued or being processed are cancelled. When the event
+        loop runs in another thread, close() waits for the worker task to finish
+        cancelling there, so the loop can be stopped right afterwards.
+        """
+        task, loop = self._task, self._loop
+        self._task = None
+        if task is not None and not task.done() and not loop.is_closed():
+            try:
+                current = asyncio.get_running_loop()
+            except RuntimeError:
+                current = None
+            if loop.is_running() and current is not loop:
+                asyncio.run_coroutine_threadsafe(self._cancel(task), loop).result()
+            elif loop.is_running():
+                task.cancel()
+            else:
+                loop.run_until_complete(self._cancel(task))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @staticmethod
+    async def _cancel(task: asyncio.Task) -> None:
+        """
+        Cancel the worker task and wait until it has finished.
+
+        Args:
+            task (asyncio.Task): Worker task running _run
+        """
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
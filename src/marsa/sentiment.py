@@ -1,10 +1,22 @@
+import numpy as np
+import threading
 import torch
+from marsa.cache import ScoreCache, SQLiteScoreCache
 from marsa.matching import AspectMatch
+from marsa.models import OnnxSentimentPipeline, configure_cpu, quantize_dynamic_int8
+from marsa.provision import onnx_cache_dir, sentiment_model_path
+from marsa.registry import MODEL_REGISTRY
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from dataclasses import dataclass
 from transformers import logging
 from transformers import pipeline
-from spacy.tokens import Doc
+from spacy.pipeline import Sentencizer
+from spacy.tokens import Doc, Span
+
+SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+SENTIMENT_MODES = ("ensemble", "cascade", "vader")
+BACKENDS = ("torch", "onnx")
+CONTEXT_MODES = ("window", "sentence", "merged")
 
 @dataclass 
 class AspectSentiment:
@@ -39,6 +51,35 @@ class AspectSentimentResult:
     """
     text: str
     aspects: list[AspectSentiment]
+
+@dataclass
+class ScoringStats:
+    """
+    Running counters describing how aspect contexts were scored.
+    
+    Attributes:
+        contexts (int): Number of aspect contexts scored
+        vader_only (int): Contexts whose sentiment was decided by VADER alone
+        bert_contexts (int): Contexts that took the ensemble (VADER + BERT) path
+        bert_inferences (int): Contexts actually sent to the BERT model (not served from cache)
+        merged_windows (int): Aspect contexts in merged context mode that repeat another 
+                              context of the same comment, i.e. scorings saved by merging
+    """
+    contexts: int = 0
+    vader_only: int = 0
+    bert_contexts: int = 0
+    bert_inferences: int = 0
+    merged_windows: int = 0
+    
+    @property
+    def bert_rate(self) -> float:
+        """
+        Fraction of aspect contexts that took the BERT path.
+        
+        Returns:
+            float: Ratio of bert_contexts to contexts, 0.0 if nothing was scored
+        """
+        return self.bert_contexts / self.contexts if self.contexts else 0.0
     
 class AspectSentimentAnalyzer:
     """
@@ -50,15 +91,63 @@ class AspectSentimentAnalyzer:
     
     The analyzer extracts context windows around aspects and uses ensemble
     prediction to provide robust sentiment classification with confidence scoring.
-    
+    In cascade mode the BERT model only runs for contexts where VADER is uncertain,
+    and in vader mode it is never loaded.
+
+    The analyzer keeps no per-call state: the Doc being analyzed is passed down
+    explicitly, so one instance (and one loaded model) can serve a thread pool.
+    Calls into the BERT model and its tokenizer are serialized by a lock, while
+    context extraction and VADER scoring run in parallel.
+
     Attributes:
         threshold (float): Sentiment score threshold for neutral classification
         context_window (int): Number of tokens before/after aspects for context
+        context_mode (str): "window" scores a token window per aspect, "sentence" scores 
+                            the aspect's sentence, "merged" coalesces overlapping windows
+        max_length (int | None): Maximum subword length of a context sent to BERT
+        mode (str): Scoring mode, one of "ensemble", "cascade" or "vader"
+        uncertainty_band (float): In cascade mode, BERT runs when abs(VADER compound) is below this
+        stats (ScoringStats): Counters for how often each scoring path ran
+        batch_size (int): Number of contexts sent to the BERT model per forward pass
+        sort_by_length (bool): Whether contexts are ordered by token length before batching
+        model_name (str): Name of the BERT sentiment model
+        backend (str): Inference backend of the BERT model, "torch" or "onnx"
+        quantize (bool): Whether the torch model's Linear layers use dynamic INT8 quantization
+        model_identity (str): Model name and scoring parameters, used to key cached scores
+        share_models (bool): Whether the models are shared through the model registry
+        model_dir (str | None): Provisioned model directory the BERT model is loaded from
+        num_threads (int | None): Intra-op threads used by the BERT model
+        num_interop_threads (int | None): Inter-op threads used by the BERT model
+        inference_mode (bool): Whether the torch model runs under torch.inference_mode
+        score_cache (ScoreCache | None): LRU cache of per-context scores, None if disabled
+        disk_cache (SQLiteScoreCache | None): Persistent score store shared across runs, 
+                                             None if disabled
         vader_analyzer (SentimentIntensityAnalyzer): VADER sentiment analyzer instance
-        bert_model: Pre-trained BERT sentiment classification pipeline
-        doc (Doc | None): Current spaCy document being processed
+        bert_model: Pre-trained BERT sentiment classification pipeline, None in vader mode
     """
-    def __init__(self, threshold: float = 0.05, context_window: int = 3) -> None:
+    def __init__(
+        self, 
+        threshold: float = 0.05, 
+        context_window: int = 3, 
+        context_mode: str = "window",
+        max_length: int | None = 256,
+        batch_size: int = 32, 
+        sort_by_length: bool = True,
+        cache_size: int = 10000,
+        cache_path: str | None = None,
+        cache_max_entries: int = 1000000,
+        mode: str = "ensemble",
+        uncertainty_band: float = 0.5,
+        backend: str = "torch",
+        quantize: bool = False,
+        share_models: bool = False,
+        model_dir: str | None = None,
+        num_threads: int | None = None,
+        num_interop_threads: int | None = None,
+        cpu_affinity: list[int] | None = None,
+        inference_mode: bool = True,
+        load_models: bool = True
+    ) -> None:
         """
         Initialize the aspect sentiment analyzer with VADER and BERT models.
         
@@ -70,25 +159,192 @@ class AspectSentimentAnalyzer:
                                     Defaults to 0.05.
             context_window (int, optional): Number of tokens before/after aspects for context. 
                                         Defaults to 3.
+            context_mode (str, optional): "window" scores context_window tokens around each 
+                                        aspect; "sentence" scores the sentence containing the 
+                                        aspect, so all aspects of a sentence share one score; 
+                                        "merged" coalesces overlapping or touching windows 
+                                        of a Doc into one span scored for every aspect it 
+                                        covers. Defaults to "window".
+            max_length (int | None, optional): Maximum subword length of a context sent to 
+                                            BERT, including special tokens. Longer contexts 
+                                            are truncated around the aspect so it is never 
+                                            cut off; None disables the bound. Defaults to 256.
+            batch_size (int, optional): Number of contexts sent to the BERT model per 
+                                    forward pass. Defaults to 32.
+            sort_by_length (bool, optional): Whether contexts are ordered by token length 
+                                        before batching to reduce padding. Defaults to True.
+            cache_size (int, optional): Maximum number of context scores kept in the LRU 
+                                    cache, 0 disables caching. Defaults to 10000.
+            cache_path (str | None, optional): Path to a SQLite file that persists context 
+                                            scores across runs and processes. Defaults to None.
+            cache_max_entries (int, optional): Maximum number of entries kept in the SQLite 
+                                            file before the least recently used are evicted. 
+                                            Defaults to 1000000.
+            mode (str, optional): "ensemble" scores every context with VADER and BERT, 
+                                "cascade" only runs BERT when VADER is uncertain, and "vader" 
+                                never loads BERT. Defaults to "ensemble".
+            uncertainty_band (float, optional): In cascade mode, BERT runs for contexts whose 
+                                            absolute VADER compound score is below this value. 
+                                            Defaults to 0.5.
+            backend (str, optional): "torch" runs the transformers pipeline on PyTorch, "onnx" 
+                                  runs a cached ONNX export with onnxruntime on the CPU. 
+                                  Defaults to "torch".
+            quantize (bool, optional): Apply PyTorch dynamic INT8 quantization to the model's 
+                                    Linear layers at load time; the model then runs on the CPU. 
+                                    Only supported by the torch backend. Defaults to False.
+            share_models (bool, optional): Take the BERT and VADER models from the process-wide 
+                                        model registry, so analyzers with the same model 
+                                        identity load them once. Defaults to False.
+            model_dir (str | None, optional): Provisioned model directory the BERT model (or 
+                                           its ONNX export) is loaded from, with no network 
+                                           access. Defaults to None.
+            num_threads (int | None, optional): Intra-op threads used by the BERT model (torch 
+                                             for the whole process, or the ONNX session), None 
+                                             for the library default. Defaults to None.
+            num_interop_threads (int | None, optional): Inter-op threads used by the BERT model, 
+                                                     None for the library default. 
+                                                     Defaults to None.
+            cpu_affinity (list[int] | None, optional): CPU cores the process is pinned to, so 
+                                                    workers on one host do not compete for 
+                                                    cores. Defaults to None.
+            inference_mode (bool, optional): Run the torch model under torch.inference_mode, 
+                                          which skips autograd bookkeeping. Defaults to True.
+            load_models (bool, optional): Load the VADER and BERT models. False keeps only the 
+                                       settings, stats and caches, e.g. in a parent process 
+                                       whose workers do the scoring. Defaults to True.
+            
+        Raises:
+            ValueError: If mode, context_mode or backend is not supported, quantize is 
+                        used with onnx, or max_length, a thread count or cpu_affinity is invalid
+            ImportError: If the onnx backend is selected without onnxruntime installed
+            FileNotFoundError: If model_dir does not contain the BERT model
         """
+        if mode not in SENTIMENT_MODES:
+            raise ValueError(f"Unsupported sentiment mode: {mode}; expected 'ensemble', 'cascade' or 'vader'")
+        if context_mode not in CONTEXT_MODES:
+            raise ValueError(f"Unsupported context mode: {context_mode}; expected 'window', 'sentence' or 'merged'")
+        if max_length is not None and max_length < 8:
+            raise ValueError(f"max_length must be at least 8 subwords, got {max_length}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported backend: {backend}; expected 'torch' or 'onnx'")
+        if quantize and backend != "torch":
+            raise ValueError("Dynamic quantization is only supported by the torch backend")
+        
         self.threshold = threshold
         self.context_window = context_window
-        self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.context_mode = context_mode
+        self.max_length = max_length
+        self.mode = mode
+        self.uncertainty_band = uncertainty_band
+        self.stats = ScoringStats()
+        self._stats_lock = threading.Lock()
+        self.batch_size = batch_size
+        self.sort_by_length = sort_by_length
+        self.model_name = SENTIMENT_MODEL
+        self.backend = backend
+        self.quantize = quantize
+        self.model_identity = f"{self.model_name}:{self.backend}" + (":int8" if quantize else "")
+        self.score_cache = ScoreCache(cache_size) if cache_size > 0 else None
+        self.disk_cache = SQLiteScoreCache(cache_path, cache_max_entries) if cache_path else None
+        self.share_models = share_models
+        self.model_dir = model_dir
+        self.num_threads = num_threads
+        self.num_interop_threads = num_interop_threads
+        self.inference_mode = inference_mode
+        if backend == "torch" and mode != "vader":
+            configure_cpu(num_threads, num_interop_threads, cpu_affinity)
+        else:
+            configure_cpu(cpu_affinity=cpu_affinity)
+        self._model_keys = []
+        self.vader_analyzer = self._acquire_model(("vader",), SentimentIntensityAnalyzer) if load_models else None
+        bert_key = ("bert", self.model_identity, model_dir)
+        self.bert_model = self._acquire_model(bert_key, self._load_bert_model) if load_models and self.mode != "vader" else None
+        # Tokenizers and pipelines keep per-call state, so calls into the BERT model are
+        # serialized; a shared model uses the registry's lock so all its users agree
+        self._model_lock = MODEL_REGISTRY.lock(bert_key) if bert_key in self._model_keys else threading.Lock()
+        self._sentencizer = Sentencizer()
+    
+    def _acquire_model(self, key: tuple, loader):
+        """
+        Load a model, or take the shared instance from the registry when sharing is enabled.
+        
+        Args:
+            key (tuple): Registry key identifying the model and its load options
+            loader: Zero-argument function that loads the model
+            
+        Returns:
+            Loaded or shared model instance
+        """
+        if not self.share_models:
+            return loader()
+        self._model_keys.append(key)
+        return MODEL_REGISTRY.acquire(key, loader)
+    
+    def close(self) -> None:
+        """
+        Release the shared models and close the persistent score store.
+        
+        The analyzer cannot score contexts after it has been closed.
+        """
+        for key in self._model_keys:
+            MODEL_REGISTRY.release(key)
+        self._model_keys = []
+        self.vader_analyzer = None
+        self.bert_model = None
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+    
+    def _load_bert_model(self):
+        """
+        Load the BERT sentiment model for the configured backend.
+        
+        With a model_dir, the model is read from the provisioned directory only and
+        a missing model is an error instead of a download.
+        
+        Returns:
+            Callable sentiment classifier returning label/score dictionaries per input
+            
+        Raises:
+            FileNotFoundError: If model_dir does not contain the model
+        """
         logging.set_verbosity_error() # only log errors
-        self.bert_model = pipeline(
+        if self.backend == "onnx":
+            if self.model_dir is not None:
+                return OnnxSentimentPipeline(
+                    self.model_name, cache_dir=onnx_cache_dir(self.model_dir), top_k=1, export=False,
+                    num_threads=self.num_threads, num_interop_threads=self.num_interop_threads
+                )
+            return OnnxSentimentPipeline(
+                self.model_name, top_k=1, 
+                num_threads=self.num_threads, num_interop_threads=self.num_interop_threads
+            )
+        
+        model_source = self.model_name
+        if self.model_dir is not None:
+            model_path = sentiment_model_path(self.model_dir, self.model_name)
+            if not model_path.is_dir():
+                raise FileNotFoundError(
+                    f"Sentiment model {self.model_name} not found in {self.model_dir}; "
+                    f"run `marsa models fetch --dir {self.model_dir}`"
+                )
+            model_source = str(model_path)
+        bert_model = pipeline(
             "sentiment-analysis", # alias for text-classication
-            model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-            device=0 if torch.cuda.is_available() else -1,
+            model=model_source,
+            device=0 if torch.cuda.is_available() and not self.quantize else -1,
             top_k=True
         )
-        self.doc = None
+        if self.quantize:
+            bert_model.model = quantize_dynamic_int8(bert_model.model)
+        return bert_model
         
     def analyze_text(self, text: str, aspect_matches: list[AspectMatch], doc: Doc) -> AspectSentimentResult:
         """
         Analyze sentiment for each detected aspect in the text.
         
         Uses ensemble approach combining VADER and BERT sentiment models with
-        contextual analysis around each detected aspect.
+        contextual analysis around each detected aspect. All aspect contexts of
+        the text are scored by the BERT model in a single batched call.
         
         Args:
             text (str): The original input text
@@ -98,29 +354,298 @@ class AspectSentimentAnalyzer:
         Returns:
             AspectSentimentResult: Structured result containing aspect sentiments
         """
-        self.doc = doc  
-        aspect_sentiments = []
+        return self.analyze_batch([(text, aspect_matches, doc)])[0]
+    
+    def analyze_batch(self, items: list[tuple[str, list[AspectMatch], Doc]]) -> list[AspectSentimentResult]:
+        """
+        Analyze sentiment for the detected aspects of several texts at once.
+        
+        Collects the context windows of every aspect across all texts and scores
+        them together, so the BERT model runs batched forward passes instead of
+        one pass per aspect. Scores are mapped back to each aspect in order. In
+        sentence context mode, aspects sharing a sentence share a single context,
+        so inference scales with the number of sentences rather than aspects.
+        
+        Args:
+            items (list[tuple[str, list[AspectMatch], Doc]]): Text, detected aspect matches 
+                                                            and spaCy Doc for each input
+            
+        Returns:
+            list[AspectSentimentResult]: Structured result for each input, in order
+        """
+        contexts = []
+        for _, aspect_matches, doc in items:
+            if self.context_mode == "merged":
+                contexts.extend(self._extract_merged_windows(doc, aspect_matches))
+            else:
+                for aspect in aspect_matches:
+                    contexts.append(self._extract_context(doc, aspect))
+        
+        scores = self._score_contexts(contexts)
+        predictions = self._classify_scores(scores)
+        results = []
+        position = 0
+        
+        for text, aspect_matches, _ in items:
+            aspect_sentiments = []
+            for aspect in aspect_matches:
+                sentiment, confidence = predictions[position]
+                aspect_sentiments.append(AspectSentiment(
+                    aspect_match=aspect,
+                    sentiment=sentiment,
+                    confidence=confidence,
+                    context_used=contexts[position]
+                ))
+                position += 1
+            results.append(AspectSentimentResult(text=text, aspects=aspect_sentiments))
+        
+        return results
+    
+    def _classify_scores(self, scores: list[tuple[float, list[float] | None]]) -> list[tuple[str, float]]:
+        """
+        Turn context scores into sentiment labels and confidences.
+        
+        Contexts scored by BERT are combined with their VADER scores in a single
+        vectorized pass; VADER-only contexts are classified individually.
+        
+        Args:
+            scores (list[tuple[float, list[float] | None]]): VADER compound score and BERT 
+                                                          probabilities (or None) per context
+            
+        Returns:
+            list[tuple[str, float]]: Sentiment label and confidence for each context, in order
+        """
+        ensemble = [(vader_compound, bert_probs) for vader_compound, bert_probs in scores if bert_probs is not None]
+        if not ensemble:
+            return [self._vader_sentiment(vader_compound) for vader_compound, _ in scores]
+        
+        vader_scores, bert_probs = zip(*ensemble)
+        labels, confidences = self._weighted_sentiment_batch(
+            np.array(bert_probs, dtype=np.float64), np.array(vader_scores, dtype=np.float64)
+        )
+        ensemble_predictions = zip(labels.tolist(), confidences.tolist())
+        return [
+            self._vader_sentiment(vader_compound) if bert_probs is None else next(ensemble_predictions)
+            for vader_compound, bert_probs in scores
+        ]
+    
+    def _score_contexts(self, contexts: list[str]) -> list[tuple[float, list[float] | None]]:
+        """
+        Score a list of contexts with VADER and, where needed, the BERT model.
+        
+        Each distinct context is scored once: scores found in the in-memory cache or
+        the persistent SQLite store are reused, and the remaining contexts are passed
+        to the BERT pipeline as a single list, which splits them into forward passes
+        of batch_size contexts each. In cascade mode, contexts with a strongly polar
+        VADER score skip BERT; in vader mode no context reaches BERT.
         
-        for aspect in aspect_matches:
-            context = self._extract_context_window(aspect)
+        Args:
+            contexts (list[str]): Contextual texts to score
             
-            vader_scores = self.vader_analyzer.polarity_scores(context)
-            vader_compound = vader_scores['compound']
-            bert_results = self.bert_model(context)[0]
-            bert_probs = self._extract_bert_probabilities(bert_results)
+        Returns:
+            list[tuple[float, list[float] | None]]: VADER compound score and BERT probabilities 
+                                                  [negative, neutral, positive] for each context, 
+                                                  with None probabilities when BERT was skipped
+        """
+        keys = {context: (self.model_identity, context) for context in dict.fromkeys(contexts)}
+        scores = {}
+        
+        if self.mode != "vader" and self.score_cache is not None:
+            for context, key in keys.items():
+                cached = self.score_cache.get(key)
+                if cached is not None:
+                    scores[context] = cached
+        
+        uncached = [context for context in keys if context not in scores]
+        if uncached and self.mode != "vader" and self.disk_cache is not None:
+            stored = self.disk_cache.get_many([keys[context] for context in uncached])
+            for context in uncached:
+                if keys[context] in stored:
+                    scores[context] = stored[keys[context]]
+                    if self.score_cache is not None:
+                        self.score_cache.put(keys[context], scores[context])
+            uncached = [context for context in uncached if context not in scores]
+        
+        needs_bert = []
+        for context in uncached:
+            vader_compound = self.vader_analyzer.polarity_scores(context)['compound']
+            scores[context] = (vader_compound, None)
+            if self._needs_bert(vader_compound):
+                needs_bert.append(context)
+        
+        if needs_bert:
+            bert_probs = self._bert_probabilities(needs_bert)
             
-            sentiment, confidence = self._weighted_sentiment(bert_probs, vader_compound)
+            for context, probs in zip(needs_bert, bert_probs):
+                scores[context] = (scores[context][0], probs)
+                if self.score_cache is not None:
+                    self.score_cache.put(keys[context], scores[context])
             
-            aspect_sentiments.append(AspectSentiment(
-                aspect_match=aspect,
-                sentiment=sentiment,
-                confidence=confidence,
-                context_used=context
-            ))
+            if self.disk_cache is not None:
+                self.disk_cache.put_many({keys[context]: scores[context] for context in needs_bert})
+        
+        # Cached BERT scores are ignored for contexts VADER decides on its own, so results
+        # do not depend on what happens to be in the cache
+        for context, (vader_compound, probs) in scores.items():
+            if probs is not None and not self._needs_bert(vader_compound):
+                scores[context] = (vader_compound, None)
         
-        return AspectSentimentResult(text=text, aspects=aspect_sentiments)
+        bert_contexts = sum(scores[context][1] is not None for context in contexts)
+        with self._stats_lock:
+            self.stats.contexts += len(contexts)
+            self.stats.bert_inferences += len(needs_bert)
+            self.stats.vader_only += len(contexts) - bert_contexts
+            self.stats.bert_contexts += bert_contexts
+        
+        return [scores[context] for context in contexts]
+    
+    def _needs_bert(self, vader_compound: float) -> bool:
+        """
+        Decide whether a context requires the BERT model under the current mode.
+        
+        Args:
+            vader_compound (float): VADER compound sentiment score (-1 to 1)
+            
+        Returns:
+            bool: True if the context should be scored by BERT
+        """
+        if self.mode == "ensemble":
+            return True
+        elif self.mode == "cascade":
+            return abs(vader_compound) < self.uncertainty_band
+        else:
+            return False
     
-    def _extract_context_window(self, aspect_match: AspectMatch) -> str:
+    def _bert_probabilities(self, contexts: list[str]) -> list[list[float]]:
+        """
+        Run the BERT model over contexts in length-sorted batches.
+        
+        Each batch is padded to its longest member, so when the contexts span more
+        than one batch they are ordered by tokenized length first. This keeps
+        similarly sized contexts together and avoids computing padding tokens.
+        Probabilities are returned in the original context order.
+        
+        Args:
+            contexts (list[str]): Contextual texts to score
+            
+        Returns:
+            list[list[float]]: BERT probabilities [negative, neutral, positive] for each context
+        """
+        if self.sort_by_length and len(contexts) > self.batch_size:
+            lengths = self._token_lengths(contexts)
+            order = sorted(range(len(contexts)), key=lambda i: lengths[i])
+        else:
+            order = list(range(len(contexts)))
+        
+        options = {'batch_size': self.batch_size}
+        if self.max_length is not None:
+            # Backstop for _truncate_around; contexts already fit, so this never cuts off an aspect
+            options.update(truncation=True, max_length=self.max_length)
+        with self._model_lock:
+            if self.inference_mode and self.backend == "torch":
+                with torch.inference_mode():
+                    bert_results = self.bert_model([contexts[i] for i in order], **options)
+            else:
+                bert_results = self.bert_model([contexts[i] for i in order], **options)
+        
+        bert_probs = [None] * len(contexts)
+        for i, result in zip(order, bert_results):
+            bert_probs[i] = self._extract_bert_probabilities(result)
+        return bert_probs
+    
+    def _token_lengths(self, contexts: list[str]) -> list[int]:
+        """
+        Count the subword tokens of each context using the BERT model's tokenizer.
+        
+        Args:
+            contexts (list[str]): Contextual texts to measure
+            
+        Returns:
+            list[int]: Number of subword tokens in each context
+        """
+        with self._model_lock:
+            encoded = self.bert_model.tokenizer(contexts, add_special_tokens=False)
+        return [len(input_ids) for input_ids in encoded['input_ids']]
+    
+    def _extract_context(self, doc: Doc, aspect_match: AspectMatch) -> str:
+        """
+        Extract the text scored for an aspect according to the context mode.
+        
+        Args:
+            doc (Doc): spaCy Doc the aspect was matched in
+            aspect_match (AspectMatch): The matched aspect with token positions
+            
+        Returns:
+            str: Token window or sentence surrounding the aspect
+        """
+        if self.context_mode == "sentence":
+            return self._extract_sentence(doc, aspect_match)
+        return self._extract_context_window(doc, aspect_match)
+    
+    def _extract_sentence(self, doc: Doc, aspect_match: AspectMatch) -> str:
+        """
+        Extract the sentence containing an aspect.
+        
+        Uses the sentence boundaries already set on the Doc (by a parser, senter or
+        sentencizer); documents without boundaries are segmented in place with
+        spaCy's rule-based sentencizer, which needs no model.
+        
+        Args:
+            doc (Doc): spaCy Doc the aspect was matched in
+            aspect_match (AspectMatch): The matched aspect with token positions
+            
+        Returns:
+            str: Text of the sentence the aspect starts in, bounded to max_length subwords
+        """
+        if not doc.has_annotation("SENT_START"):
+            self._sentencizer(doc)
+        return self._bound_context(doc[aspect_match.token_start].sent, aspect_match)
+    
+    def _extract_merged_windows(self, doc: Doc, aspect_matches: list[AspectMatch]) -> list[str]:
+        """
+        Extract one context per aspect, coalescing overlapping or touching windows.
+        
+        Each aspect's token window is computed as in _extract_context_window; windows
+        that overlap or are adjacent in the Doc are merged into a single span, and
+        every aspect covered by that span receives its text, so the span is scored
+        once for all of them. A merged span longer than max_length subwords is
+        truncated around each aspect separately.
+        
+        Args:
+            doc (Doc): spaCy Doc the aspects were matched in
+            aspect_matches (list[AspectMatch]): Detected aspect matches of the Doc
+            
+        Returns:
+            list[str]: Context for each aspect, in the order of aspect_matches
+        """
+        windows = [
+            (max(0, aspect.token_start - self.context_window), 
+             min(len(doc), aspect.token_end + self.context_window))
+            for aspect in aspect_matches
+        ]
+        
+        order = sorted(range(len(windows)), key=lambda i: windows[i])
+        spans = []      # merged [start, end) token spans
+        span_of = {}    # aspect index -> index into spans
+        for i in order:
+            start, end = windows[i]
+            if spans and start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+            span_of[i] = len(spans) - 1
+        
+        contexts = [
+            self._bound_context(doc[spans[span_of[i]][0]:spans[span_of[i]][1]], aspect)
+            for i, aspect in enumerate(aspect_matches)
+        ]
+        # A long merged span is truncated around each aspect separately, so only
+        # contexts that came out identical are actually scored once
+        with self._stats_lock:
+            self.stats.merged_windows += len(contexts) - len(set(contexts))
+        return contexts
+    
+    def _extract_context_window(self, doc: Doc, aspect_match: AspectMatch) -> str:
         """
         Extract contextual text around an aspect for sentiment analysis.
         
@@ -128,14 +653,83 @@ class AspectSentimentAnalyzer:
         sufficient context for accurate sentiment classification.
         
         Args:
+            doc (Doc): spaCy Doc the aspect was matched in
             aspect_match (AspectMatch): The matched aspect with token positions
             
         Returns:
-            str: Contextual text surrounding the aspect
+            str: Contextual text surrounding the aspect, bounded to max_length subwords
         """
         start_token = max(0, aspect_match.token_start - self.context_window)
-        end_token = min(len(self.doc), aspect_match.token_end + self.context_window)
-        return self.doc[start_token:end_token].text
+        end_token = min(len(doc), aspect_match.token_end + self.context_window)
+        return self._bound_context(doc[start_token:end_token], aspect_match)
+    
+    def _bound_context(self, span: Span, aspect_match: AspectMatch) -> str:
+        """
+        Return the text of a context span, truncated around the aspect if it is too long.
+        
+        Byte-level BPE and WordPiece tokens each cover at least one UTF-8 byte, so a
+        context whose byte length plus the start and end tokens fits max_length
+        cannot exceed it and is returned without tokenizing. Longer contexts are tokenized and cut to
+        max_length subwords (including special tokens) centred on the aspect span.
+        
+        Args:
+            span (Span): Context span of the Doc the aspect was matched in
+            aspect_match (AspectMatch): The matched aspect the context is scored for
+            
+        Returns:
+            str: Span text, or the slice of it that fits max_length subwords
+        """
+        text = span.text
+        if self.max_length is None or self.bert_model is None or len(text.encode('utf-8')) + 2 <= self.max_length:
+            return text
+        
+        aspect_start = span.doc[aspect_match.token_start].idx - span.start_char
+        last_token = span.doc[aspect_match.token_end - 1]
+        aspect_end = last_token.idx + len(last_token) - span.start_char
+        return self._truncate_around(text, aspect_start, aspect_end)
+    
+    def _truncate_around(self, text: str, aspect_start: int, aspect_end: int) -> str:
+        """
+        Cut text to the subword budget, keeping the aspect and centring the window on it.
+        
+        Args:
+            text (str): Context text to truncate
+            aspect_start (int): Character offset of the aspect in text
+            aspect_end (int): Character offset just past the aspect in text
+            
+        Returns:
+            str: Slice of text spanning at most max_length subwords with special tokens
+        """
+        tokenizer = self.bert_model.tokenizer
+        limit = self.max_length - tokenizer.num_special_tokens_to_add(pair=False)
+        with self._model_lock:
+            offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)['offset_mapping']
+        if len(offsets) <= limit:
+            return text
+        
+        aspect_tokens = [
+            i for i, (start, end) in enumerate(offsets) if start < aspect_end and end > aspect_start
+        ] or [len(offsets) // 2]
+        first, last = aspect_tokens[0], aspect_tokens[-1] + 1
+        if last - first >= limit:
+            begin = first  # the aspect alone fills the budget; keep its start
+        else:
+            begin = min(max(0, (first + last) // 2 - limit // 2), len(offsets) - limit)
+        end = begin + limit
+        
+        # A slice can tokenize longer than its tokens did in context, e.g. byte-level
+        # BPE loses the leading-space token of the first word, so shrink it until it fits
+        while True:
+            piece = text[offsets[begin][0]:offsets[end - 1][1]]
+            with self._model_lock:
+                excess = len(tokenizer(piece, add_special_tokens=False)['input_ids']) - limit
+            if excess <= 0 or end - begin <= 1:
+                return piece
+            for _ in range(min(excess, end - begin - 1)):
+                if end - last > first - begin or begin >= first:
+                    end -= 1
+                else:
+                    begin += 1
     
     def _extract_bert_probabilities(self, bert_results: dict) -> list[float]:   
         """
@@ -206,6 +800,68 @@ class AspectSentimentAnalyzer:
         else:
             return "neutral", final_confidence
         
+    def _weighted_sentiment_batch(self, bert_probs: np.ndarray, vader_scores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized _weighted_sentiment over many aspects at once.
+        
+        Performs the same float64 operations in the same order as the scalar
+        implementation, so labels and confidences are bit-for-bit identical.
+        
+        Args:
+            bert_probs (np.ndarray): (N, 3) BERT probabilities [negative, neutral, positive]
+            vader_scores (np.ndarray): (N,) VADER compound sentiment scores (-1 to 1)
+            
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (N,) sentiment labels and (N,) confidence scores
+        """
+        bert_sentiment_scores = (
+            -1 * bert_probs[:, 0] +   # negative
+             0 * bert_probs[:, 1] +   # neutral
+             1 * bert_probs[:, 2]     # positive
+        )
+        bert_confidences = np.max(bert_probs, axis=1)
+        vader_confidences = np.abs(vader_scores)
+        total_confidences = bert_confidences + vader_confidences
+        
+        has_confidence = total_confidences > 0
+        bert_weights = np.divide(
+            bert_confidences, total_confidences, out=np.full_like(total_confidences, 0.5), where=has_confidence
+        )
+        vader_weights = np.divide(
+            vader_confidences, total_confidences, out=np.full_like(total_confidences, 0.5), where=has_confidence
+        )
+        
+        combined_scores = (bert_weights * bert_sentiment_scores) + (vader_weights * vader_scores)
+        
+        agreement_factors = self._calculate_agreement_batch(bert_sentiment_scores, vader_scores)
+        final_confidences = agreement_factors * np.maximum(bert_confidences, vader_confidences)
+        
+        labels = np.where(
+            combined_scores > self.threshold, "positive",
+            np.where(combined_scores < -self.threshold, "negative", "neutral")
+        )
+        return labels, final_confidences
+    
+    def _vader_sentiment(self, vader_score: float) -> tuple[str, float]:
+        """
+        Classify sentiment from the VADER compound score alone.
+        
+        Used when BERT is skipped. Polar scores report their magnitude as the
+        confidence; neutral scores report how close they are to zero.
+        
+        Args:
+            vader_score (float): VADER compound sentiment score (-1 to 1)
+            
+        Returns:
+            tuple[str, float]: Sentiment label and confidence score
+        """
+        if vader_score > self.threshold:
+            return "positive", abs(vader_score)
+        elif vader_score < -self.threshold:
+            return "negative", abs(vader_score)
+        else:
+            return "neutral", 1.0 - abs(vader_score)
+        
     def _calculate_agreement(self, bert_score: float, vader_score: float) -> float:
         """
         Calculate agreement factor between BERT and VADER predictions.
@@ -226,3 +882,18 @@ class AspectSentimentAnalyzer:
             return 1.0  # both neutral
         else:
             return 0.5  # disagreement
+    
+    def _calculate_agreement_batch(self, bert_scores: np.ndarray, vader_scores: np.ndarray) -> np.ndarray:
+        """
+        Vectorized _calculate_agreement over many aspects at once.
+        
+        Args:
+            bert_scores (np.ndarray): (N,) BERT sentiment scores (-1 to 1)
+            vader_scores (np.ndarray): (N,) VADER sentiment scores (-1 to 1)
+            
+        Returns:
+            np.ndarray: (N,) agreement factors (1.0 for agreement, 0.5 for disagreement)
+        """
+        same_polarity = ((bert_scores > 0) & (vader_scores > 0)) | ((bert_scores < 0) & (vader_scores < 0))
+        both_neutral = (np.abs(bert_scores) < self.threshold) & (np.abs(vader_scores) < self.threshold)
+        return np.where(same_polarity | both_neutral, 1.0, 0.5)
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import sys
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAX_BODY_BYTES = 1 << 20
+WARM_UP_TEXT = "the battery is great but the screen is poor"
+
+class InferenceServer:
+    """
+    HTTP JSON server that keeps a loaded pipeline in memory and batches requests.
+
+    Models are loaded once, in the background, after the server starts
+    listening, so /healthz answers immediately while /readyz reports ready only
+    once the pipeline has been built and warmed up on a sample comment. Analysis
+    requests from the server's threads are submitted to the pipeline's
+    micro-batching scheduler on a dedicated event loop, so concurrent requests
+    share batched forward passes. When the scheduler's queue is full the server
+    answers 503 with a Retry-After header instead of queueing without bound; a
+    batch with more texts than the queue holds is rejected with 413.
+
+    Endpoints:
+        POST /analyze         {"text": "..."} -> flat result of the comment
+        POST /analyze/batch   {"texts": ["...", ...]} -> {"results": [...]}
+        GET  /healthz         200 while the process is alive and loading has not failed
+        GET  /readyz          200 once the models are loaded and warmed up, 503 before
+
+    Attributes:
+        config_file (str): Path to aspect configuration file
+        pipeline_options (dict): Keyword arguments for AspectSentimentPipeline
+        pipeline (AspectSentimentPipeline | None): Loaded pipeline, None until loaded
+        ready (threading.Event): Set once the pipeline is loaded and warmed up
+        load_error (Exception | None): Error raised while loading the pipeline
+        max_body_bytes (int): Largest request body accepted
+        httpd (ThreadingHTTPServer): Underlying HTTP server
+    """
+    def __init__(
+        self,
+        config_file: str,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_body_bytes: int = MAX_BODY_BYTES,
+        **pipeline_options
+    ) -> None:
+        """
+        Bind the HTTP server; models are not loaded until load() or serve_forever().
+
+        Args:
+            config_file (str): Path to aspect configuration file
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 for any free port. Defaults to 8000.
+            max_body_bytes (int, optional): Largest request body accepted. Defaults to 1 MiB.
+            **pipeline_options: Keyword arguments for AspectSentimentPipeline, e.g.
+                                async_batch_size, async_max_wait and async_queue_size
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        self.config_file = config_file
+        self.pipeline_options = pipeline_options
+        self.pipeline = None
+        self.ready = threading.Event()
+        self.load_error = None
+        self.max_body_bytes = max_body_bytes
+        self.httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.app = self
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="marsa-serve-loop", daemon=True)
+        self._loop_thread.start()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """
+        Host and port the server is listening on.
+
+        Returns:
+            tuple[str, int]: Bound host and port
+        """
+        return self.httpd.server_address[:2]
+
+    def load(self) -> None:
+        """
+        Build the pipeline and warm it up, then mark the server ready.
+
+        A failure is kept in load_error and reported by /healthz instead of raised.
+        """
+        from marsa.pipeline import AspectSentimentPipeline
+
+        try:
+            pipeline = AspectSentimentPipeline(self.config_file, **self.pipeline_options)
+            pipeline.process_corpus([WARM_UP_TEXT])
+        except Exception as e:
+            self.load_error = e
+            print(f"Error loading models: {e}", file=sys.stderr)
+            return
+        self.pipeline = pipeline
+        self.ready.set()
+
+    def serve_forever(self) -> None:
+        """
+        Start loading the models in the background and handle requests until shutdown().
+        """
+        threading.Thread(target=self.load, name="marsa-serve-load", daemon=True).start()
+        self.httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        """
+        Stop serve_forever() from another thread, then release the server's resources.
+        """
+        self.httpd.shutdown()
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the listening socket and the pipeline and stop the event loop.
+        """
+        self.httpd.server_close()
+        if self.pipeline is not None:
+            self.pipeline.close()
+            self.pipeline = None
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+
+    def analyze(self, texts: list[str]) -> list[dict]:
+        """
+        Analyze comments through the pipeline's scheduler and wait for the results.
+
+        Args:
+            texts (list[str]): Comments to analyze
+
+        Returns:
+            list[dict]: Flat result for each comment, in order
+
+        Raises:
+            asyncio.QueueFull: If the scheduler's queue cannot take the comments
+        """
+        return asyncio.run_coroutine_threadsafe(self._analyze(texts), self._loop).result()
+
+    async def _analyze(self, texts: list[str]) -> list[dict]:
+        """
+        Submit every comment to the scheduler; on a full queue, withdraw them all.
+
+        Args:
+            texts (list[str]): Comments to analyze
+
+        Returns:
+            list[dict]: Flat result for each comment, in order
+        """
+        from marsa.pipeline import flatten_result
+
+        tasks = [asyncio.ensure_future(self.pipeline.analyze_async(text)) for text in texts]
+        try:
+            results = await asyncio.gather(*tasks)
+        except asyncio.QueueFull:
+            for task in tasks:
+                task.cancel()
+            raise
+        return [flatten_result(text, result) for text, result in zip(texts, results)]
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes requests to the InferenceServer stored on the HTTP server as app.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        app = self.server.app
+        if self.path == "/healthz":
+            if app.load_error is not None:
+                self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'status': "failed", 'error': str(app.load_error)})
+            else:
+                self._send_json(HTTPStatus.OK, {'status': "ok"})
+        elif self.path == "/readyz":
+            if app.ready.is_set():
+                self._send_json(HTTPStatus.OK, {'status': "ready"})
+            else:
+                self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'status': "loading"})
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        app = self.server.app
+        if self.path not in ("/analyze", "/analyze/batch"):
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f"Unknown path: {self.path}"})
+            return
+
+        if self.headers.get('Content-Length') is None:
+            self.close_connection = True
+            self._send_json(HTTPStatus.LENGTH_REQUIRED, {'error': "Content-Length header is required"})
+            return
+        try:
+            length = int(self.headers['Content-Length'])
+            if length < 0:
+                raise ValueError(f"negative length {length}")
+        except ValueError:
+            # The body cannot be framed, so the rest of the connection is unusable
+            self.close_connection = True
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': "Content-Length must be a non-negative integer"})
+            return
+        if length > app.max_body_bytes:
+            self.close_connection = True
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': f"Request body exceeds {app.max_body_bytes} bytes"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': "Request body is not valid JSON"})
+            return
+
+        if self.path == "/analyze":
+            texts = [body.get('text')] if isinstance(body, dict) else [None]
+            if not isinstance(texts[0], str):
+                self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'Expected {"text": "..."}'})
+                return
+        else:
+            texts = body.get('texts') if isinstance(body, dict) else None
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                self._send_json(HTTPStatus.BAD_REQUEST, {'error': 'Expected {"texts": ["...", ...]}'})
+                return
+
+        queue_size = app.pipeline_options.get('async_queue_size', 0)
+        if queue_size and len(texts) > queue_size:
+            # Such a batch could never fit in the queue, so retrying would not help
+            self._send_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                {'error': f"Batch of {len(texts)} texts exceeds the queue size of {queue_size}; split it into smaller batches"}
+            )
+            return
+        if not app.ready.is_set():
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'error': "Models are still loading"}, retry_after=1)
+            return
+        try:
+            results = app.analyze(texts)
+        except asyncio.QueueFull:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {'error': "Request queue is full"}, retry_after=1)
+            return
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"Error during analysis: {e}"})
+            return
+
+        self._send_json(HTTPStatus.OK, results[0] if self.path == "/analyze" else {'results': results})
+
+    def _send_json(self, status: HTTPStatus, payload: dict, retry_after: int | None = None) -> None:
+        """
+        Write a JSON response.
+
+        Args:
+            status (HTTPStatus): Response status
+            payload (dict): JSON-serializable response body
+            retry_after (int | None, optional): Seconds for the Retry-After header. Defaults to None.
+        """
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', "application/json")
+        self.send_header('Content-Length', str(len(body)))
+        if retry_after is not None:
+            self.send_header('Retry-After', str(retry_after))
+        self.end_headers()
+        self.wfile.write(body)
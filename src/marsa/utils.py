@@ -1,9 +1,12 @@
 import emoji
 import re
-import spacy
 import subprocess
 import sys
-from spacy.language import Language
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from spacy.language import Language
 
 def clean_input(text: str) -> str:
     """
@@ -24,7 +27,10 @@ def clean_input(text: str) -> str:
     text = emoji.demojize(text)
     return text.strip()
     
-def require_spacy_model(name: str = "en_core_web_sm") -> Language:
+SPACY_MODES = ("full", "tokenizer", "blank")
+SPACY_COMPONENTS = ("tok2vec", "tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer", "ner")
+
+def require_spacy_model(name: str = "en_core_web_sm", exclude: tuple[str, ...] = ()) -> "Language":
     """
     Load a spaCy language model, downloading if necessary.
     
@@ -34,6 +40,8 @@ def require_spacy_model(name: str = "en_core_web_sm") -> Language:
     Args:
         name (str, optional): Name of the spaCy model to load. 
                             Defaults to "en_core_web_sm".
+        exclude (tuple[str, ...], optional): Names of pipeline components that should
+                                           not be loaded at all. Defaults to ().
         
     Returns:
         Language: Loaded spaCy language processing pipeline
@@ -42,9 +50,78 @@ def require_spacy_model(name: str = "en_core_web_sm") -> Language:
         subprocess.CalledProcessError: If model download fails
         OSError: If model cannot be loaded after download attempt
     """
+    import spacy
+
     try:
-        return spacy.load(name)
+        return spacy.load(name, exclude=list(exclude))
     except OSError:
         print(f"Downloading spaCy model: {name}...")
         subprocess.run([sys.executable, "-m", "spacy", "download", name], check=True)
-        return spacy.load(name)
+        return spacy.load(name, exclude=list(exclude))
+
+def load_local_spacy_model(model_dir: str | Path, name: str = "en_core_web_sm", exclude: tuple[str, ...] = ()) -> "Language":
+    """
+    Load a spaCy model from a provisioned model directory without any download attempt.
+    
+    Args:
+        model_dir (str | Path): Root of a model directory populated by `marsa models fetch`
+        name (str, optional): Name of the spaCy model to load. 
+                            Defaults to "en_core_web_sm".
+        exclude (tuple[str, ...], optional): Names of pipeline components that should
+                                           not be loaded at all. Defaults to ().
+        
+    Returns:
+        Language: Loaded spaCy language processing pipeline
+        
+    Raises:
+        FileNotFoundError: If the model is not present in model_dir
+    """
+    import spacy
+    from marsa.provision import spacy_model_path
+
+    path = spacy_model_path(model_dir, name)
+    if not path.is_dir():
+        raise FileNotFoundError(
+            f"spaCy model {name} not found in {model_dir}; run `marsa models fetch --dir {model_dir}`"
+        )
+    return spacy.load(path, exclude=list(exclude))
+
+def load_spacy_pipeline(name: str = "en_core_web_sm", mode: str = "tokenizer", model_dir: str | Path | None = None) -> "Language":
+    """
+    Load a spaCy pipeline for the requested processing mode.
+    
+    Aspect matching and context extraction only need tokens, so the lighter modes
+    skip the statistical components entirely rather than loading and disabling them:
+    
+    - "full": the complete model (tagger, parser, NER, ...)
+    - "tokenizer": the model's tokenizer and vocab with every component excluded
+    - "blank": a blank pipeline for the model's language, no download required
+    
+    Args:
+        name (str, optional): Name of the spaCy model to load. 
+                            Defaults to "en_core_web_sm".
+        mode (str, optional): One of "full", "tokenizer" or "blank". 
+                            Defaults to "tokenizer".
+        model_dir (str | Path | None, optional): Provisioned model directory to load from 
+                                              instead of the installed package, with no 
+                                              download fallback. Defaults to None.
+        
+    Returns:
+        Language: Loaded spaCy language processing pipeline
+        
+    Raises:
+        ValueError: If mode is not a supported processing mode
+        FileNotFoundError: If model_dir is given but does not contain the model
+        OSError: If model cannot be loaded after download attempt
+    """
+    if mode in ("full", "tokenizer"):
+        exclude = SPACY_COMPONENTS if mode == "tokenizer" else ()
+        if model_dir is not None:
+            return load_local_spacy_model(model_dir, name, exclude=exclude)
+        return require_spacy_model(name, exclude=exclude)
+    elif mode == "blank":
+        import spacy
+
+        return spacy.blank(name.split("_")[0])
+    else:
+        raise ValueError(f"Unsupported spaCy mode: {mode}; expected 'full', 'tokenizer' or 'blank'")
@@ -26,4 +26,30 @@ class TestCLIIntegration:
         ], capture_output=True, text=True)
         
         assert result.returncode == 0
-        assert "analyze-text" in result.stdout or "text" in result.stdout
\ No newline at end of file
+        assert "analyze-text" in result.stdout or "text" in result.stdout
+    
+    def test_analyze_file_batching_options(self):
+        result = subprocess.run([
+            sys.executable, "-m", "marsa", "analyze-file", "--help"
+        ], capture_output=True, text=True)
+        
+        assert result.returncode == 0
+        assert "--batch-size" in result.stdout
+        assert "--n-process" in result.stdout
+    
+    def test_models_verify_missing_directory(self, tmp_path):
+        result = subprocess.run([
+            sys.executable, "-m", "marsa", "models", "verify", "--dir", str(tmp_path)
+        ], capture_output=True, text=True)
+        
+        assert result.returncode == 1
+        assert "manifest.json" in result.stdout
+        assert "marsa models fetch" in result.stdout
+    
+    def test_analyze_text_model_dir_option(self):
+        result = subprocess.run([
+            sys.executable, "-m", "marsa", "analyze-text", "--help"
+        ], capture_output=True, text=True)
+        
+        assert result.returncode == 0
+        assert "--model-dir" in result.stdout
@@ -0,0 +1,49 @@
+import torch
+from pathlib import Path
+from transformers import BertTokenizerFast, RobertaConfig, RobertaForSequenceClassification
+
+TINY_VOCAB = [
+    "[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]",
+    "the", "camera", "is", "great", "battery", "poor", "screen", "love", "hate",
+    "but", "and", "life", "a", "sample", "review"
+]
+
+def make_tiny_sentiment_model(path: Path) -> Path:
+    """
+    Save a small randomly initialized roberta sentiment classifier for offline tests.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "vocab.txt").write_text("\n".join(TINY_VOCAB))
+    tokenizer = BertTokenizerFast(vocab_file=str(path / "vocab.txt"))
+    
+    torch.manual_seed(0)
+    config = RobertaConfig(
+        vocab_size=len(TINY_VOCAB),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=64,
+        type_vocab_size=1,
+        pad_token_id=0,
+        num_labels=3,
+        id2label={0: "negative", 1: "neutral", 2: "positive"},
+        label2id={"negative": 0, "neutral": 1, "positive": 2}
+    )
+    RobertaForSequenceClassification(config).save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return path
+
+def make_tiny_bpe_tokenizer():
+    """
+    Train a small byte-level BPE tokenizer, the scheme roberta uses, for offline tests.
+    """
+    from tokenizers import ByteLevelBPETokenizer
+    from transformers import RobertaTokenizerFast
+    
+    tokenizer = ByteLevelBPETokenizer()
+    tokenizer.train_from_iterator(
+        [" ".join(TINY_VOCAB[5:] + ["filler"])] * 50, vocab_size=400, min_frequency=1,
+        special_tokens=["<s>", "<pad>", "</s>", "<unk>", "<mask>"]
+    )
+    return RobertaTokenizerFast(tokenizer_object=tokenizer._tokenizer)
@@ -0,0 +1,224 @@
+import sqlite3
+from marsa.cache import ScoreCache, SQLiteScoreCache
+
+MODEL = "test-model"
+
+# ---------- Regular Tests ----------
+
+def test_score_cache_put_and_get():
+    # Arrange
+    cache = ScoreCache(maxsize=10)
+    value = (0.5, [0.1, 0.2, 0.7])
+    
+    # Act
+    cache.put((MODEL, "the battery life is great"), value)
+    result = cache.get((MODEL, "the battery life is great"))
+    
+    # Assert
+    assert result == value
+    assert len(cache) == 1
+
+def test_score_cache_counts_hits_and_misses():
+    # Arrange
+    cache = ScoreCache(maxsize=10)
+    cache.put((MODEL, "great camera"), (0.6, [0.0, 0.1, 0.9]))
+    
+    # Act
+    cache.get((MODEL, "great camera"))
+    cache.get((MODEL, "great camera"))
+    cache.get((MODEL, "poor battery"))
+    
+    # Assert
+    assert cache.info() == {'hits': 2, 'misses': 1, 'size': 1, 'maxsize': 10}
+
+def test_score_cache_evicts_least_recently_used():
+    # Arrange
+    cache = ScoreCache(maxsize=2)
+    cache.put((MODEL, "first"), (0.1, [0.0, 1.0, 0.0]))
+    cache.put((MODEL, "second"), (0.2, [0.0, 1.0, 0.0]))
+    cache.get((MODEL, "first"))
+    
+    # Act
+    cache.put((MODEL, "third"), (0.3, [0.0, 1.0, 0.0]))
+    
+    # Assert
+    assert len(cache) == 2
+    assert cache.get((MODEL, "first")) is not None
+    assert cache.get((MODEL, "second")) is None
+    assert cache.get((MODEL, "third")) is not None
+
+def test_score_cache_keyed_by_model():
+    # Arrange
+    cache = ScoreCache(maxsize=10)
+    cache.put((MODEL, "great camera"), (0.6, [0.0, 0.1, 0.9]))
+    
+    # Act
+    result = cache.get(("other-model", "great camera"))
+    
+    # Assert
+    assert result is None
+
+def test_sqlite_score_cache_persists_across_instances(tmp_path):
+    # Arrange
+    path = tmp_path / "scores.db"
+    value = (0.5, [0.1, 0.2, 0.7])
+    first = SQLiteScoreCache(path)
+    first.put((MODEL, "the battery life is great"), value)
+    first.close()
+    
+    # Act
+    second = SQLiteScoreCache(path)
+    result = second.get((MODEL, "the battery life is great"))
+    
+    # Assert
+    assert result == value
+    assert second.info()['hits'] == 1
+    assert len(second) == 1
+
+def test_sqlite_score_cache_get_many(tmp_path):
+    # Arrange
+    cache = SQLiteScoreCache(tmp_path / "scores.db")
+    cache.put_many({
+        (MODEL, "great camera"): (0.6, [0.0, 0.1, 0.9]),
+        (MODEL, "poor battery"): (-0.5, [0.8, 0.1, 0.1])
+    })
+    
+    # Act
+    found = cache.get_many([(MODEL, "great camera"), (MODEL, "poor battery"), (MODEL, "dim screen")])
+    
+    # Assert
+    assert found == {
+        (MODEL, "great camera"): (0.6, [0.0, 0.1, 0.9]),
+        (MODEL, "poor battery"): (-0.5, [0.8, 0.1, 0.1])
+    }
+    assert cache.info()['hits'] == 2
+    assert cache.info()['misses'] == 1
+
+def test_sqlite_score_cache_keyed_by_model(tmp_path):
+    # Arrange
+    cache = SQLiteScoreCache(tmp_path / "scores.db")
+    cache.put((MODEL, "great camera"), (0.6, [0.0, 0.1, 0.9]))
+    
+    # Act
+    result = cache.get(("other-model", "great camera"))
+    
+    # Assert
+    assert result is None
+
+def test_sqlite_score_cache_uses_wal_mode(tmp_path):
+    # Arrange
+    path = tmp_path / "scores.db"
+    SQLiteScoreCache(path)
+    
+    # Act
+    mode = sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0]
+    
+    # Assert
+    assert mode == "wal"
+
+def test_sqlite_score_cache_evicts_least_recently_used(tmp_path):
+    # Arrange
+    cache = SQLiteScoreCache(tmp_path / "scores.db", max_entries=2)
+    cache.put((MODEL, "first"), (0.1, [0.0, 1.0, 0.0]))
+    cache.put((MODEL, "second"), (0.2, [0.0, 1.0, 0.0]))
+    cache.get((MODEL, "first"))
+    
+    # Act
+    cache.put((MODEL, "third"), (0.3, [0.0, 1.0, 0.0]))
+    
+    # Assert
+    assert len(cache) == 2
+    assert cache.get((MODEL, "first")) is not None
+    assert cache.get((MODEL, "second")) is None
+    assert cache.get((MODEL, "third")) is not None
+
+def test_sqlite_score_cache_lookups_do_not_write(tmp_path):
+    # Arrange
+    path = tmp_path / "scores.db"
+    cache = SQLiteScoreCache(path)
+    cache.put((MODEL, "great camera"), (0.6, [0.0, 0.1, 0.9]))
+    observer = sqlite3.connect(path)
+    version = observer.execute("PRAGMA data_version").fetchone()[0]
+    
+    # Act
+    cache.get((MODEL, "great camera"))
+    cache.get((MODEL, "poor battery"))
+    
+    # Assert
+    assert observer.execute("PRAGMA data_version").fetchone()[0] == version
+
+def test_sqlite_score_cache_stores_access_times_on_close(tmp_path):
+    # Arrange
+    path = tmp_path / "scores.db"
+    cache = SQLiteScoreCache(path)
+    cache.put((MODEL, "great camera"), (0.6, [0.0, 0.1, 0.9]))
+    (written,) = sqlite3.connect(path).execute("SELECT accessed FROM scores").fetchone()
+    cache.get((MODEL, "great camera"))
+    
+    # Act
+    cache.close()
+    
+    # Assert
+    (accessed,) = sqlite3.connect(path).execute("SELECT accessed FROM scores").fetchone()
+    assert accessed > written
+
+def test_sqlite_score_cache_stays_within_max_entries(tmp_path):
+    # Arrange
+    cache = SQLiteScoreCache(tmp_path / "scores.db", max_entries=200)
+    
+    # Act
+    for start in range(0, 1000, 50):
+        cache.put_many({(MODEL, f"context {i}"): (0.1, [0.0, 1.0, 0.0]) for i in range(start, start + 50)})
+    
+    # Assert
+    assert len(cache) <= 200
+    assert cache.get((MODEL, "context 999")) is not None
+    assert cache.get((MODEL, "context 0")) is None
+
+# ---------- Edge Cases ----------
+
+def test_score_cache_clear_resets_counters():
+    # Arrange
+    cache = ScoreCache(maxsize=10)
+    cache.put((MODEL, "great camera"), (0.6, [0.0, 0.1, 0.9]))
+    cache.get((MODEL, "great camera"))
+    
+    # Act
+    cache.clear()
+    
+    # Assert
+    assert len(cache) == 0
+    assert cache.info() == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 10}
+
+def test_score_cache_empty_is_usable():
+    # Arrange
+    cache = ScoreCache(maxsize=1)
+    
+    # Act
+    result = cache.get((MODEL, ""))
+    
+    # Assert
+    assert result is None
+    assert cache.misses == 1
+
+def test_sqlite_score_cache_clear(tmp_path):
+    # Arrange
+    cache = SQLiteScoreCache(tmp_path / "scores.db")
+    cache.put((MODEL, "great camera"), (0.6, [0.0, 0.1, 0.9]))
+    
+    # Act
+    cache.clear()
+    
+    # Assert
+    assert len(cache) == 0
+    assert cache.get((MODEL, "great camera")) is None
+
+def test_sqlite_score_cache_creates_parent_directory(tmp_path):
+    # Arrange
+    path = tmp_path / "nested" / "dir" / "scores.db"
+    
+    # Act
+    SQLiteScoreCache(path)
+    
+    # Assert
+    assert path.exists()
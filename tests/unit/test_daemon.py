@@ -0,0 +1,252 @@
+import os
+import pytest
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from marsa.__main__ import analyze_with_daemon
+import marsa.daemon
+from marsa.daemon import AnalysisDaemon, default_socket_path, is_running, request
+from marsa.pipeline import AspectSentimentPipeline
+
+# VADER scoring with a blank tokenizer needs no model downloads
+OPTIONS = {'matcher_mode': "blank", 'sentiment_mode': "vader"}
+
+# ---------- Setup and Fixtures ----------
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about 100 characters, too short for tmp_path
+    directory = tempfile.mkdtemp(prefix="marsa-")
+    yield os.path.join(directory, "daemon.sock")
+    shutil.rmtree(directory)
+
+def start(daemon: AnalysisDaemon) -> threading.Thread:
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+def analyze(text: str, socket_path: str, config: str = "tests/fixtures/config.yaml") -> dict:
+    return request({'command': "analyze", 'text': text, 'config': os.path.abspath(config), 'options': OPTIONS}, socket_path)
+
+# ---------- Regular Tests ----------
+
+def test_daemon_results_match_pipeline(socket_path):
+    # Arrange
+    daemon = AnalysisDaemon(socket_path)
+    thread = start(daemon)
+    expected = AspectSentimentPipeline("tests/fixtures/config.yaml", **OPTIONS).process_corpus_flat(["I love the camera but hate the battery"])
+    
+    # Act
+    first = analyze("I love the camera but hate the battery", socket_path)
+    second = analyze("I love the camera but hate the battery", socket_path)
+    status = request({'command': "status"}, socket_path)
+    request({'command': "stop"}, socket_path)
+    thread.join(timeout=10)
+    
+    # Assert
+    assert first == second == {'result': expected[0]}
+    assert status['pid'] == os.getpid()
+    assert status['pipelines'] == 1
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
+
+def test_daemon_reloads_edited_config(socket_path):
+    # Arrange
+    config = os.path.join(os.path.dirname(socket_path), "config.yaml")
+    shutil.copy("tests/fixtures/config.yaml", config)
+    daemon = AnalysisDaemon(socket_path)
+    thread = start(daemon)
+    
+    # Act
+    before = analyze("the speaker is loud", socket_path, config)
+    with open(config, "a") as fp:
+        fp.write('\n    audio:\n        phrases: ["speaker"]\n        category: "hardware"\n')
+    os.utime(config, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    after = analyze("the speaker is loud", socket_path, config)
+    daemon.stop()
+    thread.join(timeout=10)
+    
+    # Assert
+    assert before['result']['aspects_found'] == 0
+    assert after['result']['aspects_found'] == 1
+
+def test_daemon_exits_after_idle_timeout(socket_path):
+    # Arrange
+    daemon = AnalysisDaemon(socket_path, idle_timeout=0.5)
+    thread = start(daemon)
+    
+    # Act
+    running = is_running(socket_path)
+    thread.join(timeout=10)
+    
+    # Assert
+    assert running
+    assert not thread.is_alive()
+    assert not is_running(socket_path)
+    assert not os.path.exists(socket_path)
+
+def test_cli_forwards_to_daemon(socket_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv('MARSA_DAEMON_SOCKET', socket_path)
+    daemon = AnalysisDaemon(socket_path)
+    thread = start(daemon)
+    
+    # Act
+    results = analyze_with_daemon("Poor battery", "tests/fixtures/config.yaml", OPTIONS)
+    daemon.stop()
+    thread.join(timeout=10)
+    
+    # Assert
+    assert results[0]['aspect_sentiments'][0]['aspect'] == "battery"
+    assert results[0]['aspect_sentiments'][0]['sentiment'] == "negative"
+
+def test_socket_is_private_to_user(socket_path):
+    # Arrange & Act
+    daemon = AnalysisDaemon(socket_path)
+    mode = os.stat(socket_path).st_mode & 0o777
+    daemon.close()
+    
+    # Assert
+    assert mode & 0o077 == 0
+
+def test_default_socket_is_in_private_directory(socket_path, monkeypatch):
+    # Arrange
+    monkeypatch.delenv('MARSA_DAEMON_SOCKET', raising=False)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', os.path.dirname(socket_path))
+    
+    # Act
+    daemon = AnalysisDaemon()
+    directory = os.path.dirname(daemon.socket_path)
+    mode = os.stat(directory).st_mode & 0o777
+    daemon.close()
+    
+    # Assert
+    assert daemon.socket_path == default_socket_path()
+    assert os.path.dirname(directory) == os.path.dirname(socket_path)
+    assert mode == 0o700
+
+# ---------- Edge Cases ----------
+
+def test_client_refuses_socket_of_other_user(socket_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv('MARSA_DAEMON_SOCKET', socket_path)
+    daemon = AnalysisDaemon(socket_path)
+    thread = start(daemon)
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+    
+    # Act & Assert
+    with pytest.raises(PermissionError):
+        request({'command': "status"}, socket_path)
+    assert analyze_with_daemon("Poor battery", "tests/fixtures/config.yaml", OPTIONS) is None
+    monkeypatch.setattr(os, "getuid", lambda: uid)
+    daemon.stop()
+    thread.join(timeout=10)
+
+def test_daemon_skipped_without_unix_sockets(socket_path, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(marsa.daemon, "SUPPORTED", False)
+    monkeypatch.setenv('MARSA_DAEMON_SOCKET', socket_path)
+    
+    # Act & Assert
+    assert analyze_with_daemon("Poor battery", "tests/fixtures/config.yaml", OPTIONS) is None
+    with pytest.raises(OSError, match="not support"):
+        AnalysisDaemon(socket_path)
+
+def test_cli_falls_back_without_daemon(socket_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv('MARSA_DAEMON_SOCKET', socket_path)
+    
+    # Act & Assert
+    assert analyze_with_daemon("Poor battery", "tests/fixtures/config.yaml", OPTIONS) is None
+
+def test_cli_reports_daemon_errors(socket_path, monkeypatch):
+    # Arrange
+    monkeypatch.setenv('MARSA_DAEMON_SOCKET', socket_path)
+    daemon = AnalysisDaemon(socket_path)
+    thread = start(daemon)
+    
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="Unsupported sentiment mode"):
+        analyze_with_daemon("Poor battery", "tests/fixtures/config.yaml", {**OPTIONS, 'sentiment_mode': "unknown"})
+    daemon.stop()
+    thread.join(timeout=10)
+
+def test_daemon_replaces_stale_socket(socket_path):
+    # Arrange
+    with open(socket_path, "w"):
+        pass
+    
+    # Act
+    daemon = AnalysisDaemon(socket_path)
+    thread = start(daemon)
+    running = is_running(socket_path)
+    daemon.stop()
+    thread.join(timeout=10)
+    
+    # Assert
+    assert running
+
+def test_second_daemon_is_rejected(socket_path):
+    # Arrange
+    daemon = AnalysisDaemon(socket_path)
+    thread = start(daemon)
+    
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="already running"):
+        AnalysisDaemon(socket_path)
+    daemon.stop()
+    thread.join(timeout=10)
+
+def test_daemon_rejects_invalid_requests(socket_path):
+    # Arrange
+    daemon = AnalysisDaemon(socket_path)
+    thread = start(daemon)
+    
+    # Act
+    unknown = request({'command': "reload"}, socket_path)
+    missing_text = request({'command': "analyze", 'config': "tests/fixtures/config.yaml"}, socket_path)
+    daemon.stop()
+    thread.join(timeout=10)
+    
+    # Assert
+    assert "Unknown command" in unknown['error']
+    assert "text" in missing_text['error']
+
+def test_evicted_pipeline_stays_open_while_in_use(socket_path, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(marsa.daemon, "MAX_PIPELINES", 1)
+    other_config = os.path.join(os.path.dirname(socket_path), "config.yaml")
+    shutil.copy("tests/fixtures/config.yaml", other_config)
+    daemon = AnalysisDaemon(socket_path)
+    entry = daemon._pipeline("tests/fixtures/config.yaml", OPTIONS)
+    
+    # Act
+    daemon._release(daemon._pipeline(other_config, OPTIONS))  # evicts the entry in use
+    results = entry.pipeline.process_corpus_flat(["Poor battery"])
+    daemon._release(entry)
+    daemon.close()
+    
+    # Assert
+    assert results[0]['aspects_found'] == 1
+    assert entry.evicted
+    assert entry.pipeline.sentiment_analyzer.vader_analyzer is None
+
+def test_daemon_rejects_invalid_idle_timeout(socket_path):
+    # Act & Assert
+    with pytest.raises(ValueError):
+        AnalysisDaemon(socket_path, idle_timeout=0)
+
+def test_cli_daemon_status_when_not_running(socket_path):
+    # Arrange
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path), 'MARSA_DAEMON_SOCKET': socket_path}
+    
+    # Act
+    result = subprocess.run([sys.executable, "-m", "marsa", "daemon", "status"], capture_output=True, text=True, env=env)
+    
+    # Assert
+    assert result.returncode == 1
+    assert "not running" in result.stdout
@@ -1,6 +1,7 @@
 import pytest
 import json
 import pandas as pd
+from marsa import export
 from marsa.export import export_for_review
 from tests.fixtures.constants import SAMPLE_RESULTS
 
@@ -98,6 +99,29 @@ def test_export_csv_with_uppercase_extension(tmp_path):
     df = pd.read_csv(output_file)
     assert len(df) == 3
 
+def test_export_json_from_generator(tmp_path):
+    # Arrange
+    output_file = tmp_path / "streamed.json"
+    
+    # Act
+    export_for_review((result for result in SAMPLE_RESULTS), str(output_file))
+    
+    # Assert
+    assert output_file.read_text() == json.dumps(SAMPLE_RESULTS, indent=2)
+
+def test_export_csv_in_chunks(tmp_path, monkeypatch):
+    # Arrange
+    chunked_file = tmp_path / "chunked.csv"
+    single_file = tmp_path / "single.csv"
+    export_for_review(SAMPLE_RESULTS, str(single_file))
+    monkeypatch.setattr(export, "CSV_CHUNK_SIZE", 1)
+    
+    # Act
+    export_for_review(iter(SAMPLE_RESULTS), str(chunked_file))
+    
+    # Assert
+    assert chunked_file.read_text() == single_file.read_text()
+
 # ---------- Edge Case Tests ----------
 
 def test_export_empty_results_json(tmp_path):
@@ -1,5 +1,6 @@
 from marsa.config import AspectConfig, AspectData
-from marsa.matching import match_aspect_phrases, AspectMatch
+from marsa.matching import match_aspect_phrases, AspectMatch, AspectMatcher
+from marsa.registry import MODEL_REGISTRY
 from tests.fixtures.constants import ASPECT_CONFIG
 
 # ---------- Regular Tests ----------
@@ -47,6 +48,19 @@ def test_match_aspect_phrases_returns_doc():
     assert hasattr(doc, 'text')
     assert doc.text == text
     assert len(doc) > 0
+    assert len(list(doc.sents)) == 1
+    assert doc[1].pos_ == "VERB"
+
+def test_match_aspect_phrases_blank_mode():
+    # Arrange
+    text = "I love the camera but hate the battery life"
+    
+    # Act
+    aspects, doc = match_aspect_phrases(text, ASPECT_CONFIG, mode="blank")
+    
+    # Assert
+    assert {aspect.text for aspect in aspects} >= {"camera", "battery"}
+    assert doc.text == text
 
 def test_match_aspect_phrases_no_matches():
     # Arrange
@@ -158,6 +172,102 @@ def test_match_aspect_phrases_mixed_phrases_and_names():
     assert battery_match.aspect == "battery" 
     assert display_match.aspect == "screen"
 
+def test_aspect_matcher_builds_phrase_map():
+    # Arrange & Act
+    matcher = AspectMatcher(ASPECT_CONFIG)
+    
+    # Assert
+    assert matcher.phrase_to_aspect["photo"] == "camera"
+    assert matcher.phrase_to_aspect["juice"] == "battery"
+    assert matcher.phrase_to_aspect["display"] == "screen"
+    assert len(matcher.matcher) == 1
+
+def test_aspect_matcher_reused_across_texts():
+    # Arrange
+    matcher = AspectMatcher(ASPECT_CONFIG)
+    texts = [
+        "I love the camera but hate the battery life",
+        "The display is too dim",
+        "Nothing relevant here"
+    ]
+    
+    # Act
+    results = [matcher.match(text) for text in texts]
+    
+    # Assert
+    assert [len(aspects) for aspects, _ in results] == [2, 1, 0]
+    assert [doc.text for _, doc in results] == texts
+    assert all(doc.vocab is matcher.nlp.vocab for _, doc in results)
+
+def test_aspect_matcher_matches_function_output():
+    # Arrange
+    matcher = AspectMatcher(ASPECT_CONFIG)
+    text = "The camera, battery, and display work well!"
+    
+    # Act
+    matcher_aspects, _ = matcher.match(text)
+    function_aspects, _ = match_aspect_phrases(text, ASPECT_CONFIG)
+    
+    # Assert
+    assert matcher_aspects == function_aspects
+
+def test_aspect_matcher_pipe_preserves_order():
+    # Arrange
+    matcher = AspectMatcher(ASPECT_CONFIG)
+    texts = [
+        "The display is too dim",
+        "I love the camera but hate the battery life",
+        "",
+        "Nothing relevant here"
+    ]
+    
+    # Act
+    piped = list(matcher.pipe(texts, batch_size=2))
+    
+    # Assert
+    assert len(piped) == len(texts)
+    for text, (aspects, doc) in zip(texts, piped):
+        expected_aspects, _ = matcher.match(text)
+        assert doc.text == text
+        assert aspects == expected_aspects
+
+def test_aspect_matcher_tokenizer_mode_has_no_components():
+    # Arrange & Act
+    matcher = AspectMatcher(ASPECT_CONFIG, mode="tokenizer")
+    
+    # Assert
+    assert matcher.nlp.pipe_names == []
+
+def test_aspect_matcher_modes_produce_same_matches():
+    # Arrange
+    text = "The camera quality is good, but the battery drains and the display is dim"
+    
+    # Act
+    full_aspects, _ = AspectMatcher(ASPECT_CONFIG, mode="full").match(text)
+    tokenizer_aspects, _ = AspectMatcher(ASPECT_CONFIG, mode="tokenizer").match(text)
+    blank_aspects, _ = AspectMatcher(ASPECT_CONFIG, mode="blank").match(text)
+    
+    # Assert
+    assert len(full_aspects) == 3
+    assert tokenizer_aspects == full_aspects
+    assert blank_aspects == full_aspects
+
+def test_aspect_matcher_shares_registered_model():
+    # Arrange
+    first = AspectMatcher(ASPECT_CONFIG, share_models=True)
+    second = AspectMatcher(ASPECT_CONFIG, share_models=True)
+    key = ("spacy", "en_core_web_sm", "tokenizer", None)
+    
+    # Act
+    refs = MODEL_REGISTRY.memory_report()[key]['refs']
+    first.close()
+    second.close()
+    
+    # Assert
+    assert first.nlp is second.nlp
+    assert refs == 2
+    assert key not in MODEL_REGISTRY
+
 # ---------- Edge Cases ----------
 
 def test_match_aspect_phrases_empty_text():
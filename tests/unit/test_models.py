@@ -0,0 +1,135 @@
+import pytest
+from transformers import pipeline
+import torch
+import os
+from marsa.models import OnnxSentimentPipeline, configure_cpu, export_onnx_model, quantize_dynamic_int8
+from tests.fixtures.tiny_model import make_tiny_sentiment_model
+
+onnxruntime = pytest.importorskip("onnxruntime")
+
+TEXTS = [
+    "the camera is great",
+    "poor battery but love the screen and the camera is great",
+    "a"
+]
+
+# ---------- Setup and Fixtures ----------
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    return str(make_tiny_sentiment_model(tmp_path_factory.mktemp("tiny_model")))
+
+@pytest.fixture(scope="module")
+def onnx_cache(tmp_path_factory):
+    return tmp_path_factory.mktemp("onnx")
+
+# ---------- Regular Tests ----------
+
+def test_export_onnx_model_writes_self_contained_directory(tiny_model, tmp_path):
+    # Arrange & Act
+    model_path = export_onnx_model(tiny_model, tmp_path / "export")
+    
+    # Assert
+    assert model_path.name == "model.onnx"
+    assert model_path.exists()
+    assert (tmp_path / "export" / "config.json").exists()
+    assert (tmp_path / "export" / "tokenizer_config.json").exists()
+    assert not list((tmp_path / "export").glob("*.tmp"))
+
+def test_onnx_pipeline_matches_torch_pipeline(tiny_model, onnx_cache):
+    # Arrange
+    torch_model = pipeline("sentiment-analysis", model=tiny_model, top_k=None)
+    onnx_model = OnnxSentimentPipeline(tiny_model, cache_dir=onnx_cache, top_k=None)
+    
+    # Act
+    torch_results = torch_model(TEXTS, batch_size=2)
+    onnx_results = onnx_model(TEXTS, batch_size=2)
+    
+    # Assert
+    assert len(onnx_results) == len(torch_results)
+    for torch_scores, onnx_scores in zip(torch_results, onnx_results):
+        assert [s['label'] for s in onnx_scores] == [s['label'] for s in torch_scores]
+        for torch_score, onnx_score in zip(torch_scores, onnx_scores):
+            assert onnx_score['score'] == pytest.approx(torch_score['score'], abs=1e-4)
+
+def test_onnx_pipeline_top_k_matches_analyzer_format(tiny_model, onnx_cache):
+    # Arrange
+    torch_model = pipeline("sentiment-analysis", model=tiny_model, top_k=True)
+    onnx_model = OnnxSentimentPipeline(tiny_model, cache_dir=onnx_cache, top_k=1)
+    
+    # Act
+    torch_result = torch_model("the camera is great")
+    onnx_result = onnx_model("the camera is great")
+    
+    # Assert
+    assert len(onnx_result) == 1
+    assert len(onnx_result[0]) == 1
+    assert onnx_result[0][0]['label'] == torch_result[0][0]['label']
+
+def test_onnx_pipeline_reuses_cached_export(tiny_model, onnx_cache):
+    # Arrange
+    first = OnnxSentimentPipeline(tiny_model, cache_dir=onnx_cache)
+    modified = first.export_dir.joinpath("model.onnx").stat().st_mtime_ns
+    
+    # Act
+    second = OnnxSentimentPipeline(tiny_model, cache_dir=onnx_cache)
+    
+    # Assert
+    assert second.export_dir == first.export_dir
+    assert second.export_dir.joinpath("model.onnx").stat().st_mtime_ns == modified
+
+def test_quantize_dynamic_int8_replaces_linear_layers(tiny_model):
+    # Arrange
+    torch_model = pipeline("sentiment-analysis", model=tiny_model, top_k=1)
+    expected = [result[0]['label'] for result in torch_model(TEXTS)]
+    
+    # Act
+    torch_model.model = quantize_dynamic_int8(torch_model.model)
+    actual = [result[0]['label'] for result in torch_model(TEXTS)]
+    
+    # Assert
+    assert not any(type(module) is torch.nn.Linear for module in torch_model.model.modules())
+    assert actual == expected
+
+def test_configure_cpu_sets_threads_and_affinity():
+    # Arrange
+    threads = torch.get_num_threads()
+    cores = sorted(os.sched_getaffinity(0))
+    
+    # Act
+    configure_cpu(num_threads=1, cpu_affinity=cores[:1])
+    
+    # Assert
+    try:
+        assert torch.get_num_threads() == 1
+        assert os.sched_getaffinity(0) == {cores[0]}
+    finally:
+        torch.set_num_threads(threads)
+        os.sched_setaffinity(0, cores)
+
+def test_onnx_pipeline_session_threads(tiny_model, onnx_cache):
+    # Arrange & Act
+    onnx_model = OnnxSentimentPipeline(tiny_model, cache_dir=onnx_cache, num_threads=1, num_interop_threads=1)
+    
+    # Assert
+    assert onnx_model.session.get_session_options().intra_op_num_threads == 1
+    assert onnx_model.session.get_session_options().inter_op_num_threads == 1
+
+# ---------- Edge Cases ----------
+
+def test_configure_cpu_rejects_invalid_values():
+    # Act & Assert
+    with pytest.raises(ValueError, match="num_threads"):
+        configure_cpu(num_threads=0)
+    with pytest.raises(ValueError, match="cpu_affinity"):
+        configure_cpu(cpu_affinity=[])
+
+def test_onnx_pipeline_empty_input(tiny_model, onnx_cache):
+    # Arrange
+    onnx_model = OnnxSentimentPipeline(tiny_model, cache_dir=onnx_cache)
+    
+    # Act
+    results = onnx_model([], batch_size=4)
+    
+    # Assert
+    assert results == []
@@ -0,0 +1,268 @@
+import asyncio
+import gc
+import multiprocessing
+import os
+import pytest
+import subprocess
+import sys
+from itertools import count, islice
+from marsa.pipeline import AspectSentimentPipeline, _worker_cpu_settings
+from marsa.provision import sentiment_model_path
+from marsa.registry import MODEL_REGISTRY
+from marsa.sentiment import SENTIMENT_MODEL, AspectSentimentResult
+from tests.fixtures.tiny_model import make_tiny_sentiment_model
+
+# ---------- Setup and Fixtures ----------
+
+@pytest.fixture(scope="module")
+def vader_pipeline():
+    # VADER scoring with a blank tokenizer needs no model downloads
+    return AspectSentimentPipeline(
+        "tests/fixtures/config.yaml", batch_size=4, matcher_mode="blank", sentiment_mode="vader"
+    )
+
+@pytest.fixture(scope="module")
+def parallel_pipeline():
+    pipeline = AspectSentimentPipeline(
+        "tests/fixtures/config.yaml", batch_size=4, matcher_mode="blank", sentiment_mode="vader", workers=2
+    )
+    yield pipeline
+    pipeline.close()
+
+@pytest.fixture
+def comments():
+    return [
+        "I love the camera but hate the battery life",
+        "",
+        "The screen is amazing",
+        "Poor battery",
+        "Great value for money",
+        "The camera is terrible"
+    ] * 3
+
+# ---------- Regular Tests ----------
+
+def test_process_corpus_iter_matches_process_corpus(vader_pipeline, comments):
+    # Act
+    streamed = list(vader_pipeline.process_corpus_iter(iter(comments)))
+    
+    # Assert
+    assert streamed == vader_pipeline.process_corpus(comments)
+    assert all(isinstance(result, AspectSentimentResult) for result in streamed)
+
+def test_process_corpus_flat_iter_matches_process_corpus_flat(vader_pipeline, comments):
+    # Act
+    streamed = list(vader_pipeline.process_corpus_flat_iter(comment for comment in comments))
+    
+    # Assert
+    assert streamed == vader_pipeline.process_corpus_flat(comments)
+    assert [result['original_text'] for result in streamed] == comments
+
+def test_process_corpus_iter_consumes_input_lazily(vader_pipeline):
+    # Arrange
+    read = []
+    
+    def endless_comments():
+        for i in count():
+            read.append(i)
+            yield f"review {i}: the camera is great"
+    
+    # Act
+    first_results = list(islice(vader_pipeline.process_corpus_iter(endless_comments(), batch_size=5), 5))
+    
+    # Assert
+    assert [result.text for result in first_results] == [f"review {i}: the camera is great" for i in range(5)]
+    assert len(read) < 50
+
+def test_process_corpus_iter_batch_size_does_not_change_results(vader_pipeline, comments):
+    # Act
+    single = list(vader_pipeline.process_corpus_iter(comments, batch_size=1))
+    large = list(vader_pipeline.process_corpus_iter(comments, batch_size=100))
+    
+    # Assert
+    assert single == large
+
+def test_parallel_workers_match_single_process(vader_pipeline, parallel_pipeline, comments):
+    # Act
+    parallel = parallel_pipeline.process_corpus_flat(comments * 3)
+    
+    # Assert
+    assert parallel == vader_pipeline.process_corpus_flat(comments * 3)
+    assert parallel_pipeline.sentiment_analyzer.stats.contexts > 0
+
+def test_parallel_workers_load_models_once(parallel_pipeline, comments):
+    # Arrange
+    parallel_pipeline.process_corpus(comments)
+    executor = parallel_pipeline._executor
+    
+    # Act
+    parallel_pipeline.process_corpus(comments)
+    
+    # Assert
+    assert parallel_pipeline._executor is executor
+
+def test_spawn_parent_loads_no_models(parallel_pipeline):
+    # Assert
+    assert parallel_pipeline.matcher is None
+    assert parallel_pipeline.sentiment_analyzer.vader_analyzer is None
+    assert parallel_pipeline.sentiment_analyzer.bert_model is None
+
+def test_worker_cpu_settings_split_affinity():
+    # Arrange
+    options = {'num_threads': None, 'cpu_affinity': [0, 1, 2, 3, 4, 5]}
+    worker_index = multiprocessing.Value('i', 0)
+    
+    # Act
+    settings = [_worker_cpu_settings(options, 3, worker_index) for _ in range(3)]
+    
+    # Assert
+    assert settings == [(2, [0, 1]), (2, [2, 3]), (2, [4, 5])]
+
+def test_worker_cpu_settings_without_affinity():
+    # Arrange
+    options = {'num_threads': None, 'cpu_affinity': None}
+    
+    # Act
+    settings = _worker_cpu_settings(options, 2, multiprocessing.Value('i', 0))
+    
+    # Assert
+    assert settings == (max(1, (os.cpu_count() or 1) // 2), None)
+
+def test_analyze_async_matches_process_corpus(vader_pipeline, comments):
+    # Arrange
+    async def run():
+        return await asyncio.gather(*(vader_pipeline.analyze_async(comment) for comment in comments))
+    
+    # Act
+    results = asyncio.run(run())
+    
+    # Assert
+    assert results == vader_pipeline.process_corpus(comments)
+    assert vader_pipeline.scheduler.batches < len(comments)
+
+def test_fork_workers_match_single_process(vader_pipeline, comments):
+    # Arrange
+    pipeline = AspectSentimentPipeline(
+        "tests/fixtures/config.yaml", batch_size=4, matcher_mode="blank", sentiment_mode="vader", 
+        workers=2, worker_start="fork"
+    )
+    
+    # Act
+    results = pipeline.process_corpus_flat(comments * 3)
+    freeze_count = gc.get_freeze_count()
+    pipeline.close()
+    
+    # Assert
+    assert results == vader_pipeline.process_corpus_flat(comments * 3)
+    assert freeze_count == 0
+    assert pipeline.sentiment_analyzer.stats.contexts == sum(result['aspects_found'] for result in results)
+
+def test_fork_workers_reuse_parent_models(tmp_path, comments):
+    # Arrange
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(open("tests/fixtures/config.yaml").read())
+    pipeline = AspectSentimentPipeline(
+        str(config_file), batch_size=4, matcher_mode="blank", sentiment_mode="vader", 
+        workers=2, worker_start="fork"
+    )
+    config_file.unlink()  # a worker that rebuilt the pipeline could not read its config
+    
+    # Act
+    results = pipeline.process_corpus(comments)
+    pipeline.close()
+    
+    # Assert
+    assert len(results) == len(comments)
+
+def test_fork_workers_run_torch_model_on_several_threads(tmp_path):
+    # Arrange
+    make_tiny_sentiment_model(sentiment_model_path(tmp_path, SENTIMENT_MODEL))
+    # Run in a child interpreter: workers that inherit an OpenMP thread team hang forever
+    script = (
+        "import torch\n"
+        "from marsa.pipeline import AspectSentimentPipeline\n"
+        "torch.set_num_threads(2)\n"
+        f"pipeline = AspectSentimentPipeline('tests/fixtures/config.yaml', matcher_mode='blank', model_dir={str(tmp_path)!r}, "
+        "max_length=32, num_threads=2, workers=2, worker_start='fork')\n"
+        "results = pipeline.process_corpus(['I love the camera but hate the battery life', 'Poor battery'] * 4)\n"
+        "print(len(results), torch.get_num_threads())\n"
+        "pipeline.close()\n"
+    )
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    
+    # Act
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, timeout=120)
+    
+    # Assert
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["8", "2"]
+
+# ---------- Edge Cases ----------
+
+def test_parallel_worker_error_names_failing_comment(parallel_pipeline):
+    # Arrange
+    comments = ["the camera is great"] * 5 + [None] + ["poor battery"] * 5
+    
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="comment 6"):
+        parallel_pipeline.process_corpus(comments)
+
+def test_pipeline_invalid_worker_start():
+    # Act & Assert
+    with pytest.raises(ValueError, match="Unsupported worker start method"):
+        AspectSentimentPipeline(
+            "tests/fixtures/config.yaml", matcher_mode="blank", sentiment_mode="vader", workers=2, worker_start="thread"
+        )
+
+def test_pipeline_invalid_workers():
+    # Act & Assert
+    with pytest.raises(ValueError, match="workers must be at least 1"):
+        AspectSentimentPipeline("tests/fixtures/config.yaml", matcher_mode="blank", sentiment_mode="vader", workers=0)
+
+def test_failed_pipeline_releases_shared_models():
+    # Act
+    with pytest.raises(ValueError, match="Unsupported sentiment mode"):
+        AspectSentimentPipeline(
+            "tests/fixtures/config.yaml", matcher_mode="blank", sentiment_mode="unknown", share_models=True
+        )
+    
+    # Assert
+    assert len(MODEL_REGISTRY) == 0
+
+def test_worker_cpu_settings_more_workers_than_cores():
+    # Arrange
+    options = {'num_threads': 4, 'cpu_affinity': [0, 1]}
+    worker_index = multiprocessing.Value('i', 0)
+    
+    # Act
+    settings = [_worker_cpu_settings(options, 3, worker_index) for _ in range(3)]
+    
+    # Assert
+    assert settings == [(4, [0]), (4, [1]), (4, [0])]
+
+def test_spawn_parent_validates_matcher_mode():
+    # Act & Assert
+    with pytest.raises(ValueError, match="Unsupported spaCy mode"):
+        AspectSentimentPipeline("tests/fixtures/config.yaml", matcher_mode="unknown", sentiment_mode="vader", workers=2)
+
+def test_fork_workers_with_empty_config(tmp_path):
+    # Arrange
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("aspects: {}\n")
+    pipeline = AspectSentimentPipeline(
+        str(config_file), matcher_mode="blank", sentiment_mode="vader", workers=2, worker_start="fork"
+    )
+    
+    # Act
+    results = pipeline.process_corpus_flat(["the battery is poor"])
+    pipeline.close()
+    
+    # Assert
+    assert results[0]['aspects_found'] == 0
+
+def test_process_corpus_iter_empty_input(vader_pipeline):
+    # Act
+    results = list(vader_pipeline.process_corpus_iter(iter([])))
+    
+    # Assert
+    assert results == []
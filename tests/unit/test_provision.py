@@ -0,0 +1,114 @@
+import json
+import pytest
+import spacy
+from unittest.mock import patch
+from marsa.provision import fetch_models, verify_models, sentiment_model_path, spacy_model_path, MANIFEST_FILE
+from marsa.utils import load_spacy_pipeline
+from tests.fixtures.tiny_model import make_tiny_sentiment_model
+
+# ---------- Setup and Fixtures ----------
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    return str(make_tiny_sentiment_model(tmp_path_factory.mktemp("tiny_model")))
+
+@pytest.fixture
+def model_dir(tiny_model, tmp_path):
+    with patch('marsa.utils.require_spacy_model', return_value=spacy.blank("en")):
+        fetch_models(tmp_path / "models", sentiment_model=tiny_model)
+    return tmp_path / "models"
+
+# ---------- Regular Tests ----------
+
+def test_fetch_models_writes_layout_and_manifest(model_dir, tiny_model):
+    # Arrange & Act
+    with open(model_dir / MANIFEST_FILE) as f:
+        manifest = json.load(f)
+    
+    # Assert
+    assert spacy_model_path(model_dir).joinpath("config.cfg").exists()
+    assert sentiment_model_path(model_dir, tiny_model).joinpath("config.json").exists()
+    assert set(manifest['models']) == {'spacy', 'sentiment'}
+    assert manifest['files']
+
+def test_verify_models_accepts_fetched_directory(model_dir):
+    # Arrange & Act
+    problems = verify_models(model_dir)
+    
+    # Assert
+    assert problems == []
+
+def test_verify_models_detects_modified_file(model_dir, tiny_model):
+    # Arrange
+    config_path = sentiment_model_path(model_dir, tiny_model) / "config.json"
+    config_path.write_text(config_path.read_text() + " ")
+    
+    # Act
+    problems = verify_models(model_dir)
+    
+    # Assert
+    assert any("Checksum mismatch" in problem and "config.json" in problem for problem in problems)
+
+def test_load_spacy_pipeline_from_model_dir_never_downloads(model_dir):
+    # Arrange
+    with patch('marsa.utils.require_spacy_model') as mock_require:
+        
+        # Act
+        nlp = load_spacy_pipeline("en_core_web_sm", mode="tokenizer", model_dir=model_dir)
+        
+        # Assert
+        mock_require.assert_not_called()
+        assert nlp.pipe_names == []
+        assert [token.text for token in nlp("great camera")] == ["great", "camera"]
+
+def test_analyzer_loads_sentiment_model_from_model_dir(model_dir):
+    # Arrange
+    from marsa.sentiment import AspectSentimentAnalyzer
+    
+    with patch('marsa.sentiment.SENTIMENT_MODEL', "test/model"), \
+         patch('marsa.sentiment.pipeline') as mock_pipeline, \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        sentiment_model_path(model_dir, "test/model").mkdir(parents=True)
+        
+        # Act
+        AspectSentimentAnalyzer(model_dir=str(model_dir))
+        
+        # Assert
+        assert mock_pipeline.call_args.kwargs['model'] == str(sentiment_model_path(model_dir, "test/model"))
+
+# ---------- Edge Cases ----------
+
+def test_verify_models_missing_manifest(tmp_path):
+    # Arrange & Act
+    problems = verify_models(tmp_path)
+    
+    # Assert
+    assert len(problems) == 1
+    assert MANIFEST_FILE in problems[0]
+
+def test_verify_models_detects_missing_file(model_dir, tiny_model):
+    # Arrange
+    (sentiment_model_path(model_dir, tiny_model) / "config.json").unlink()
+    
+    # Act
+    problems = verify_models(model_dir)
+    
+    # Assert
+    assert any("Missing file" in problem for problem in problems)
+
+def test_load_spacy_pipeline_missing_from_model_dir(tmp_path):
+    # Act & Assert
+    with pytest.raises(FileNotFoundError, match="marsa models fetch"):
+        load_spacy_pipeline("en_core_web_sm", mode="tokenizer", model_dir=tmp_path)
+
+def test_analyzer_missing_sentiment_model_in_model_dir(tmp_path):
+    # Arrange
+    from marsa.sentiment import AspectSentimentAnalyzer
+    
+    with patch('marsa.sentiment.pipeline') as mock_pipeline, \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        # Act & Assert
+        with pytest.raises(FileNotFoundError, match="marsa models fetch"):
+            AspectSentimentAnalyzer(model_dir=str(tmp_path))
+        mock_pipeline.assert_not_called()
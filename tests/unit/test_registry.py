@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import Mock
+from marsa.registry import ModelRegistry
+
+# ---------- Regular Tests ----------
+
+def test_registry_loads_each_key_once():
+    # Arrange
+    registry = ModelRegistry()
+    loader = Mock(side_effect=lambda: object())
+    
+    # Act
+    first = registry.acquire(("bert", "model"), loader)
+    second = registry.acquire(("bert", "model"), loader)
+    
+    # Assert
+    assert first is second
+    loader.assert_called_once()
+    assert registry.loads == 1
+    assert registry.memory_report()[("bert", "model")]['refs'] == 2
+
+def test_registry_separates_keys():
+    # Arrange
+    registry = ModelRegistry()
+    
+    # Act
+    first = registry.acquire(("bert", "model:torch"), object)
+    second = registry.acquire(("bert", "model:onnx"), object)
+    
+    # Assert
+    assert first is not second
+    assert len(registry) == 2
+
+def test_registry_unloads_on_last_release():
+    # Arrange
+    registry = ModelRegistry()
+    registry.acquire(("vader",), object)
+    registry.acquire(("vader",), object)
+    
+    # Act
+    registry.release(("vader",))
+    still_loaded = ("vader",) in registry
+    registry.release(("vader",))
+    
+    # Assert
+    assert still_loaded
+    assert ("vader",) not in registry
+    assert registry.memory_report() == {}
+
+def test_registry_reports_weight_bytes():
+    # Arrange
+    registry = ModelRegistry()
+    tensor = Mock()
+    tensor.numel.return_value = 10
+    tensor.element_size.return_value = 4
+    packed = (tensor, tensor)
+    model = Mock()
+    model.model.state_dict.return_value = {'weight': tensor, 'packed': packed, 'dtype': "qint8"}
+    
+    # Act
+    registry.acquire(("bert", "model"), lambda: model)
+    
+    # Assert
+    assert registry.memory_report()[("bert", "model")]['bytes'] == 120
+
+def test_registry_lock_shared_by_all_holders():
+    # Arrange
+    registry = ModelRegistry()
+    registry.acquire(("bert", "model"), object)
+    registry.acquire(("bert", "model"), object)
+    
+    # Act
+    first = registry.lock(("bert", "model"))
+    second = registry.lock(("bert", "model"))
+    
+    # Assert
+    assert first is second
+
+# ---------- Edge Cases ----------
+
+def test_registry_release_unknown_key():
+    # Arrange
+    registry = ModelRegistry()
+    
+    # Act & Assert
+    with pytest.raises(KeyError):
+        registry.release(("spacy", "en_core_web_sm", "tokenizer"))
+
+def test_registry_lock_unknown_key():
+    # Arrange
+    registry = ModelRegistry()
+    
+    # Act & Assert
+    with pytest.raises(KeyError):
+        registry.lock(("bert", "model"))
+
+def test_registry_failed_load_is_not_registered():
+    # Arrange
+    registry = ModelRegistry()
+    loader = Mock(side_effect=OSError("model not found"))
+    
+    # Act
+    with pytest.raises(OSError):
+        registry.acquire(("bert", "missing"), loader)
+    
+    # Assert
+    assert len(registry) == 0
+    assert registry.loads == 0
@@ -0,0 +1,156 @@
+import asyncio
+import pytest
+import threading
+import time
+from marsa.scheduler import MicroBatchScheduler
+
+# ---------- Setup and Fixtures ----------
+
+class RecordingBatch:
+    """
+    Batch function that records the batches it receives and doubles each input.
+    """
+    def __init__(self, delay: float = 0.0) -> None:
+        self.batches = []
+        self.threads = set()
+        self.delay = delay
+    
+    def __call__(self, items: list) -> list:
+        self.batches.append(list(items))
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return [item * 2 for item in items]
+
+# ---------- Regular Tests ----------
+
+def test_scheduler_batches_concurrent_requests():
+    # Arrange
+    process_batch = RecordingBatch()
+    scheduler = MicroBatchScheduler(process_batch, max_batch_size=4, max_wait=0.05)
+    
+    async def run():
+        return await asyncio.gather(*(scheduler.submit(i) for i in range(10)))
+    
+    # Act
+    results = asyncio.run(run())
+    scheduler.close()
+    
+    # Assert
+    assert results == [i * 2 for i in range(10)]
+    assert [len(batch) for batch in process_batch.batches] == [4, 4, 2]
+    assert scheduler.batches == 3
+    assert scheduler.requests == 10
+
+def test_scheduler_runs_batches_off_the_event_loop():
+    # Arrange
+    process_batch = RecordingBatch()
+    scheduler = MicroBatchScheduler(process_batch)
+    
+    # Act
+    asyncio.run(scheduler.submit(1))
+    scheduler.close()
+    
+    # Assert
+    assert threading.get_ident() not in process_batch.threads
+
+def test_scheduler_lone_request_waits_at_most_max_wait():
+    # Arrange
+    scheduler = MicroBatchScheduler(RecordingBatch(), max_batch_size=32, max_wait=0.02)
+    
+    async def run():
+        start = time.perf_counter()
+        await scheduler.submit(1)
+        return time.perf_counter() - start
+    
+    # Act
+    elapsed = asyncio.run(run())
+    scheduler.close()
+    
+    # Assert
+    assert elapsed < 0.5
+
+def test_scheduler_requests_arriving_during_a_batch_form_the_next_batch():
+    # Arrange
+    process_batch = RecordingBatch(delay=0.1)
+    scheduler = MicroBatchScheduler(process_batch, max_batch_size=32, max_wait=0.0)
+    
+    async def run():
+        first = asyncio.ensure_future(scheduler.submit(0))
+        await asyncio.sleep(0.02)  # the first batch is now running
+        rest = await asyncio.gather(*(scheduler.submit(i) for i in range(1, 6)))
+        return [await first] + rest
+    
+    # Act
+    results = asyncio.run(run())
+    scheduler.close()
+    
+    # Assert
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert process_batch.batches == [[0], [1, 2, 3, 4, 5]]
+
+def test_scheduler_works_across_event_loops():
+    # Arrange
+    scheduler = MicroBatchScheduler(RecordingBatch())
+    
+    # Act
+    first = asyncio.run(scheduler.submit(1))
+    second = asyncio.run(scheduler.submit(2))
+    scheduler.close()
+    
+    # Assert
+    assert (first, second) == (2, 4)
+
+# ---------- Edge Cases ----------
+
+def test_scheduler_propagates_batch_errors():
+    # Arrange
+    def failing_batch(items):
+        raise ValueError("model failed")
+    
+    scheduler = MicroBatchScheduler(failing_batch)
+    
+    async def run():
+        return await asyncio.gather(scheduler.submit(1), scheduler.submit(2), return_exceptions=True)
+    
+    # Act
+    results = asyncio.run(run())
+    scheduler.close()
+    
+    # Assert
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_scheduler_rejects_requests_when_queue_full():
+    # Arrange
+    scheduler = MicroBatchScheduler(RecordingBatch(delay=0.1), max_batch_size=1, max_wait=0.0, max_queue_size=2)
+    
+    async def run():
+        running = asyncio.ensure_future(scheduler.submit(0))
+        await asyncio.sleep(0.02)  # the first batch is now running
+        queued = [asyncio.ensure_future(scheduler.submit(i)) for i in (1, 2)]
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.QueueFull):
+            await scheduler.submit(3)
+        return await asyncio.gather(running, *queued)
+    
+    # Act
+    results = asyncio.run(run())
+    scheduler.close()
+    
+    # Assert
+    assert results == [0, 2, 4]
+
+def test_scheduler_closed_rejects_requests():
+    # Arrange
+    scheduler = MicroBatchScheduler(RecordingBatch())
+    scheduler.close()
+    
+    # Act & Assert
+    with pytest.raises(RuntimeError, match="closed"):
+        asyncio.run(scheduler.submit(1))
+
+def test_scheduler_invalid_settings():
+    # Act & Assert
+    with pytest.raises(ValueError, match="max_batch_size"):
+        MicroBatchScheduler(RecordingBatch(), max_batch_size=0)
+    with pytest.raises(ValueError, match="max_wait"):
+        MicroBatchScheduler(RecordingBatch(), max_wait=-1)
@@ -1,7 +1,15 @@
+import numpy as np
 import pytest
+import spacy
+import time
+import torch
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch, MagicMock
 from marsa.sentiment import AspectSentimentAnalyzer, AspectSentiment, AspectSentimentResult
 from marsa.matching import AspectMatch
+from marsa.cache import SQLiteScoreCache
+from marsa.registry import MODEL_REGISTRY
+from tests.fixtures.tiny_model import make_tiny_bpe_tokenizer, make_tiny_sentiment_model
 from tests.fixtures.constants import EXAMPLE_CORPUS, FIRST_ASPECT_MATCH, SECOND_ASPECT_MATCH
 
 # ---------- Setup and Fixtures ----------
@@ -23,11 +31,14 @@ def analyzer():
          patch('marsa.sentiment.SentimentIntensityAnalyzer') as mock_vader:
         
         mock_bert = Mock()
-        mock_bert.return_value = [[
+        mock_bert.side_effect = lambda contexts, **kwargs: [[
             {'label': 'Negative', 'score': 0.1},
             {'label': 'Neutral', 'score': 0.2},
             {'label': 'Positive', 'score': 0.7}
-        ]]
+        ] for _ in contexts]
+        mock_bert.tokenizer.side_effect = lambda contexts, **kwargs: {
+            'input_ids': [context.split() for context in contexts]
+        }
         mock_pipeline.return_value = mock_bert
         
         mock_vader_instance = Mock()
@@ -42,6 +53,12 @@ def analyzer():
         
         return analyzer
 
+@pytest.fixture(scope="module")
+def tiny_tokenizer(tmp_path_factory):
+    from transformers import AutoTokenizer
+    
+    return AutoTokenizer.from_pretrained(make_tiny_sentiment_model(tmp_path_factory.mktemp("tiny_model")))
+
 # ---------- Regular Tests ----------
 
 def test_aspect_sentiment_analyzer_init():
@@ -52,7 +69,9 @@ def test_aspect_sentiment_analyzer_init():
         
         assert analyzer.threshold == 0.05
         assert analyzer.context_window == 3
-        assert analyzer.doc is None
+        assert analyzer.batch_size == 32
+        assert analyzer.score_cache.maxsize == 10000
+        assert not hasattr(analyzer, "doc")
 
 def test_analyze_text_basic(analyzer, mock_doc):
     # Arrange
@@ -77,9 +96,132 @@ def test_analyze_text_basic(analyzer, mock_doc):
         assert isinstance(aspect.confidence, (float, type(None)))
         assert isinstance(aspect.context_used, (str, type(None)))
 
+def test_analyze_text_scores_all_aspects_in_one_call(analyzer, mock_doc):
+    # Arrange
+    text = EXAMPLE_CORPUS[0]
+    aspect_matches = [FIRST_ASPECT_MATCH, SECOND_ASPECT_MATCH]
+    
+    # Act
+    analyzer.analyze_text(text, aspect_matches, mock_doc)
+    
+    # Assert
+    analyzer.bert_model.assert_called_once_with(
+        ["context around aspect"], 
+        batch_size=analyzer.batch_size,
+        truncation=True,
+        max_length=analyzer.max_length
+    )
+
+def test_analyze_batch_maps_scores_back_to_aspects(analyzer):
+    # Arrange
+    mock_doc = MagicMock()
+    mock_doc.__len__.return_value = 10
+    mock_doc.__getitem__.side_effect = lambda span: Mock(text=f"tokens {span.start} to {span.stop}")
+    analyzer.batch_size = 8
+    analyzer.bert_model.side_effect = lambda contexts, **kwargs: [
+        [{'label': 'Positive', 'score': 0.9}] if i % 2 == 0 else [{'label': 'Negative', 'score': 0.9}]
+        for i, _ in enumerate(contexts)
+    ]
+    analyzer.vader_analyzer.polarity_scores.return_value = {'compound': 0.0}
+    items = [
+        ("first text", [FIRST_ASPECT_MATCH, SECOND_ASPECT_MATCH], mock_doc),
+        ("no aspects", [], mock_doc),
+        ("third text", [FIRST_ASPECT_MATCH], mock_doc)
+    ]
+    
+    # Act
+    results = analyzer.analyze_batch(items)
+    
+    # Assert
+    analyzer.bert_model.assert_called_once()
+    assert analyzer.bert_model.call_args.kwargs == {'batch_size': 8, 'truncation': True, 'max_length': 256}
+    assert [result.text for result in results] == ["first text", "no aspects", "third text"]
+    assert [len(result.aspects) for result in results] == [2, 0, 1]
+    assert [aspect.sentiment for aspect in results[0].aspects] == ["positive", "negative"]
+    assert results[2].aspects[0].sentiment == "positive"
+    assert results[2].aspects[0].aspect_match == FIRST_ASPECT_MATCH
+
+def test_bert_probabilities_sorted_by_length(analyzer):
+    # Arrange
+    analyzer.batch_size = 2
+    contexts = ["a much longer context window here", "short", "medium length text", "tiny"]
+    scores = {context: [{'label': 'Positive', 'score': len(context) / 100}] for context in contexts}
+    analyzer.bert_model.side_effect = lambda batch, **kwargs: [scores[context] for context in batch]
+    
+    # Act
+    probs = analyzer._bert_probabilities(contexts)
+    
+    # Assert
+    sent_contexts = analyzer.bert_model.call_args.args[0]
+    assert sent_contexts == ["short", "tiny", "medium length text", "a much longer context window here"]
+    assert [p[2] for p in probs] == [len(context) / 100 for context in contexts]
+
+def test_bert_probabilities_unsorted_when_disabled(analyzer):
+    # Arrange
+    analyzer.batch_size = 2
+    analyzer.sort_by_length = False
+    contexts = ["a much longer context window here", "short", "medium length text"]
+    
+    # Act
+    analyzer._bert_probabilities(contexts)
+    
+    # Assert
+    assert analyzer.bert_model.call_args.args[0] == contexts
+    analyzer.bert_model.tokenizer.assert_not_called()
+
+def test_analyze_batch_reuses_cached_scores(analyzer, mock_doc):
+    # Arrange
+    items = [("first text", [FIRST_ASPECT_MATCH], mock_doc)]
+    analyzer.analyze_batch(items)
+    
+    # Act
+    results = analyzer.analyze_batch(items)
+    
+    # Assert
+    analyzer.bert_model.assert_called_once()
+    assert analyzer.vader_analyzer.polarity_scores.call_count == 1
+    assert results[0].aspects[0].sentiment == "positive"
+    assert analyzer.score_cache.info()['hits'] == 1
+    assert analyzer.score_cache.info()['misses'] == 1
+
+def test_analyze_batch_reads_persistent_cache(analyzer, mock_doc, tmp_path):
+    # Arrange
+    items = [("first text", [FIRST_ASPECT_MATCH], mock_doc)]
+    analyzer.disk_cache = SQLiteScoreCache(tmp_path / "scores.db")
+    analyzer.analyze_batch(items)
+    analyzer.score_cache.clear()
+    
+    # Act
+    results = analyzer.analyze_batch(items)
+    
+    # Assert
+    analyzer.bert_model.assert_called_once()
+    assert results[0].aspects[0].sentiment == "positive"
+    assert analyzer.disk_cache.info()['hits'] == 1
+    assert analyzer.score_cache.info()['size'] == 1
+
+def test_analyze_batch_without_cache(analyzer, mock_doc):
+    # Arrange
+    analyzer.score_cache = None
+    items = [("first text", [FIRST_ASPECT_MATCH], mock_doc)]
+    
+    # Act
+    analyzer.analyze_batch(items)
+    analyzer.analyze_batch(items)
+    
+    # Assert
+    assert analyzer.bert_model.call_count == 2
+
+def test_analyze_batch_empty_input(analyzer):
+    # Arrange & Act
+    results = analyzer.analyze_batch([])
+    
+    # Assert
+    assert results == []
+    analyzer.bert_model.assert_not_called()
+
 def test_extract_context_window(analyzer, mock_doc):
     # Arrange
-    analyzer.doc = mock_doc
     analyzer.context_window = 2
     aspect_match = AspectMatch(
         text="test", 
@@ -92,7 +234,7 @@ def test_extract_context_window(analyzer, mock_doc):
     )
     
     # Act
-    context = analyzer._extract_context_window(aspect_match)
+    context = analyzer._extract_context_window(mock_doc, aspect_match)
     
     # Assert
     assert isinstance(context, str)
@@ -154,8 +296,389 @@ def test_weighted_sentiment_neutral(analyzer):
     assert sentiment == "neutral"
     assert isinstance(confidence, float)
 
+def test_cascade_mode_skips_bert_for_polar_vader(analyzer, mock_doc):
+    # Arrange
+    analyzer.mode = "cascade"
+    analyzer.vader_analyzer.polarity_scores.return_value = {'compound': -0.9}
+    
+    # Act
+    result = analyzer.analyze_text("text", [FIRST_ASPECT_MATCH], mock_doc)
+    
+    # Assert
+    analyzer.bert_model.assert_not_called()
+    assert result.aspects[0].sentiment == "negative"
+    assert result.aspects[0].confidence == 0.9
+    assert analyzer.stats.vader_only == 1
+    assert analyzer.stats.bert_contexts == 0
+
+def test_cascade_mode_runs_bert_when_vader_uncertain(analyzer, mock_doc):
+    # Arrange
+    analyzer.mode = "cascade"
+    analyzer.uncertainty_band = 0.5
+    analyzer.vader_analyzer.polarity_scores.return_value = {'compound': 0.2}
+    
+    # Act
+    result = analyzer.analyze_text("text", [FIRST_ASPECT_MATCH], mock_doc)
+    
+    # Assert
+    analyzer.bert_model.assert_called_once()
+    assert result.aspects[0].sentiment == "positive"
+    assert analyzer.stats.bert_contexts == 1
+    assert analyzer.stats.bert_inferences == 1
+    assert analyzer.stats.bert_rate == 1.0
+
+def test_cascade_mode_ignores_cached_bert_for_polar_vader(analyzer, mock_doc):
+    # Arrange
+    analyzer.vader_analyzer.polarity_scores.return_value = {'compound': -0.9}
+    analyzer.analyze_text("text", [FIRST_ASPECT_MATCH], mock_doc)
+    analyzer.mode = "cascade"
+    
+    # Act
+    result = analyzer.analyze_text("text", [FIRST_ASPECT_MATCH], mock_doc)
+    
+    # Assert
+    assert result.aspects[0].sentiment == "negative"
+    assert result.aspects[0].confidence == 0.9
+
+def test_vader_mode_does_not_load_bert():
+    with patch('marsa.sentiment.pipeline') as mock_pipeline, \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        analyzer = AspectSentimentAnalyzer(mode="vader")
+        
+        mock_pipeline.assert_not_called()
+        assert analyzer.bert_model is None
+
+def test_vader_mode_classifies_with_vader(analyzer, mock_doc):
+    # Arrange
+    analyzer.mode = "vader"
+    analyzer.vader_analyzer.polarity_scores.return_value = {'compound': 0.3}
+    
+    # Act
+    result = analyzer.analyze_text("text", [FIRST_ASPECT_MATCH, SECOND_ASPECT_MATCH], mock_doc)
+    
+    # Assert
+    analyzer.bert_model.assert_not_called()
+    assert [aspect.sentiment for aspect in result.aspects] == ["positive", "positive"]
+    assert analyzer.stats.contexts == 2
+    assert analyzer.stats.vader_only == 2
+
+def test_vader_sentiment(analyzer):
+    # Arrange & Act & Assert
+    assert analyzer._vader_sentiment(0.8) == ("positive", 0.8)
+    assert analyzer._vader_sentiment(-0.6) == ("negative", 0.6)
+    assert analyzer._vader_sentiment(0.0) == ("neutral", 1.0)
+
+def test_sentence_mode_scores_each_sentence_once(analyzer):
+    # Arrange
+    analyzer.context_mode = "sentence"
+    doc = spacy.blank("en")("the camera and screen are great. the battery is poor.")
+    aspects = [
+        AspectMatch(text="camera", aspect="camera", start=4, end=10, token_start=1, token_end=2),
+        AspectMatch(text="screen", aspect="screen", start=15, end=21, token_start=3, token_end=4),
+        AspectMatch(text="battery", aspect="battery", start=37, end=44, token_start=8, token_end=9)
+    ]
+    
+    # Act
+    result = analyzer.analyze_text(doc.text, aspects, doc)
+    
+    # Assert
+    analyzer.bert_model.assert_called_once()
+    assert analyzer.bert_model.call_args.args[0] == [
+        "the camera and screen are great.",
+        "the battery is poor."
+    ]
+    assert [aspect.context_used for aspect in result.aspects] == [
+        "the camera and screen are great.",
+        "the camera and screen are great.",
+        "the battery is poor."
+    ]
+    assert analyzer.stats.bert_inferences == 2
+
+def test_sentence_mode_uses_existing_sentence_boundaries(analyzer):
+    # Arrange
+    analyzer.context_mode = "sentence"
+    doc = spacy.blank("en")("great camera and poor battery")
+    doc[3].is_sent_start = True
+    aspect = AspectMatch(text="battery", aspect="battery", start=22, end=29, token_start=4, token_end=5)
+    
+    # Act
+    context = analyzer._extract_context(doc, aspect)
+    
+    # Assert
+    assert context == "poor battery"
+
+def test_merged_mode_coalesces_overlapping_windows(analyzer):
+    # Arrange
+    analyzer.context_mode = "merged"
+    analyzer.context_window = 1
+    doc = spacy.blank("en")("i love the battery and screen but sadly the camera is poor")
+    aspects = [
+        AspectMatch(text="battery", aspect="battery", start=11, end=18, token_start=3, token_end=4),
+        AspectMatch(text="screen", aspect="screen", start=23, end=29, token_start=5, token_end=6),
+        AspectMatch(text="camera", aspect="camera", start=44, end=50, token_start=9, token_end=10)
+    ]
+    
+    # Act
+    result = analyzer.analyze_text(doc.text, aspects, doc)
+    
+    # Assert
+    assert [aspect.context_used for aspect in result.aspects] == [
+        "the battery and screen but",
+        "the battery and screen but",
+        "the camera is"
+    ]
+    assert analyzer.bert_model.call_args.args[0] == ["the battery and screen but", "the camera is"]
+    assert analyzer.stats.merged_windows == 1
+
+def test_merged_mode_merges_touching_windows(analyzer):
+    # Arrange
+    analyzer.context_mode = "merged"
+    analyzer.context_window = 1
+    doc = spacy.blank("en")("great camera , poor battery")
+    aspects = [
+        AspectMatch(text="camera", aspect="camera", start=6, end=12, token_start=1, token_end=2),
+        AspectMatch(text="battery", aspect="battery", start=20, end=27, token_start=4, token_end=5)
+    ]
+    
+    # Act
+    contexts = analyzer._extract_merged_windows(doc, aspects)
+    
+    # Assert
+    assert contexts == ["great camera , poor battery", "great camera , poor battery"]
+
+def test_weighted_sentiment_batch_matches_scalar(analyzer):
+    # Arrange
+    rng = np.random.default_rng(0)
+    bert_probs = rng.dirichlet([1.0, 1.0, 1.0], size=500)
+    vader_scores = rng.uniform(-1.0, 1.0, size=500)
+    
+    # Act
+    labels, confidences = analyzer._weighted_sentiment_batch(bert_probs, vader_scores)
+    expected = [
+        analyzer._weighted_sentiment(probs.tolist(), vader_score)
+        for probs, vader_score in zip(bert_probs, vader_scores.tolist())
+    ]
+    
+    # Assert
+    assert labels.tolist() == [label for label, _ in expected]
+    assert [c.hex() for c in confidences.tolist()] == [c.hex() for _, c in expected]
+
+def test_analyze_batch_uses_vectorized_scoring(analyzer, mock_doc):
+    # Arrange
+    expected = analyzer._weighted_sentiment([0.1, 0.2, 0.7], 0.5)
+    
+    # Act
+    result = analyzer.analyze_text("text", [FIRST_ASPECT_MATCH, SECOND_ASPECT_MATCH], mock_doc)
+    
+    # Assert
+    assert [(aspect.sentiment, aspect.confidence) for aspect in result.aspects] == [expected, expected]
+    assert all(type(aspect.confidence) is float for aspect in result.aspects)
+
+def test_long_context_truncated_around_aspect(analyzer, tiny_tokenizer):
+    # Arrange
+    analyzer.bert_model.tokenizer = tiny_tokenizer
+    analyzer.context_window = 100
+    analyzer.max_length = 12
+    words = ["filler"] * 40 + ["battery"] + ["filler"] * 40
+    doc = spacy.blank("en")(" ".join(words))
+    aspect = AspectMatch(text="battery", aspect="battery", start=280, end=287, token_start=40, token_end=41)
+    
+    # Act
+    context = analyzer._extract_context(doc, aspect)
+    
+    # Assert
+    assert len(tiny_tokenizer(context)['input_ids']) <= 12
+    assert context == " ".join(["filler"] * 5 + ["battery"] + ["filler"] * 4)
+
+def test_long_context_keeps_aspect_at_end(analyzer, tiny_tokenizer):
+    # Arrange
+    analyzer.bert_model.tokenizer = tiny_tokenizer
+    analyzer.context_mode = "sentence"
+    analyzer.max_length = 12
+    doc = spacy.blank("en")(" ".join(["filler"] * 60 + ["poor", "battery"]))
+    aspect = AspectMatch(text="battery", aspect="battery", start=0, end=0, token_start=61, token_end=62)
+    
+    # Act
+    context = analyzer._extract_context(doc, aspect)
+    
+    # Assert
+    assert len(tiny_tokenizer(context)['input_ids']) <= 12
+    assert context.endswith("poor battery")
+
+def test_long_context_fits_byte_level_bpe(analyzer):
+    # Arrange
+    tokenizer = make_tiny_bpe_tokenizer()
+    analyzer.bert_model.tokenizer = tokenizer
+    analyzer.context_window = 100
+    analyzer.max_length = 12
+    doc = spacy.blank("en")(" ".join(["filler"] * 40 + ["battery"] + ["filler"] * 40))
+    aspect = AspectMatch(text="battery", aspect="battery", start=0, end=0, token_start=40, token_end=41)
+    
+    # Act
+    context = analyzer._extract_context(doc, aspect)
+    
+    # Assert
+    # Without its leading space the first word splits into more subwords than in context
+    assert tokenizer.tokenize("filler") != tokenizer.tokenize(" filler")
+    assert len(tokenizer(context)['input_ids']) <= 12
+    assert "battery" in context
+
+def test_short_context_skips_tokenizer(analyzer):
+    # Arrange
+    doc = spacy.blank("en")("the battery is poor")
+    aspect = AspectMatch(text="battery", aspect="battery", start=4, end=11, token_start=1, token_end=2)
+    
+    # Act
+    context = analyzer._extract_context(doc, aspect)
+    
+    # Assert
+    analyzer.bert_model.tokenizer.assert_not_called()
+    assert context == "the battery is poor"
+
+def test_concurrent_calls_keep_their_own_contexts(analyzer):
+    # Arrange
+    analyzer.context_mode = "window"
+    nlp = spacy.blank("en")
+    items = []
+    for i in range(64):
+        doc = nlp(f"review {i} says the battery number {i} is poor")
+        aspect = AspectMatch(text="battery", aspect="battery", start=0, end=7, token_start=4, token_end=5)
+        items.append((doc.text, [aspect], doc))
+    
+    # Act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda item: analyzer.analyze_text(*item), items * 4))
+    
+    # Assert
+    for (text, _, doc), result in zip(items * 4, results):
+        assert result.text == text
+        assert result.aspects[0].context_used == doc[1:8].text
+    assert analyzer.stats.contexts == 256
+    assert analyzer.stats.bert_contexts == 256
+
+def test_concurrent_calls_serialize_bert_model(analyzer, mock_doc):
+    # Arrange
+    active = []
+    overlapped = []
+    
+    def bert(contexts, **kwargs):
+        active.append(True)
+        overlapped.append(len(active) > 1)
+        time.sleep(0.001)
+        active.pop()
+        return [[{'label': 'Positive', 'score': 0.9}] for _ in contexts]
+    
+    analyzer.bert_model = Mock(side_effect=bert)
+    analyzer.score_cache = None
+    
+    # Act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(
+            lambda _: analyzer.analyze_text("text", [FIRST_ASPECT_MATCH], mock_doc), range(32)
+        ))
+    
+    # Assert
+    assert len(overlapped) == 32
+    assert not any(overlapped)
+
+def test_shared_analyzers_use_registry_lock():
+    with patch('marsa.sentiment.pipeline'), \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        first = AspectSentimentAnalyzer(share_models=True)
+        second = AspectSentimentAnalyzer(share_models=True, batch_size=8)
+        own = AspectSentimentAnalyzer()
+        
+        assert first._model_lock is second._model_lock
+        assert own._model_lock is not first._model_lock
+        first.close()
+        second.close()
+
 # ---------- Edge Cases ----------
 
+def test_max_length_none_disables_truncation(analyzer):
+    # Arrange
+    analyzer.max_length = None
+    analyzer.context_window = 100
+    doc = spacy.blank("en")(" ".join(["filler"] * 300 + ["battery"]))
+    aspect = AspectMatch(text="battery", aspect="battery", start=0, end=0, token_start=300, token_end=301)
+    
+    # Act
+    context = analyzer._extract_context(doc, aspect)
+    
+    # Assert
+    analyzer.bert_model.tokenizer.assert_not_called()
+    assert context == doc[200:301].text
+
+def test_analyzer_invalid_max_length():
+    with patch('marsa.sentiment.pipeline'), \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        with pytest.raises(ValueError, match="max_length"):
+            AspectSentimentAnalyzer(max_length=2)
+
+def test_weighted_sentiment_batch_matches_scalar_edge_values(analyzer):
+    # Arrange
+    cases = [
+        ([0.0, 0.0, 0.0], 0.0),
+        ([0.0, 1.0, 0.0], 0.0),
+        ([0.5, 0.0, 0.5], 0.05),
+        ([0.5, 0.0, 0.5], -0.05),
+        ([0.2, 0.6, 0.2], 0.049),
+        ([1.0, 0.0, 0.0], 1.0),
+        ([0.0, 0.0, 1.0], -1.0),
+        ([0.3, 0.3, 0.4], -0.0)
+    ]
+    bert_probs = np.array([probs for probs, _ in cases], dtype=np.float64)
+    vader_scores = np.array([vader_score for _, vader_score in cases], dtype=np.float64)
+    
+    # Act
+    labels, confidences = analyzer._weighted_sentiment_batch(bert_probs, vader_scores)
+    expected = [analyzer._weighted_sentiment(probs, vader_score) for probs, vader_score in cases]
+    
+    # Assert
+    assert labels.tolist() == [label for label, _ in expected]
+    assert [c.hex() for c in confidences.tolist()] == [c.hex() for _, c in expected]
+
+def test_merged_mode_keeps_aspect_order(analyzer):
+    # Arrange
+    analyzer.context_mode = "merged"
+    analyzer.context_window = 0
+    doc = spacy.blank("en")("screen is fine but battery is poor")
+    aspects = [
+        AspectMatch(text="battery", aspect="battery", start=19, end=26, token_start=4, token_end=5),
+        AspectMatch(text="screen", aspect="screen", start=0, end=6, token_start=0, token_end=1)
+    ]
+    
+    # Act
+    contexts = analyzer._extract_merged_windows(doc, aspects)
+    
+    # Assert
+    assert contexts == ["battery", "screen"]
+    assert analyzer.stats.merged_windows == 0
+
+def test_merged_mode_counts_only_shared_contexts(analyzer, tiny_tokenizer):
+    # Arrange
+    analyzer.bert_model.tokenizer = tiny_tokenizer
+    analyzer.context_mode = "merged"
+    analyzer.context_window = 100
+    analyzer.max_length = 12
+    words = ["filler"] * 5 + ["battery"] + ["filler"] * 54 + ["camera"] + ["filler"] * 20
+    doc = spacy.blank("en")(" ".join(words))
+    aspects = [
+        AspectMatch(text="battery", aspect="battery", start=0, end=0, token_start=5, token_end=6),
+        AspectMatch(text="camera", aspect="camera", start=0, end=0, token_start=60, token_end=61)
+    ]
+    
+    # Act
+    contexts = analyzer._extract_merged_windows(doc, aspects)
+    
+    # Assert
+    assert "battery" in contexts[0] and "camera" in contexts[1]
+    assert contexts[0] != contexts[1]
+    assert analyzer.stats.merged_windows == 0
+
 def test_analyze_text_empty_aspects(analyzer, mock_doc):
     # Arrange
     text = "Some text without aspects"
@@ -179,8 +702,6 @@ def test_extract_context_window_boundary_conditions(analyzer):
     mock_span.text = "boundary context"
     mock_doc.__getitem__.return_value = mock_span
     
-    analyzer.doc = mock_doc
-    
     aspect_match = AspectMatch(
         text="test", 
         aspect="camera",
@@ -192,7 +713,7 @@ def test_extract_context_window_boundary_conditions(analyzer):
     )
     
     # Act
-    context = analyzer._extract_context_window(aspect_match)
+    context = analyzer._extract_context_window(mock_doc, aspect_match)
     
     # Assert
     assert isinstance(context, str)
@@ -224,3 +745,105 @@ def test_weighted_sentiment_zero_confidence(analyzer):
     # Assert
     assert sentiment == "neutral"  # defaults to neutral
     assert isinstance(confidence, float)
+
+def test_analyzer_invalid_mode():
+    with patch('marsa.sentiment.pipeline'), \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        with pytest.raises(ValueError, match="Unsupported sentiment mode"):
+            AspectSentimentAnalyzer(mode="bert-only")
+
+def test_analyzer_applies_cpu_settings():
+    with patch('marsa.sentiment.pipeline'), \
+         patch('marsa.sentiment.configure_cpu') as mock_configure, \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        AspectSentimentAnalyzer(num_threads=2, num_interop_threads=1, cpu_affinity=[0, 1])
+        
+        mock_configure.assert_called_once_with(2, 1, [0, 1])
+
+def test_bert_probabilities_runs_in_inference_mode(analyzer):
+    # Arrange
+    inference_flags = []
+    analyzer.bert_model.side_effect = lambda contexts, **kwargs: (
+        inference_flags.append(torch.is_inference_mode_enabled()) or [[{'label': 'Positive', 'score': 1.0}]]
+    )
+    
+    # Act
+    analyzer._bert_probabilities(["great camera"])
+    analyzer.inference_mode = False
+    analyzer._bert_probabilities(["great camera"])
+    
+    # Assert
+    assert inference_flags == [True, False]
+
+def test_analyzer_invalid_context_mode():
+    with patch('marsa.sentiment.pipeline'), \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        with pytest.raises(ValueError, match="Unsupported context mode"):
+            AspectSentimentAnalyzer(context_mode="paragraph")
+
+def test_analyzer_invalid_backend():
+    with patch('marsa.sentiment.pipeline'), \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        with pytest.raises(ValueError, match="Unsupported backend"):
+            AspectSentimentAnalyzer(backend="tensorrt")
+
+def test_analyzer_onnx_backend_loads_onnx_pipeline():
+    with patch('marsa.sentiment.pipeline') as mock_pipeline, \
+         patch('marsa.sentiment.OnnxSentimentPipeline') as mock_onnx, \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        analyzer = AspectSentimentAnalyzer(backend="onnx")
+        
+        mock_pipeline.assert_not_called()
+        mock_onnx.assert_called_once_with(
+            analyzer.model_name, top_k=1, num_threads=None, num_interop_threads=None
+        )
+        assert analyzer.bert_model is mock_onnx.return_value
+        assert analyzer.model_identity.endswith(":onnx")
+
+def test_analyzer_quantize_requires_torch_backend():
+    with patch('marsa.sentiment.OnnxSentimentPipeline'), \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        with pytest.raises(ValueError, match="Dynamic quantization"):
+            AspectSentimentAnalyzer(backend="onnx", quantize=True)
+
+def test_analyzer_quantize_replaces_model_on_cpu():
+    with patch('marsa.sentiment.pipeline') as mock_pipeline, \
+         patch('marsa.sentiment.quantize_dynamic_int8') as mock_quantize, \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        analyzer = AspectSentimentAnalyzer(quantize=True)
+        
+        assert mock_pipeline.call_args.kwargs['device'] == -1
+        mock_quantize.assert_called_once()
+        assert analyzer.bert_model.model is mock_quantize.return_value
+        assert analyzer.model_identity.endswith(":int8")
+
+def test_analyzers_share_registered_models():
+    with patch('marsa.sentiment.pipeline') as mock_pipeline, \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer') as mock_vader:
+        
+        first = AspectSentimentAnalyzer(share_models=True)
+        second = AspectSentimentAnalyzer(share_models=True, batch_size=8)
+        first.close()
+        second.close()
+        
+        mock_pipeline.assert_called_once()
+        mock_vader.assert_called_once()
+        assert ("bert", first.model_identity) not in MODEL_REGISTRY
+        assert ("vader",) not in MODEL_REGISTRY
+
+def test_analyzers_without_sharing_load_own_models():
+    with patch('marsa.sentiment.pipeline') as mock_pipeline, \
+         patch('marsa.sentiment.SentimentIntensityAnalyzer'):
+        
+        AspectSentimentAnalyzer()
+        AspectSentimentAnalyzer()
+        
+        assert mock_pipeline.call_count == 2
+        assert len(MODEL_REGISTRY) == 0
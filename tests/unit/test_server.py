@@ -0,0 +1,235 @@
+import http.client
+import json
+import pytest
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from marsa.server import InferenceServer
+
+# ---------- Setup and Fixtures ----------
+
+def request(server: InferenceServer, path: str, payload: dict | None = None, data: bytes | None = None) -> tuple[int, dict, dict]:
+    host, port = server.address
+    if payload is not None:
+        data = json.dumps(payload).encode('utf-8')
+    try:
+        with urlopen(Request(f"http://{host}:{port}{path}", data=data), timeout=30) as response:
+            return response.status, json.loads(response.read()), dict(response.headers)
+    except HTTPError as e:
+        return e.code, json.loads(e.read()), dict(e.headers)
+
+def start(server: InferenceServer) -> threading.Thread:
+    thread = threading.Thread(target=server.httpd.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+@pytest.fixture(scope="module")
+def server():
+    # VADER scoring with a blank tokenizer needs no model downloads
+    server = InferenceServer(
+        "tests/fixtures/config.yaml", port=0, matcher_mode="blank", sentiment_mode="vader"
+    )
+    start(server)
+    server.load()
+    yield server
+    server.shutdown()
+
+# ---------- Regular Tests ----------
+
+def test_server_analyze_single_text(server):
+    # Act
+    status, body, _ = request(server, "/analyze", {'text': "Poor battery"})
+    
+    # Assert
+    assert status == 200
+    assert body['original_text'] == "Poor battery"
+    assert body['aspect_sentiments'][0]['aspect'] == "battery"
+    assert body['aspect_sentiments'][0]['sentiment'] == "negative"
+
+def test_server_analyze_batch_matches_pipeline(server):
+    # Arrange
+    texts = ["I love the camera but hate the battery life", "", "The screen is amazing"]
+    
+    # Act
+    status, body, _ = request(server, "/analyze/batch", {'texts': texts})
+    
+    # Assert
+    assert status == 200
+    assert body['results'] == server.pipeline.process_corpus_flat(texts)
+
+def test_server_batches_concurrent_requests(server):
+    # Arrange
+    batches_before = server.pipeline.scheduler.batches
+    results = [None] * 16
+    
+    def call(i):
+        results[i] = request(server, "/analyze", {'text': f"review {i}: the camera is great"})
+    
+    # Act
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # Assert
+    assert all(status == 200 for status, _, _ in results)
+    assert [body['original_text'] for _, body, _ in results] == [f"review {i}: the camera is great" for i in range(16)]
+    assert server.pipeline.scheduler.batches - batches_before <= 16
+
+def test_server_health_and_readiness(server):
+    # Act
+    health = request(server, "/healthz")
+    ready = request(server, "/readyz")
+    
+    # Assert
+    assert health[:2] == (200, {'status': "ok"})
+    assert ready[:2] == (200, {'status': "ready"})
+
+def test_server_not_ready_before_warm_up():
+    # Arrange
+    server = InferenceServer("tests/fixtures/config.yaml", port=0, matcher_mode="blank", sentiment_mode="vader")
+    start(server)
+    
+    # Act
+    ready = request(server, "/readyz")
+    health = request(server, "/healthz")
+    analyze = request(server, "/analyze", {'text': "poor battery"})
+    server.load()
+    ready_after_load = request(server, "/readyz")
+    server.shutdown()
+    
+    # Assert
+    assert ready[:2] == (503, {'status': "loading"})
+    assert health[0] == 200
+    assert analyze[0] == 503
+    assert analyze[2]['Retry-After'] == "1"
+    assert ready_after_load[0] == 200
+
+# ---------- Edge Cases ----------
+
+def test_server_returns_503_when_queue_full():
+    # Arrange
+    server = InferenceServer(
+        "tests/fixtures/config.yaml", port=0, matcher_mode="blank", sentiment_mode="vader",
+        async_batch_size=1, async_max_wait=0.0, async_queue_size=2
+    )
+    start(server)
+    server.load()
+    process_corpus = server.pipeline.scheduler.process_batch
+    server.pipeline.scheduler.process_batch = lambda texts: time.sleep(0.5) or process_corpus(texts)
+    background = [
+        threading.Thread(target=request, args=(server, "/analyze/batch", {'texts': texts}))
+        for texts in (["poor battery"], ["poor battery"] * 2)
+    ]
+    
+    # Act
+    for thread in background:
+        thread.start()
+        time.sleep(0.2)  # the first batch is processing, then the second fills the queue
+    status, body, headers = request(server, "/analyze", {'text': "poor battery"})
+    for thread in background:
+        thread.join()
+    server.shutdown()
+    
+    # Assert
+    assert status == 503
+    assert body == {'error': "Request queue is full"}
+    assert headers['Retry-After'] == "1"
+
+def test_server_rejects_batches_larger_than_queue():
+    # Arrange
+    server = InferenceServer(
+        "tests/fixtures/config.yaml", port=0, matcher_mode="blank", sentiment_mode="vader", async_queue_size=4
+    )
+    start(server)
+    server.load()
+    
+    # Act
+    too_large = request(server, "/analyze/batch", {'texts': ["poor battery"] * 5})
+    fits = request(server, "/analyze/batch", {'texts': ["poor battery"] * 4})
+    server.shutdown()
+    
+    # Assert
+    assert too_large[0] == 413
+    assert "exceeds the queue size of 4" in too_large[1]['error']
+    assert 'Retry-After' not in too_large[2]
+    assert fits[0] == 200
+
+def test_server_shutdown_finishes_scheduler_task():
+    # Arrange
+    server = InferenceServer("tests/fixtures/config.yaml", port=0, matcher_mode="blank", sentiment_mode="vader")
+    start(server)
+    server.load()
+    server.analyze(["poor battery"])
+    task = server.pipeline.scheduler._task
+    
+    # Act
+    server.shutdown()
+    
+    # Assert
+    assert task.done()
+
+def test_server_rejects_invalid_requests(server):
+    # Act
+    invalid_json = request(server, "/analyze", data=b"{not json")
+    missing_text = request(server, "/analyze", {'comment': "poor battery"})
+    invalid_texts = request(server, "/analyze/batch", {'texts': "poor battery"})
+    unknown_path = request(server, "/predict", {'text': "poor battery"})
+    
+    # Assert
+    assert invalid_json[0] == 400
+    assert missing_text[0] == 400
+    assert invalid_texts[0] == 400
+    assert unknown_path[0] == 404
+
+def test_server_rejects_large_bodies():
+    # Arrange
+    server = InferenceServer(
+        "tests/fixtures/config.yaml", port=0, max_body_bytes=16, matcher_mode="blank", sentiment_mode="vader"
+    )
+    start(server)
+    
+    # Act
+    status, _, _ = request(server, "/analyze", {'text': "a comment longer than sixteen bytes"})
+    server.shutdown()
+    
+    # Assert
+    assert status == 413
+
+def test_server_rejects_invalid_content_length(server):
+    # Arrange
+    host, port = server.address
+    
+    def post(length: str | None) -> int:
+        connection = http.client.HTTPConnection(host, port, timeout=10)
+        connection.putrequest("POST", "/analyze")
+        if length is not None:
+            connection.putheader("Content-Length", length)
+        connection.endheaders()
+        status = connection.getresponse().status
+        connection.close()
+        return status
+    
+    # Act
+    statuses = [post("-1"), post("abc"), post(None)]
+    
+    # Assert
+    assert statuses == [400, 400, 411]
+
+def test_server_reports_failed_load():
+    # Arrange
+    server = InferenceServer("tests/fixtures/config.yaml", port=0, matcher_mode="unknown")
+    start(server)
+    
+    # Act
+    server.load()
+    health = request(server, "/healthz")
+    ready = request(server, "/readyz")
+    server.shutdown()
+    
+    # Assert
+    assert health[0] == 503
+    assert health[1]['status'] == "failed"
+    assert ready[0] == 503
@@ -0,0 +1,69 @@
+import os
+import pytest
+import subprocess
+import sys
+
+HEAVY_MODULES = ("torch", "transformers", "spacy", "pandas")
+
+def imported_heavy_modules(code: str) -> list[str]:
+    """
+    Run code in a fresh interpreter and return the heavy modules it imported.
+    """
+    script = f"{code}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, env=env)
+    return [name for name in result.stdout.splitlines()[-1].split(",") if name]
+
+# ---------- Regular Tests ----------
+
+def test_import_marsa_defers_heavy_modules():
+    # Arrange & Act
+    imported = imported_heavy_modules("import marsa")
+    
+    # Assert
+    assert imported == []
+
+def test_lightweight_helpers_defer_heavy_modules():
+    # Arrange & Act
+    imported = imported_heavy_modules(
+        "from marsa import clean_input, create_aspect_config, AspectMatch\n"
+        "clean_input('Great camera! https://example.com')\n"
+        "create_aspect_config('tests/fixtures/config.yaml')"
+    )
+    
+    # Assert
+    assert imported == []
+
+def test_cli_help_defers_heavy_modules():
+    # Arrange & Act
+    imported = imported_heavy_modules(
+        "import sys\n"
+        "from marsa.__main__ import main\n"
+        "sys.argv = ['marsa', '--help']\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    
+    # Assert
+    assert imported == []
+
+def test_lazy_attribute_resolves_public_names():
+    # Arrange
+    import marsa
+    from marsa.utils import clean_input
+    
+    # Act & Assert
+    assert marsa.clean_input is clean_input
+    assert set(marsa.__all__) <= set(dir(marsa))
+
+# ---------- Edge Cases ----------
+
+def test_lazy_attribute_unknown_name():
+    # Arrange
+    import marsa
+    
+    # Act & Assert
+    with pytest.raises(AttributeError, match="not_a_public_name"):
+        marsa.not_a_public_name
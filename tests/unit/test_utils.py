@@ -1,4 +1,6 @@
-from marsa.utils import clean_input
+import pytest
+from unittest.mock import patch
+from marsa.utils import clean_input, load_spacy_pipeline, SPACY_COMPONENTS
 
 # ---------- Regular Tests ----------
 
@@ -79,6 +81,35 @@ def test_clean_input_whitespace_strip():
     # Assert
     assert result == expected
 
+def test_load_spacy_pipeline_blank_mode():
+    # Arrange & Act
+    nlp = load_spacy_pipeline("en_core_web_sm", mode="blank")
+    
+    # Assert
+    assert nlp.lang == "en"
+    assert nlp.pipe_names == []
+    assert [token.text for token in nlp("great camera, poor battery")] == ["great", "camera", ",", "poor", "battery"]
+
+def test_load_spacy_pipeline_tokenizer_mode_excludes_components():
+    # Arrange
+    with patch('spacy.load') as mock_load:
+        
+        # Act
+        load_spacy_pipeline("en_core_web_sm", mode="tokenizer")
+        
+        # Assert
+        mock_load.assert_called_once_with("en_core_web_sm", exclude=list(SPACY_COMPONENTS))
+
+def test_load_spacy_pipeline_full_mode_loads_everything():
+    # Arrange
+    with patch('spacy.load') as mock_load:
+        
+        # Act
+        load_spacy_pipeline("en_core_web_sm", mode="full")
+        
+        # Assert
+        mock_load.assert_called_once_with("en_core_web_sm", exclude=[])
+
 # ---------- Edge Case Tests ----------
 
 def test_clean_input_empty_string():
@@ -134,4 +165,9 @@ def test_clean_input_complex_urls():
     result = clean_input(text)
     
     # Assert
-    assert result == expected
\ No newline at end of file
+    assert result == expected
+
+def test_load_spacy_pipeline_invalid_mode():
+    # Arrange & Act & Assert
+    with pytest.raises(ValueError, match="Unsupported spaCy mode"):
+        load_spacy_pipeline("en_core_web_sm", mode="parser-only")